@@ -6,9 +6,14 @@
 import requests
 import json
 import time
+from collections import deque
 from datetime import datetime
 import logging
 
+from src.utils.price_consensus import PriceConsensus
+from src.utils.tick_buffer import TickBuffer
+from src.database.tick_store import TickStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -22,8 +27,19 @@ class AccurateHSIMonitor:
             'bloomberg': 'https://www.bloomberg.com/markets/api/quote-page/HSI:IND'
         }
         
-        # 历史准确数据记录
-        self.historical_data = []
+        # 历史准确数据记录（保留最近100条）
+        self.historical_data = deque(maxlen=100)
+        
+        # 验证后价格的时间序列，用于盘中统计
+        self.price_ticks = TickBuffer(capacity=10000)
+        
+        # 多数据源价格共识（数据源可靠性跨多次获取累积）
+        self.price_consensus = PriceConsensus()
+        
+        # 价格历史持久化，用于回测预测；验证后的均价单独成序列，
+        # 不与实时数据系统写入的原始 ^HSI 序列混写（两者各自维护索引和时间顺序）
+        self.tick_store = TickStore(root="data/ticks")
+        self.tick_series = '^HSI:validated'
         
     def get_yahoo_data(self):
         """从Yahoo Finance获取数据"""
@@ -94,15 +110,27 @@ class AccurateHSIMonitor:
         return results
     
     def validate_and_average(self, data_list):
-        """验证并计算平均数据"""
+        """
+        验证各数据源的报价并计算共识数据
+        
+        共识价格为本轮成功数据源按可靠性加权的中位数（剔除离群数据源），涨跌和涨跌幅为入选数据源的平均值
+        
+        返回:
+            consensus_price（共识价格）、consistency（入选报价的一致性，0~1）等字段；
+            average_price 为 consensus_price 的别名，保留给旧调用方，新代码应使用 consensus_price
+        """
         valid_data = [d for d in data_list if d['status'] == 'success' and d.get('price')]
         
         if not valid_data:
             return None
         
-        # 计算平均价格
+        # 共识价格：只使用本轮成功的数据源，按可靠性加权取中位数，离群数据源不参与
+        consensus = self.price_consensus.evaluate({d['source']: d['price'] for d in valid_data}, '^HSI')
+        if consensus.outliers:
+            logger.warning(f"剔除离群数据源: {', '.join(consensus.outliers)}")
+            valid_data = [d for d in valid_data if d['source'] in consensus.sources]
+        
         prices = [d['price'] for d in valid_data]
-        avg_price = sum(prices) / len(prices)
         
         # 计算平均涨跌幅
         changes = [d.get('change', 0) for d in valid_data]
@@ -116,7 +144,9 @@ class AccurateHSIMonitor:
         latest_time = max([d.get('time', datetime.min) for d in valid_data])
         
         return {
-            'average_price': round(avg_price, 2),
+            'consensus_price': round(consensus.value, 2),
+            'average_price': round(consensus.value, 2),
+            'consistency': round(consensus.consistency, 4),
             'average_change': round(avg_change, 2),
             'average_change_percent': round(avg_change_pct * 100, 2),
             'data_points': len(valid_data),
@@ -139,12 +169,12 @@ class AccurateHSIMonitor:
             print("❌ 所有数据源都失败了")
             return None
         
-        # 验证并计算平均值
+        # 验证并计算共识价格
         validated_data = self.validate_and_average(all_data)
         
         if validated_data:
             print(f"✅ 数据验证完成 (使用{validated_data['data_points']}个数据源)")
-            print(f"📈 恒生指数: {validated_data['average_price']:,.2f} 点")
+            print(f"📈 恒生指数: {validated_data['consensus_price']:,.2f} 点")
             
             if validated_data['average_change'] >= 0:
                 print(f"📈 涨跌: +{validated_data['average_change']:.2f} (+{validated_data['average_change_percent']:.2f}%)")
@@ -153,26 +183,65 @@ class AccurateHSIMonitor:
             
             print(f"🕒 数据时间: {validated_data['latest_time'].strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"🎯 数据范围: {validated_data['price_range']}")
-            print(f"🔒 置信度: {validated_data['confidence']}")
+            print(f"🔒 置信度: {validated_data['confidence']} (一致性 {validated_data['consistency']:.2%})")
             print(f"📡 数据源: {', '.join(validated_data['sources'])}")
             
             # 记录历史数据
+            now = datetime.now()
             self.historical_data.append({
-                'timestamp': datetime.now(),
+                'timestamp': now,
                 'data': validated_data
             })
-            
-            # 保持最近100条记录
-            if len(self.historical_data) > 100:
-                self.historical_data = self.historical_data[-100:]
+            self.price_ticks.append(now.timestamp(), validated_data['consensus_price'])
+            self.tick_store.append(self.tick_series, now.timestamp(), validated_data['consensus_price'])
             
             return validated_data
         else:
             print("❌ 数据验证失败")
             return None
     
-    def compare_with_prediction(self, actual_price, prediction_range):
-        """与实际预测对比"""
+    def get_intraday_stats(self, seconds=None):
+        """已记录价格的窗口统计（均值、最高/最低、涨跌幅、波动率）"""
+        return self.price_ticks.stats(seconds=seconds)
+    
+    def backtest_prediction(self, prediction_range, start, end):
+        """
+        用历史价格回测预测区间
+        
+        参数:
+            prediction_range: (预测下限, 预测上限)
+            start: 回测起始时间 (datetime)
+            end: 回测结束时间 (datetime)
+        
+        返回:
+            数据点数、落在预测区间内的比例和相对预测中值的平均误差率，无历史数据时返回None
+        """
+        timestamps, prices = self.tick_store.query(self.tick_series, start.timestamp(), end.timestamp())
+        if not len(prices):
+            return None
+        
+        pred_low, pred_high = prediction_range
+        midpoint = (pred_low + pred_high) / 2
+        in_range = (prices >= pred_low) & (prices <= pred_high)
+        
+        return {
+            'data_points': len(prices),
+            'hit_rate': float(in_range.mean()),
+            'mean_error_percentage': float((abs(prices - midpoint) / prices).mean() * 100),
+            'max_error_percentage': float((abs(prices - midpoint) / prices).max() * 100),
+            'start_time': datetime.fromtimestamp(timestamps[0] / 1000),
+            'end_time': datetime.fromtimestamp(timestamps[-1] / 1000)
+        }
+    
+    def compare_with_prediction(self, actual_price, prediction_range, backtest_period=None):
+        """
+        与实际预测对比
+        
+        参数:
+            actual_price: 实际价格
+            prediction_range: (预测下限, 预测上限)
+            backtest_period: 可选的 (起始时间, 结束时间)，提供时同时用该时段的历史价格回测预测
+        """
         print("\n" + "=" * 60)
         print("🎯 预测准确性分析")
         print("=" * 60)
@@ -195,6 +264,15 @@ class AccurateHSIMonitor:
         else:
             print("🚨 预测准确度: 严重错误")
         
+        if backtest_period:
+            backtest = self.backtest_prediction(prediction_range, *backtest_period)
+            if backtest:
+                print(f"\n📚 历史回测 ({backtest['start_time']:%Y-%m-%d %H:%M} ~ {backtest['end_time']:%Y-%m-%d %H:%M}, {backtest['data_points']} 个数据点)")
+                print(f"🎯 区间命中率: {backtest['hit_rate'] * 100:.1f}%")
+                print(f"📉 平均误差率: {backtest['mean_error_percentage']:.1f}%")
+            else:
+                print("\n📚 回测时段内没有历史价格数据")
+        
         # 改进建议
         print("\n💡 改进建议:")
         if error_percentage > 20:
@@ -213,7 +291,7 @@ def main():
     accurate_data = monitor.get_accurate_hsi()
     
     if accurate_data:
-        actual_price = accurate_data['average_price']
+        actual_price = accurate_data['consensus_price']
         
         # 与我之前的错误预测对比
         my_wrong_prediction = (18500, 18800)  # 我之前的错误预测
@@ -243,6 +321,8 @@ def main():
             }, f, indent=2, ensure_ascii=False)
         
         print(f"\n💾 准确数据已保存到: accurate_hsi_data.json")
+    
+    monitor.tick_store.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
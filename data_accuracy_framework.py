@@ -4,13 +4,123 @@
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import Counter, deque
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
-import hashlib
+
+import numpy as np
+
+from src.utils.fingerprint import STABLE_ALGORITHM, fingerprint
+from src.utils.price_consensus import MAD_SCALE, PriceConsensus
+from src.utils.validator_registry import ValidatorRegistry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 批量验证的问题标志位（可按位组合）
+BATCH_INSUFFICIENT_SOURCES = 1  # 数据源不足
+BATCH_INCONSISTENT = 2  # 数据一致性不足
+BATCH_STALE = 4  # 存在过时的数据源
+BATCH_NON_POSITIVE = 8  # 价格非正数
+BATCH_VOLATILE = 16  # 价格波动过大
+
+BATCH_ISSUE_NAMES = {
+    BATCH_INSUFFICIENT_SOURCES: '数据源不足',
+    BATCH_INCONSISTENT: '数据一致性不足',
+    BATCH_STALE: '数据过时',
+    BATCH_NON_POSITIVE: '价格数据不合理（非正数）',
+    BATCH_VOLATILE: '价格波动过大'
+}
+
+def describe_batch_issues(flags: int) -> List[str]:
+    """把批量验证的问题标志位转换为问题描述列表"""
+    return [name for flag, name in BATCH_ISSUE_NAMES.items() if flags & flag]
+
+def entry_passed(entry: Dict[str, Any]) -> bool:
+    """
+    判断日志条目是否验证通过
+    
+    兼容两种条目：validate_* 直接记录的验证结果（含 validation_passed），
+    以及 log_validation 包装的条目（result 为验证结果或 get_data_with_validation 的报告）
+    """
+    if 'validation_passed' in entry:
+        return bool(entry['validation_passed'])
+    result = entry.get('result')
+    if isinstance(result, dict):
+        if 'validation_passed' in result:
+            return bool(result['validation_passed'])
+        return bool(result.get('validation_result', False))
+    return False
+
+class ValidationLog:
+    """定长验证日志，追加时维护统计计数，摘要无需遍历日志"""
+    
+    def __init__(self, capacity: int = 1000, window: int = 100):
+        """
+        初始化验证日志
+        
+        参数:
+            capacity: 保留的最大日志条数（超出时丢弃最早的条目）
+            window: 滚动失败率统计的最近验证次数
+        """
+        self.capacity = capacity
+        self._entries = deque(maxlen=capacity)
+        self._recent = deque(maxlen=window)  # 最近验证是否通过
+        self._recent_failures = 0
+        
+        self.total = 0
+        self.passed = 0
+        self.by_type = Counter()
+        self.failures_by_type = Counter()
+    
+    def append(self, entry: Dict[str, Any]):
+        """追加一条日志并更新计数"""
+        passed = entry_passed(entry)
+        data_type = entry.get('data_type', 'unknown')
+        
+        self._entries.append(entry)
+        self.total += 1
+        self.by_type[data_type] += 1
+        if passed:
+            self.passed += 1
+        else:
+            self.failures_by_type[data_type] += 1
+        
+        if len(self._recent) == self._recent.maxlen and not self._recent[0]:
+            self._recent_failures -= 1
+        self._recent.append(passed)
+        if not passed:
+            self._recent_failures += 1
+    
+    @property
+    def rolling_failure_rate(self) -> float:
+        """最近 window 次验证的失败率（百分比）"""
+        return self._recent_failures / len(self._recent) * 100 if self._recent else 0.0
+    
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """最新的日志条目"""
+        return self._entries[-1] if self._entries else None
+    
+    def clear(self):
+        """清空日志和计数"""
+        self._entries.clear()
+        self._recent.clear()
+        self._recent_failures = 0
+        self.total = 0
+        self.passed = 0
+        self.by_type.clear()
+        self.failures_by_type.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._entries[index]
+
 class DataAccuracyFramework:
     """数据准确性框架"""
     
@@ -21,24 +131,47 @@ class DataAccuracyFramework:
                 'min_sources': 2,
                 'consistency_threshold': 0.95,  # 95%一致性
                 'max_age_minutes': 5,
-                'required_checks': ['source', 'time', 'consistency', 'logic']
+                'max_spread': 0.5,  # 各数据源价格差不超过50%
+                'required_checks': ['source', 'time', 'consistency', 'logic'],
+                'short_circuit': False  # 收集全部问题
+            },
+            'crypto_data': {
+                'min_sources': 2,
+                'consistency_threshold': 0.99,
+                'max_age_minutes': 1,
+                'max_spread': 0.05,
+                'required_checks': ['source', 'time', 'consistency', 'logic'],
+                'short_circuit': True  # 遇到第一个问题即停止
+            },
+            'fx_data': {
+                'min_sources': 2,
+                'consistency_threshold': 0.999,
+                'max_age_minutes': 5,
+                'max_spread': 0.01,
+                'required_checks': ['source', 'time', 'consistency', 'logic'],
+                'short_circuit': True
             },
             'general_data': {
                 'min_sources': 2,
                 'consistency_threshold': 0.90,
                 'max_age_minutes': 60,
-                'required_checks': ['source', 'consistency']
+                'required_checks': ['source', 'consistency'],
+                'short_circuit': False
             },
             'technical_data': {
                 'min_sources': 1,
                 'consistency_threshold': 0.98,
                 'max_age_minutes': 1440,  # 24小时
-                'required_checks': ['source', 'logic']
+                'required_checks': ['source', 'logic'],
+                'short_circuit': False
             }
         }
         
-        # 数据验证记录
-        self.validation_logs = []
+        # 数据验证记录（保留最近1000条，统计计数随追加更新）
+        self.validation_logs = ValidationLog(capacity=1000)
+        
+        # 多数据源价格共识：加权中位数 + MAD离群剔除，数据源可靠性跨多次验证累积
+        self.price_consensus = PriceConsensus()
         
         # 可信数据源列表
         self.trusted_sources = {
@@ -60,15 +193,73 @@ class DataAccuracyFramework:
                 'github',
                 'stackoverflow',
                 'technical_blogs'
+            ],
+            'crypto': [
+                'coinbase',
+                'binance',
+                'kraken',
+                'bitstamp'
+            ],
+            'fx': [
+                'ecb',
+                'reuters',
+                'bloomberg',
+                'oanda'
             ]
         }
+        
+        # 验证器注册表：每种数据类型按 required_checks 编译一次检查流水线
+        self.validators = ValidatorRegistry()
+        self._finalizers = {}
+        self._register_validators()
+        self.compile_validators()
     
-    def validate_financial_data(self, data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """验证金融数据"""
-        logger.info(f"验证金融数据，共{len(data_points)}个数据点")
+    def _register_validators(self):
+        """注册各数据类型的检查项（成本和失败概率用于决定执行顺序）"""
+        for data_type in ('financial', 'crypto', 'fx'):
+            self.validators.register(data_type, 'source', self._check_source_count, cost=0.01, selectivity=0.05, fatal=True)
+            self.validators.register(data_type, 'prices', self._extract_prices, cost=2.0, selectivity=0.01, fatal=True)
+            self.validators.register(data_type, 'consistency', self._check_price_consistency, cost=0.5,
+                                     selectivity=0.1, requires=('prices',))
+            self.validators.register(data_type, 'logic', self._check_price_logic, cost=0.5, selectivity=0.02,
+                                     requires=('prices',))
+            self.validators.register(data_type, 'time', self._check_freshness, cost=5.0, selectivity=0.1)
+            self._finalizers[data_type] = self._finalize_prices
+        
+        for data_type in ('general', 'technical'):
+            self.validators.register(data_type, 'source', self._check_source_count, cost=0.01, selectivity=0.05, fatal=True)
+            self.validators.register(data_type, 'values', self._extract_values, cost=1.0, selectivity=0.01, fatal=True)
+            self.validators.register(data_type, 'consistency', self._check_value_consistency, cost=0.1,
+                                     selectivity=0.2, requires=('values',))
+            self.validators.register(data_type, 'logic', self._check_values_present, cost=0.5, selectivity=0.02,
+                                     requires=('values',))
+            self.validators.register(data_type, 'time', self._check_freshness, cost=5.0, selectivity=0.1)
+            self._finalizers[data_type] = self._finalize_values
+    
+    def compile_validators(self):
+        """按当前验证配置重新编译所有数据类型的检查流水线（修改 validation_config 后调用）"""
+        for data_type in self.validators.data_types():
+            config = self.validation_config[f"{data_type}_data"]
+            self.validators.compile(data_type, config['required_checks'], config.get('short_circuit', False))
+    
+    def validate(self, data_type: str, data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        按数据类型的检查流水线验证数据
+        
+        参数:
+            data_type: 数据类型 (financial, crypto, fx, general, technical)
+            data_points: 数据点列表
+        
+        返回:
+            验证结果
+        """
+        pipeline = self.validators.pipeline(data_type)
+        if pipeline is None:
+            config = self.validation_config[f"{data_type}_data"]
+            pipeline = self.validators.compile(data_type, config['required_checks'], config.get('short_circuit', False))
         
         validation_result = {
-            'data_type': 'financial',
+            'data_type': data_type,
             'timestamp': datetime.now().isoformat(),
             'sources_count': len(data_points),
             'validation_passed': False,
@@ -76,141 +267,306 @@ class DataAccuracyFramework:
             'issues': [],
             'validated_data': None
         }
+        context = {
+            'data_type': data_type,
+            'data_points': data_points,
+            'config': self.validation_config[f"{data_type}_data"],
+            'result': validation_result
+        }
         
-        # 检查数据源数量
-        if len(data_points) < self.validation_config['financial_data']['min_sources']:
-            validation_result['issues'].append(f"数据源不足: {len(data_points)}个，需要至少{self.validation_config['financial_data']['min_sources']}个")
-            return validation_result
+        validation_result['issues'] = pipeline.run(context)
+        if not validation_result['issues']:
+            self._finalizers[data_type](context)
+        
+        # 记录验证日志
+        self.validation_logs.append(validation_result)
         
-        # 提取价格数据
-        prices = []
-        for point in data_points:
+        return validation_result
+    
+    # ---------- 检查项 ----------
+    
+    def _check_source_count(self, context: Dict[str, Any]):
+        """数据源数量"""
+        count, required = len(context['data_points']), context['config']['min_sources']
+        if count < required:
+            return f"数据源不足: {count}个，需要至少{required}个"
+    
+    def _extract_prices(self, context: Dict[str, Any]):
+        """提取价格（数据源 -> 价格）并计算共识值，离群数据源不参与后续检查"""
+        quotes = {}
+        for i, point in enumerate(context['data_points']):
             if 'price' in point:
-                prices.append(point['price'])
+                quotes[point.get('source') or f"source_{i+1}"] = point['price']
             elif 'value' in point:
-                prices.append(point['value'])
+                quotes[point.get('source') or f"source_{i+1}"] = point['value']
         
-        if not prices:
-            validation_result['issues'].append("没有找到价格数据")
-            return validation_result
+        if not quotes:
+            return "没有找到价格数据"
         
-        # 计算一致性
-        if len(prices) >= 2:
-            avg_price = sum(prices) / len(prices)
-            deviations = [abs(price - avg_price) / avg_price for price in prices]
-            consistency = 1 - (sum(deviations) / len(deviations))
-            
-            validation_result['consistency_score'] = consistency
-            
-            if consistency >= self.validation_config['financial_data']['consistency_threshold']:
-                validation_result['confidence_score'] = consistency * 100
-            else:
-                validation_result['issues'].append(f"数据一致性不足: {consistency:.2%}，要求{self.validation_config['financial_data']['consistency_threshold']:.2%}")
-        else:
-            validation_result['issues'].append("数据点不足，无法计算一致性")
+        # 只用本次的报价计算共识；数据点带品种时记录到该品种的报价簿，否则不与其他验证共享
+        symbols = {point['symbol'] for point in context['data_points'] if point.get('symbol')}
+        if len(symbols) > 1:
+            return f"数据点的品种不一致: {', '.join(sorted(map(str, symbols)))}"
+        consensus = self.price_consensus.evaluate(quotes, symbols.pop() if symbols else None)
+        context['consensus'] = consensus
+        context['prices'] = [quotes[source] for source in consensus.sources if source in quotes]
+        if consensus.outliers:
+            context['result']['outliers'] = consensus.outliers
+            logger.warning(f"剔除离群数据源: {', '.join(consensus.outliers)}")
+    
+    def _check_price_consistency(self, context: Dict[str, Any]):
+        """各数据源价格的一致性"""
+        result, threshold = context['result'], context['config']['consistency_threshold']
+        if len(context['prices']) < 2:
+            return "数据点不足，无法计算一致性"
         
-        # 检查数据时效性
-        current_time = datetime.now()
-        for i, point in enumerate(data_points):
+        consistency = context['consensus'].consistency
+        result['consistency_score'] = consistency
+        if consistency >= threshold:
+            result['confidence_score'] = consistency * 100
+        else:
+            return f"数据一致性不足: {consistency:.2%}，要求{threshold:.2%}"
+    
+    def _check_freshness(self, context: Dict[str, Any]):
+        """数据时效性"""
+        issues = []
+        max_age_minutes = context['config']['max_age_minutes']
+        for i, point in enumerate(context['data_points']):
             if 'timestamp' in point:
                 try:
                     data_time = datetime.fromisoformat(point['timestamp'].replace('Z', '+00:00'))
+                    current_time = datetime.now(data_time.tzinfo) if data_time.tzinfo else datetime.now()
                     age_minutes = (current_time - data_time).total_seconds() / 60
                     
-                    if age_minutes > self.validation_config['financial_data']['max_age_minutes']:
-                        validation_result['issues'].append(f"数据源{i+1}过时: {age_minutes:.1f}分钟前")
-                except:
-                    validation_result['issues'].append(f"数据源{i+1}时间格式无效")
-        
-        # 逻辑检查（金融数据特定）
-        if prices:
-            avg_price = sum(prices) / len(prices)
+                    if age_minutes > max_age_minutes:
+                        issues.append(f"数据源{i+1}过时: {age_minutes:.1f}分钟前")
+                except (AttributeError, TypeError, ValueError):
+                    issues.append(f"数据源{i+1}时间格式无效")
+        return issues
+    
+    def _check_price_logic(self, context: Dict[str, Any]):
+        """价格合理性和数据源间的价差"""
+        prices, value = context['prices'], context['consensus'].value
+        if value <= 0:
+            return "价格数据不合理（非正数）"
+        
+        if len(prices) > 1:
+            spread = (max(prices) - min(prices)) / value
+            if spread > context['config'].get('max_spread', 0.5):
+                return f"价格波动过大: {spread:.1%}"
+    
+    def _extract_values(self, context: Dict[str, Any]):
+        """提取文本值并统计多数值"""
+        values = []
+        for point in context['data_points']:
+            if 'value' in point:
+                values.append(str(point['value']).lower())
+            elif 'text' in point:
+                values.append(str(point['text']).lower())
+        
+        if not values:
+            return "没有找到数据值"
+        
+        most_common_value, count = Counter(values).most_common(1)[0]
+        context['majority'] = (most_common_value, count / len(values))
+    
+    def _check_value_consistency(self, context: Dict[str, Any]):
+        """多数一致"""
+        consistency = context['majority'][1]
+        if consistency < context['config']['consistency_threshold']:
+            return f"数据一致性不足: {consistency:.2%}"
+    
+    def _check_values_present(self, context: Dict[str, Any]):
+        """每个数据源都提供了非空内容"""
+        return [f"数据源{i+1}内容为空" for i, point in enumerate(context['data_points'])
+                if not str(point.get('value', point.get('text', ''))).strip()]
+    
+    def _finalize_prices(self, context: Dict[str, Any]):
+        """价格类数据验证通过后生成验证后的数据"""
+        result = context['result']
+        result['validation_passed'] = True
+        result['confidence_score'] = min(100, result.get('consistency_score', 0) * 100)
+        
+        if context.get('prices'):
+            prices = context['prices']
+            result['validated_data'] = {
+                'value': context['consensus'].value,
+                'range': f"{min(prices):.2f}-{max(prices):.2f}",
+                'sources': len(context['data_points']),
+                'outliers': context['consensus'].outliers,
+                'confidence': result['confidence_score']
+            }
+    
+    def _finalize_values(self, context: Dict[str, Any]):
+        """文本类数据验证通过后生成验证后的数据（取多数值）"""
+        result = context['result']
+        value, consistency = context['majority']
+        result['validation_passed'] = True
+        result['confidence_score'] = consistency * 100
+        result['validated_data'] = {
+            'value': value,
+            'consistency': consistency,
+            'sources': len(context['data_points'])
+        }
+    
+    def validate_financial_data(self, data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """验证金融数据"""
+        logger.info(f"验证金融数据，共{len(data_points)}个数据点")
+        return self.validate('financial', data_points)
+    
+    def validate_financial_batch(self, prices, timestamps=None, symbols: Optional[Sequence[str]] = None,
+                                 now: Optional[float] = None, data_type: str = 'financial') -> Dict[str, Any]:
+        """
+        批量验证金融数据（整个自选列表一次向量化计算）
+        
+        规则与 validate(data_type, ...) 相同：数据源数量、共识值（中位数 + MAD离群剔除）、
+        入选报价的一致性、时效性、价格为正、价差不超过 max_spread。区别是数据源可靠性不参与加权
+        （各数据源等权），也不更新 price_consensus 中的可靠性；short_circuit 不影响批量结果，总是列出全部问题
+        
+        参数:
+            prices: 形状为 (品种数, 数据源数) 的价格矩阵，缺失的报价为NaN
+            timestamps: 与 prices 同形状的报价时间（Unix秒），缺失为NaN；为None时不检查时效性
+            symbols: 品种名称，默认使用行号
+            now: 当前Unix时间，默认 time.time()
+            data_type: 使用哪种数据类型的验证配置 (financial / crypto / fx)
+        
+        返回:
+            按品种排列的数组结果（validation_passed、value、consistency_score、confidence_score、
+            sources_count、outliers、min、max、stale_sources、issue_flags），以及未通过品种的问题描述 failed
+        """
+        started = time.perf_counter()
+        config = self.validation_config[f"{data_type}_data"]
+        checks = set(config['required_checks'])
+        
+        prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+        n_symbols = prices.shape[0]
+        symbols = list(symbols) if symbols is not None else list(range(n_symbols))
+        if len(symbols) != n_symbols:
+            raise ValueError("symbols与prices的行数不一致")
+        
+        valid = ~np.isnan(prices)
+        counts = valid.sum(axis=1)
+        has_prices = counts > 0
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # 没有报价的行填0，避免对全NaN行求中位数
+            median = np.nanmedian(np.where(has_prices[:, None], prices, 0.0), axis=1)
+            deviation = np.abs(prices - median[:, None])
+            mad = np.nanmedian(np.where(has_prices[:, None], deviation, 0.0), axis=1) * MAD_SCALE
+            scale = np.maximum(mad, np.abs(median) * self.price_consensus.min_spread)
             
-            # 检查价格合理性
-            if avg_price <= 0:
-                validation_result['issues'].append("价格数据不合理（非正数）")
+            # 与 PriceConsensus 相同：至少3个报价时才剔除离群报价
+            outliers = valid & (counts >= 3)[:, None] & (deviation > self.price_consensus.mad_threshold * scale[:, None])
+            inliers = valid & ~outliers
+            inlier_counts = inliers.sum(axis=1)
             
-            # 检查波动性（如果有多时间点数据）
-            if len(prices) > 1:
-                price_range = max(prices) - min(prices)
-                if price_range / avg_price > 0.5:  # 波动超过50%
-                    validation_result['issues'].append(f"价格波动过大: {price_range/avg_price:.1%}")
-        
-        # 确定验证结果
-        if not validation_result['issues']:
-            validation_result['validation_passed'] = True
-            validation_result['confidence_score'] = min(100, validation_result.get('consistency_score', 0) * 100)
+            value = np.nanmedian(np.where(has_prices[:, None], np.where(inliers, prices, np.nan), 0.0), axis=1)
+            high = np.where(inliers, prices, -np.inf).max(axis=1)
+            low = np.where(inliers, prices, np.inf).min(axis=1)
             
-            # 计算验证后的数据
-            if prices:
-                validation_result['validated_data'] = {
-                    'value': sum(prices) / len(prices),
-                    'range': f"{min(prices):.2f}-{max(prices):.2f}",
-                    'sources': len(data_points),
-                    'confidence': validation_result['confidence_score']
-                }
+            mean_deviation = (np.where(inliers, np.abs(prices - value[:, None]), 0.0).sum(axis=1)
+                              / np.maximum(inlier_counts, 1))
+            consistency = np.where(value != 0, 1 - mean_deviation / np.abs(value), 0.0)
+            spread = (high - low) / value
         
-        # 记录验证日志
-        self.validation_logs.append(validation_result)
+        flags = np.zeros(n_symbols, dtype=np.int64)
+        if 'source' in checks:
+            flags[counts < config['min_sources']] |= BATCH_INSUFFICIENT_SOURCES
         
-        return validation_result
-    
-    def validate_general_data(self, data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """验证一般数据"""
-        logger.info(f"验证一般数据，共{len(data_points)}个数据点")
+        # 与逐条验证一致：至少两个入选报价时才计算一致性
+        checked = inlier_counts >= 2
+        if 'consistency' in checks:
+            flags[checked & ~(consistency >= config['consistency_threshold'])] |= BATCH_INCONSISTENT
+        if 'logic' in checks:
+            flags[has_prices & (value <= 0)] |= BATCH_NON_POSITIVE
+            flags[checked & (value > 0) & (spread > config.get('max_spread', 0.5))] |= BATCH_VOLATILE
         
-        validation_result = {
-            'data_type': 'general',
+        stale_sources = np.zeros(n_symbols, dtype=np.int64)
+        if timestamps is not None:
+            timestamps = np.atleast_2d(np.asarray(timestamps, dtype=np.float64))
+            if timestamps.shape != prices.shape:
+                raise ValueError("timestamps与prices的形状不一致")
+            now = time.time() if now is None else now
+            with np.errstate(invalid='ignore'):
+                stale = valid & ((now - timestamps) > config['max_age_minutes'] * 60)
+            stale_sources = stale.sum(axis=1)
+            if 'time' in checks:
+                flags[stale_sources > 0] |= BATCH_STALE
+        
+        passed = has_prices & (flags == 0)
+        confidence = np.where(passed, np.minimum(100.0, np.where(checked, consistency, 0.0) * 100), 0.0)
+        
+        result = {
+            'data_type': data_type,
             'timestamp': datetime.now().isoformat(),
-            'sources_count': len(data_points),
-            'validation_passed': False,
-            'confidence_score': 0.0,
-            'issues': [],
-            'validated_data': None
+            'symbols': symbols,
+            'validation_passed': passed,
+            'value': np.where(has_prices, value, np.nan),
+            'consistency_score': np.where(checked, consistency, np.nan),
+            'confidence_score': confidence,
+            'sources_count': counts,
+            'outliers': outliers.sum(axis=1),
+            'min': np.where(has_prices, low, np.nan),
+            'max': np.where(has_prices, high, np.nan),
+            'stale_sources': stale_sources,
+            'issue_flags': flags,
+            'failed': {symbols[i]: describe_batch_issues(int(flags[i])) or ['没有找到价格数据']
+                       for i in np.flatnonzero(~passed)},
+            'elapsed_ms': (time.perf_counter() - started) * 1000
         }
         
-        # 简化的一般数据验证逻辑
-        if len(data_points) >= self.validation_config['general_data']['min_sources']:
-            # 检查数据一致性
-            values = []
-            for point in data_points:
-                if 'value' in point:
-                    values.append(str(point['value']).lower())
-                elif 'text' in point:
-                    values.append(str(point['text']).lower())
-            
-            if values:
-                # 简单的一致性检查：多数一致
-                from collections import Counter
-                value_counts = Counter(values)
-                most_common = value_counts.most_common(1)
-                
-                if most_common:
-                    most_common_value, count = most_common[0]
-                    consistency = count / len(values)
-                    
-                    if consistency >= self.validation_config['general_data']['consistency_threshold']:
-                        validation_result['validation_passed'] = True
-                        validation_result['confidence_score'] = consistency * 100
-                        validation_result['validated_data'] = {
-                            'value': most_common_value,
-                            'consistency': consistency,
-                            'sources': len(data_points)
-                        }
-                    else:
-                        validation_result['issues'].append(f"数据一致性不足: {consistency:.2%}")
+        logger.debug(f"批量验证{data_type}数据: {n_symbols}个品种，{int(passed.sum())}个通过，耗时{result['elapsed_ms']:.2f}ms")
+        return result
+    
+    def validate_financial_columns(self, symbols: Sequence[str], prices, timestamps=None,
+                                   now: Optional[float] = None, data_type: str = 'financial') -> Dict[str, Any]:
+        """
+        批量验证长表格式（每行一条报价）的金融数据
         
-        self.validation_logs.append(validation_result)
-        return validation_result
+        参数:
+            symbols: 每条报价的品种
+            prices: 每条报价的价格
+            timestamps: 每条报价的时间（Unix秒），可为None
+            now: 当前Unix时间
+            data_type: 使用哪种数据类型的验证配置 (financial / crypto / fx)
+        
+        返回:
+            与 validate_financial_batch 相同，品种按名称排序
+        """
+        names, rows = np.unique(np.asarray(symbols), return_inverse=True)
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(prices) != len(rows):
+            raise ValueError("symbols与prices的长度不一致")
+        
+        # 每条报价在所属品种内的序号作为列号，组装成 (品种数, 最大数据源数) 的矩阵
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        group_start = np.searchsorted(sorted_rows, sorted_rows, side='left')
+        columns = np.empty_like(rows)
+        columns[order] = np.arange(len(rows)) - group_start
+        width = int(columns.max()) + 1 if len(rows) else 1
+        
+        matrix = np.full((len(names), width), np.nan)
+        matrix[rows, columns] = prices
+        
+        time_matrix = None
+        if timestamps is not None:
+            time_matrix = np.full((len(names), width), np.nan)
+            time_matrix[rows, columns] = np.asarray(timestamps, dtype=np.float64)
+        
+        return self.validate_financial_batch(matrix, time_matrix, symbols=names.tolist(), now=now, data_type=data_type)
+    
+    def validate_general_data(self, data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """验证一般数据"""
+        logger.info(f"验证一般数据，共{len(data_points)}个数据点")
+        return self.validate('general', data_points)
     
     def get_data_with_validation(self, data_type: str, data_points: List[Dict[str, Any]]) -> Dict[str, Any]:
         """获取经过验证的数据"""
         logger.info(f"获取{data_type}类型数据，进行验证")
         
-        if data_type == 'financial':
-            validation_result = self.validate_financial_data(data_points)
-        elif data_type == 'general':
-            validation_result = self.validate_general_data(data_points)
+        if data_type in self.validators:
+            validation_result = self.validate(data_type, data_points)
         else:
             validation_result = {
                 'data_type': data_type,
@@ -224,7 +580,7 @@ class DataAccuracyFramework:
             'validation_result': validation_result['validation_passed'],
             'confidence_score': validation_result.get('confidence_score', 0),
             'timestamp': datetime.now().isoformat(),
-            'data_hash': hashlib.md5(str(data_points).encode()).hexdigest()[:8]
+            'data_hash': fingerprint(data_points, 8, STABLE_ALGORITHM)
         }
         
         if validation_result['validation_passed']:
@@ -244,45 +600,33 @@ class DataAccuracyFramework:
             'timestamp': datetime.now().isoformat(),
             'data_type': data_type,
             'result': result,
-            'log_id': hashlib.md5(str(result).encode()).hexdigest()[:12]
+            'log_id': fingerprint(result, 12, STABLE_ALGORITHM)
         }
         
         self.validation_logs.append(log_entry)
-        
-        # 保持日志数量可控
-        if len(self.validation_logs) > 1000:
-            self.validation_logs = self.validation_logs[-1000:]
-        
         return log_entry
     
     def get_validation_summary(self) -> Dict[str, Any]:
         """获取验证统计摘要"""
-        if not self.validation_logs:
+        logs = self.validation_logs
+        if not logs.total:
             return {'total_validations': 0}
         
-        total = len(self.validation_logs)
-        passed = sum(1 for log in self.validation_logs 
-                    if isinstance(log, dict) and log.get('validation_result', {}).get('validation_passed', False))
-        
-        financial_logs = [log for log in self.validation_logs 
-                         if isinstance(log, dict) and log.get('data_type') == 'financial']
-        general_logs = [log for log in self.validation_logs 
-                       if isinstance(log, dict) and log.get('data_type') == 'general']
-        
         return {
-            'total_validations': total,
-            'passed_validations': passed,
-            'failure_rate': (total - passed) / total * 100 if total > 0 else 0,
-            'by_type': {
-                'financial': len(financial_logs),
-                'general': len(general_logs)
-            },
-            'latest_validation': self.validation_logs[-1] if self.validation_logs else None
+            'total_validations': logs.total,
+            'passed_validations': logs.passed,
+            'failure_rate': (logs.total - logs.passed) / logs.total * 100,
+            'rolling_failure_rate': logs.rolling_failure_rate,
+            'by_type': {'financial': 0, 'general': 0, **logs.by_type},
+            'failures_by_type': dict(logs.failures_by_type),
+            'retained_logs': len(logs),
+            'pipelines': self.validators.get_stats(),
+            'latest_validation': logs.latest()
         }
     
     def clear_validation_logs(self):
         """清空验证日志"""
-        self.validation_logs = []
+        self.validation_logs.clear()
         logger.info("验证日志已清空")
 
 # 全局数据准确性框架实例
@@ -294,7 +638,7 @@ def ensure_data_accuracy(data_type: str, data_points: List[Dict[str, Any]],
     确保数据准确性的装饰器函数
     
     参数:
-        data_type: 数据类型 (financial, general, technical)
+        data_type: 数据类型 (financial, crypto, fx, general, technical)
         data_points: 数据点列表
         require_validation: 是否要求验证通过
     
@@ -309,8 +653,8 @@ def ensure_data_accuracy(data_type: str, data_points: List[Dict[str, Any]],
     if require_validation and not validation_report['validation_result']:
         logger.warning(f"数据验证失败: {validation_report.get('message', '未知错误')}")
         
-        # 对于金融数据，验证失败是严重问题
-        if data_type == 'financial':
+        # 对于金融类数据（含加密货币和外汇），验证失败是严重问题
+        if data_type in ('financial', 'crypto', 'fx'):
             raise ValueError(f"金融数据验证失败: {validation_report.get('message', '请检查数据源')}")
     
     return validation_report
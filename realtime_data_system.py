@@ -4,14 +4,24 @@
 """
 
 import asyncio
-import aiohttp
+import heapq
+import os
+import random
+from collections import deque
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from src.utils.http_client import get_http_client, close_http_client
+from src.utils.realtime_cache import RealTimeCache
+from src.utils.realtime_bus import RealtimeBus, Subscription, DROP_OLDEST
+from src.utils.tick_buffer import TickBuffer
+from src.utils.realtime_streams import StreamingSource, STREAM_TYPES
+from src.database.tick_store import TickStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -22,6 +32,82 @@ class DataFreshness(Enum):
     RECENT = "recent"         # <15分钟
     STALE = "stale"           # >15分钟
 
+# 各新鲜度等级的年龄上限（秒）
+FRESHNESS_LIMITS = {
+    DataFreshness.REALTIME: 60,
+    DataFreshness.NEAR_REALTIME: 300,
+    DataFreshness.RECENT: 900,
+    DataFreshness.STALE: float('inf')
+}
+
+NS_PER_SECOND = 1_000_000_000
+
+def freshness_of_age(age_seconds: float) -> DataFreshness:
+    """按年龄（秒）确定新鲜度等级"""
+    if age_seconds < 60:
+        return DataFreshness.REALTIME
+    elif age_seconds < 300:
+        return DataFreshness.NEAR_REALTIME
+    elif age_seconds < 900:
+        return DataFreshness.RECENT
+    else:
+        return DataFreshness.STALE
+
+def stamp_fetch_times(metadata: Dict[str, Any], config: 'RealTimeDataConfig', fetch_ns: int):
+    """
+    在元数据中写入单调时钟获取时间和预先计算的到期时间（纳秒）
+    
+    新鲜度判断只做整数比较；fetch_time（ISO字符串）仅用于展示。最大年龄（max_age_seconds）
+    由缓存条目的有效期控制，不在这里记录
+    """
+    fresh_limit = FRESHNESS_LIMITS[config.required_freshness]
+    metadata['fetch_monotonic_ns'] = fetch_ns
+    metadata['fresh_until_ns'] = fetch_ns + int(min(fresh_limit, 10 ** 9) * NS_PER_SECOND)
+    metadata['grace_until_ns'] = metadata['fresh_until_ns'] + config.stale_grace_seconds * NS_PER_SECOND
+
+def extract_ticks(data_type: str, payload: Any) -> List[tuple]:
+    """
+    从数据源响应中提取价格数据点
+    
+    参数:
+        data_type: 数据类型
+        payload: 数据源返回的原始JSON
+    
+    返回:
+        [(序列名, Unix时间戳, 价格), ...]
+    """
+    ticks = []
+    now = time.time()
+    
+    if not isinstance(payload, dict):
+        return ticks
+    
+    # Yahoo Finance 图表接口（金融市场指数）
+    for result in (payload.get('chart') or {}).get('result') or []:
+        meta = result.get('meta', {})
+        symbol = meta.get('symbol', data_type)
+        timestamps = result.get('timestamp') or []
+        closes = ((result.get('indicators') or {}).get('quote') or [{}])[0].get('close') or []
+        ticks.extend((symbol, float(ts), float(close)) for ts, close in zip(timestamps, closes) if close is not None)
+        if not ticks and meta.get('regularMarketPrice') is not None:
+            ticks.append((symbol, float(meta.get('regularMarketTime') or now), float(meta['regularMarketPrice'])))
+    
+    # Yahoo Finance 报价接口（股票）
+    for quote in (payload.get('quoteResponse') or {}).get('result') or []:
+        if quote.get('regularMarketPrice') is not None:
+            ticks.append((quote['symbol'], float(quote.get('regularMarketTime') or now), float(quote['regularMarketPrice'])))
+    
+    # Coinbase 现货价格
+    coinbase = payload.get('data')
+    if isinstance(coinbase, dict) and 'amount' in coinbase and 'base' in coinbase:
+        ticks.append((f"{coinbase['base']}-{coinbase.get('currency', 'USD')}", now, float(coinbase['amount'])))
+    
+    # Binance 最新价格
+    if 'symbol' in payload and 'price' in payload:
+        ticks.append((payload['symbol'], now, float(payload['price'])))
+    
+    return ticks
+
 @dataclass
 class RealTimeDataConfig:
     """实时数据配置"""
@@ -31,6 +117,7 @@ class RealTimeDataConfig:
     required_freshness: DataFreshness
     retry_count: int = 3
     retry_delay_seconds: int = 2
+    stale_grace_seconds: int = 0  # 超出新鲜度要求后仍可先返回旧数据、后台刷新的时间窗口（秒）
 
 class RealTimeDataSystem:
     """实时数据系统"""
@@ -42,46 +129,91 @@ class RealTimeDataSystem:
                 data_type='financial_market',
                 refresh_interval_seconds=30,  # 每30秒刷新
                 max_age_seconds=300,  # 5分钟最大年龄
-                required_freshness=DataFreshness.NEAR_REALTIME
+                required_freshness=DataFreshness.NEAR_REALTIME,
+                stale_grace_seconds=60
             ),
             'stock_prices': RealTimeDataConfig(
                 data_type='stock_prices',
                 refresh_interval_seconds=10,  # 每10秒刷新
                 max_age_seconds=60,  # 1分钟最大年龄
-                required_freshness=DataFreshness.REALTIME
+                required_freshness=DataFreshness.REALTIME,
+                stale_grace_seconds=10
             ),
             'crypto_prices': RealTimeDataConfig(
                 data_type='crypto_prices',
                 refresh_interval_seconds=5,  # 每5秒刷新
                 max_age_seconds=30,  # 30秒最大年龄
-                required_freshness=DataFreshness.REALTIME
+                required_freshness=DataFreshness.REALTIME,
+                stale_grace_seconds=5
             ),
             'news': RealTimeDataConfig(
                 data_type='news',
                 refresh_interval_seconds=60,  # 每60秒刷新
                 max_age_seconds=600,  # 10分钟最大年龄
-                required_freshness=DataFreshness.RECENT
+                required_freshness=DataFreshness.RECENT,
+                stale_grace_seconds=120
             ),
             'economic_indicators': RealTimeDataConfig(
                 data_type='economic_indicators',
                 refresh_interval_seconds=300,  # 每5分钟刷新
                 max_age_seconds=1800,  # 30分钟最大年龄
-                required_freshness=DataFreshness.NEAR_REALTIME
+                required_freshness=DataFreshness.NEAR_REALTIME,
+                stale_grace_seconds=600
             )
         }
         
         # 数据缓存
-        self.data_cache: Dict[str, Dict[str, Any]] = {}
+        # 按 (数据类型, 数据源, 参数) 缓存，条目有效期为 max_age_seconds，超出条目数或内存上限时LRU淘汰
+        self.data_cache = RealTimeCache(max_entries=10000, max_bytes=64 * 1024 * 1024)
+        
+        # 缓存快照：定期写入磁盘，重启后加载，启动阶段的请求可以立即得到应答
+        self.snapshot_path = "data/realtime_cache.snapshot"
+        self.snapshot_interval_seconds = 60
+        self._snapshot_loaded = False
         
         # 数据源状态
         self.source_status: Dict[str, Dict[str, Any]] = {}
         
         # 订阅者列表
-        self.subscribers: Dict[str, List[callable]] = {}
+        # 每个订阅者有独立的有界队列和分发任务，慢订阅者不影响数据刷新
+        self.bus = RealtimeBus()
+        
+        # 多数据源获取模式：sequential 依次尝试 / hedged 对冲请求 / gather 并发获取全部数据源
+        self.fetch_mode = 'hedged'
+        self.hedge_percentile = 95  # 主数据源耗时超过其历史该分位数时启动备用数据源
+        self.hedge_delay_default = 1.0  # 样本不足时的对冲等待时间（秒）
+        self.hedge_delay_bounds = (0.05, 5.0)
+        self.source_latency: Dict[str, deque] = {}  # 数据源URL -> 最近的成功响应耗时
+        
+        # 各价格序列的行情环形缓冲区（盘中统计无需重新获取数据）
+        self.tick_capacity = 20000
+        self.ticks: Dict[str, TickBuffer] = {}
+        
+        # 行情历史持久化（按品种、按天分区的列式文件），用于重启后预热和回测
+        self.tick_store = TickStore(root="data/ticks")
+        
+        # 单飞合并：同一数据类型同时只有一个进行中的刷新，并发调用者共享其结果
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.single_flight_stats = {'fetches': 0, 'coalesced': 0, 'stale_served': 0}
+        
+        # 推送数据源：WebSocket长连接推送的数据直接写入缓存并通知订阅者；
+        # 推送数据足够新时调度器顺延REST轮询，推送中断后轮询自动恢复
+        self.enable_streaming = True
+        self.streams: List[StreamingSource] = []
+        
+        # 共享HTTP连接池（复用keep-alive连接，避免每次请求重新握手）
+        self.http_client = get_http_client()
         
         # 运行状态
         self.is_running = False
         
+        # 调度器：按截止时间排序的堆，每种数据类型按各自的刷新间隔触发
+        self.schedule_jitter = 0.1  # 触发时间随机抖动比例，避免多种数据同时打到数据源
+        self.schedule_stats: Dict[str, Dict[str, Any]] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self._next_due: Dict[str, float] = {}
+        self._scheduled_data: Dict[str, Dict[str, Any]] = {}  # 最近一次由调度刷新得到的数据
+        
     async def fetch_realtime_data(self, data_type: str, url: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """获取实时数据"""
         config = self.data_configs.get(data_type)
@@ -95,37 +227,40 @@ class RealTimeDataSystem:
         
         for attempt in range(config.retry_count):
             try:
-                async with aiohttp.ClientSession() as session:
-                    timeout = aiohttp.ClientTimeout(total=10)
+                response = await self.http_client.get(url, params=params, headers=headers, timeout=10)
+                
+                if response.status == 200:
+                    data = response.json()
+                    
+                    self.source_latency.setdefault(url, deque(maxlen=200)).append(response.elapsed)
+                    
+                    # 添加时间戳和元数据
+                    enriched_data = {
+                        'data': data,
+                        'metadata': {
+                            'fetch_time': datetime.now(timezone.utc).isoformat(),
+                            'data_type': data_type,
+                            'source_url': url,
+                            'freshness': DataFreshness.REALTIME.value,
+                            'age_seconds': 0,
+                            'attempt': attempt + 1
+                        }
+                    }
+                    stamp_fetch_times(enriched_data['metadata'], config, time.monotonic_ns())
+                    
+                    # 更新数据源状态
+                    self.source_status[url] = {
+                        'last_success': datetime.now().isoformat(),
+                        'response_time': response.elapsed,
+                        'latency_p50': self.latency_percentile(url, 50),
+                        'latency_p95': self.latency_percentile(url, 95),
+                        'status': 'healthy'
+                    }
+                    
+                    return enriched_data
+                else:
+                    logger.warning(f"数据获取失败: {response.status} - {url}")
                     
-                    async with session.get(url, params=params, headers=headers, timeout=timeout) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            # 添加时间戳和元数据
-                            enriched_data = {
-                                'data': data,
-                                'metadata': {
-                                    'fetch_time': datetime.now().isoformat(),
-                                    'data_type': data_type,
-                                    'source_url': url,
-                                    'freshness': DataFreshness.REALTIME.value,
-                                    'age_seconds': 0,
-                                    'attempt': attempt + 1
-                                }
-                            }
-                            
-                            # 更新数据源状态
-                            self.source_status[url] = {
-                                'last_success': datetime.now().isoformat(),
-                                'response_time': response.elapsed.total_seconds(),
-                                'status': 'healthy'
-                            }
-                            
-                            return enriched_data
-                        else:
-                            logger.warning(f"数据获取失败: {response.status} - {url}")
-                            
             except asyncio.TimeoutError:
                 logger.warning(f"请求超时: {url} (尝试 {attempt + 1}/{config.retry_count})")
             except Exception as e:
@@ -144,97 +279,351 @@ class RealTimeDataSystem:
         raise Exception(f"无法获取数据: {data_type} from {url}")
     
     def calculate_freshness(self, fetch_time: str) -> DataFreshness:
-        """计算数据新鲜度"""
+        """根据ISO格式的获取时间计算数据新鲜度（用于展示；热路径使用 data_age_seconds）"""
         try:
             fetch_datetime = datetime.fromisoformat(fetch_time.replace('Z', '+00:00'))
-            age_seconds = (datetime.now() - fetch_datetime).total_seconds()
-            
-            if age_seconds < 60:
-                return DataFreshness.REALTIME
-            elif age_seconds < 300:
-                return DataFreshness.NEAR_REALTIME
-            elif age_seconds < 900:
-                return DataFreshness.RECENT
-            else:
-                return DataFreshness.STALE
+            if fetch_datetime.tzinfo is None:
+                fetch_datetime = fetch_datetime.astimezone()
+            age_seconds = (datetime.now(timezone.utc) - fetch_datetime).total_seconds()
+            return freshness_of_age(age_seconds)
         except:
             return DataFreshness.STALE
     
+    def data_age_seconds(self, data: Dict[str, Any]) -> Optional[float]:
+        """数据的年龄（秒），按单调时钟计算；缺少获取时间时返回None"""
+        fetch_ns = data.get('metadata', {}).get('fetch_monotonic_ns')
+        if fetch_ns is None:
+            return None
+        return (time.monotonic_ns() - fetch_ns) / NS_PER_SECOND
+    
     def is_data_fresh(self, data: Dict[str, Any], config: RealTimeDataConfig) -> bool:
-        """检查数据是否新鲜"""
-        if 'metadata' not in data:
-            return False
+        """检查数据是否满足要求的新鲜度（与获取时预先计算的到期时间做整数比较）"""
+        fresh_until_ns = data.get('metadata', {}).get('fresh_until_ns')
+        return fresh_until_ns is not None and time.monotonic_ns() < fresh_until_ns
+    
+    def latency_percentile(self, url: str, percentile: float) -> Optional[float]:
+        """数据源最近成功响应耗时的分位数（秒），无样本时返回None"""
+        samples = self.source_latency.get(url)
+        if not samples:
+            return None
+        
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+    
+    def _hedge_delay(self, url: str) -> float:
+        """启动下一个数据源前等待的时间：该数据源耗时的高分位数"""
+        samples = self.source_latency.get(url)
+        if not samples or len(samples) < 5:
+            return self.hedge_delay_default
+        
+        low, high = self.hedge_delay_bounds
+        return min(high, max(low, self.latency_percentile(url, self.hedge_percentile)))
+    
+    async def _fetch_source(self, data_type: str, source_name: str, source_info: Dict[str, Any]) -> Dict[str, Any]:
+        """从单个数据源获取数据并标注数据源名称"""
+        data = await self.fetch_realtime_data(data_type, source_info['url'], source_info.get('params'))
+        data['metadata']['source_name'] = source_name
+        return data
+    
+    async def _fetch_hedged(self, data_type: str, data_sources: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        对冲请求：先请求主数据源，超过其耗时高分位数仍未返回（或已失败）时启动下一个数据源，
+        取最先成功的结果并取消其余请求
+        
+        Returns:
+            最先成功的数据，全部失败时返回None
+        """
+        remaining = list(data_sources.items())
+        pending: Dict[asyncio.Task, str] = {}
+        last_url = None
+        
+        def _launch():
+            nonlocal last_url
+            source_name, source_info = remaining.pop(0)
+            task = asyncio.create_task(self._fetch_source(data_type, source_name, source_info))
+            pending[task] = source_name
+            last_url = source_info['url']
         
-        metadata = data['metadata']
-        fetch_time = metadata.get('fetch_time')
+        try:
+            while remaining or pending:
+                if not pending:
+                    _launch()
+                
+                timeout = self._hedge_delay(last_url) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    source_name = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    logger.error(f"数据源 {source_name} 失败: {task.exception()}")
+                
+                # 超时未返回或有数据源失败时，启动下一个数据源
+                if remaining:
+                    if not done:
+                        logger.info(f"数据源 {', '.join(pending.values())} 响应慢，启动对冲请求: {remaining[0][0]}")
+                    _launch()
+            
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def fetch_all_sources(self, data_type: str) -> Dict[str, Dict[str, Any]]:
+        """
+        并发获取某数据类型的全部数据源（用于跨数据源交叉验证）
         
-        if not fetch_time:
+        Returns:
+            按数据源优先级排列的 {数据源名称: 数据}，仅包含成功的数据源
+        """
+        data_sources = self.get_data_sources(data_type)
+        results = await asyncio.gather(
+            *(self._fetch_source(data_type, name, info) for name, info in data_sources.items()),
+            return_exceptions=True
+        )
+        
+        successful = {}
+        for source_name, result in zip(data_sources, results):
+            if isinstance(result, BaseException):
+                logger.error(f"数据源 {source_name} 失败: {result}")
+            else:
+                successful[source_name] = result
+        return successful
+    
+    def is_within_grace(self, data: Dict[str, Any], config: RealTimeDataConfig) -> bool:
+        """已不满足新鲜度要求的数据是否仍在 stale-while-revalidate 宽限窗口内"""
+        if config.stale_grace_seconds <= 0:
             return False
         
-        freshness = self.calculate_freshness(fetch_time)
-        
-        # 检查是否满足要求的新鲜度
-        freshness_order = {
-            DataFreshness.REALTIME: 4,
-            DataFreshness.NEAR_REALTIME: 3,
-            DataFreshness.RECENT: 2,
-            DataFreshness.STALE: 1
-        }
-        
-        return freshness_order.get(freshness, 0) >= freshness_order.get(config.required_freshness, 0)
+        grace_until_ns = data.get('metadata', {}).get('grace_until_ns')
+        return grace_until_ns is not None and time.monotonic_ns() <= grace_until_ns
     
-    async def get_or_refresh_data(self, data_type: str, force_refresh: bool = False) -> Dict[str, Any]:
-        """获取或刷新数据"""
+    async def get_or_refresh_data(self, data_type: str, force_refresh: bool = False,
+                                  mode: Optional[str] = None) -> Dict[str, Any]:
+        """
+        获取或刷新数据
+        
+        参数:
+            data_type: 数据类型
+            force_refresh: 是否忽略缓存强制刷新
+            mode: 多数据源获取模式 (sequential / hedged / gather)，默认使用 fetch_mode
+        """
         config = self.data_configs.get(data_type)
         if not config:
             raise ValueError(f"未知的数据类型: {data_type}")
         
+        if not self._snapshot_loaded:
+            self.load_snapshot()
+        
         # 检查缓存中是否有数据
-        cached_data = self.data_cache.get(data_type)
+        entry = self.data_cache.latest_entry(data_type, allow_expired=True)
+        cached_data = entry.value if entry else None
         
         if cached_data and not force_refresh:
-            # 检查数据是否仍然新鲜
-            if self.is_data_fresh(cached_data, config):
+            # 检查数据是否仍然新鲜（未超过 max_age_seconds 且满足新鲜度要求）
+            if not entry.expired and self.is_data_fresh(cached_data, config):
                 logger.info(f"使用缓存数据: {data_type}")
                 return cached_data
             
+            # 刚过期且在宽限窗口内：先返回旧数据，后台刷新（stale-while-revalidate）
+            if self.is_within_grace(cached_data, config):
+                logger.info(f"返回旧数据并后台刷新: {data_type}")
+                self.single_flight_stats['stale_served'] += 1
+                self._start_refresh(data_type, mode)
+                return cached_data
+            
             # 数据不新鲜，需要刷新
             logger.info(f"数据已过期，刷新: {data_type}")
         
-        # 需要获取新数据
-        logger.info(f"获取实时数据: {data_type}")
-        
-        # 根据数据类型选择数据源
-        data_sources = self.get_data_sources(data_type)
-        
-        # 尝试从多个数据源获取
-        for source_name, source_info in data_sources.items():
-            try:
-                data = await self.fetch_realtime_data(
-                    data_type, 
-                    source_info['url'], 
-                    source_info.get('params')
-                )
-                
-                # 更新缓存
-                self.data_cache[data_type] = data
-                
-                # 通知订阅者
-                await self.notify_subscribers(data_type, data)
-                
-                return data
-                
-            except Exception as e:
-                logger.error(f"数据源 {source_name} 失败: {e}")
-                continue
+        data = await asyncio.shield(self._start_refresh(data_type, mode))
+        if data is not None:
+            return data
         
         # 所有数据源都失败
+        cached_data = self._get_cached(data_type)
         if cached_data:
             logger.warning(f"所有数据源失败，使用过期缓存: {data_type}")
             return cached_data
         else:
             raise Exception(f"无法获取数据: {data_type}")
     
+    def _store(self, data_type: str, data: Dict[str, Any], data_sources: Dict[str, Dict[str, Any]]):
+        """按 (数据类型, 数据源, 参数) 写入缓存，有效期为该数据类型的 max_age_seconds"""
+        source_name = data['metadata'].get('source_name')
+        params = data_sources.get(source_name, {}).get('params')
+        key = self.data_cache.make_key(data_type, source_name, params)
+        self.data_cache.set(key, data, ttl=self.data_configs[data_type].max_age_seconds)
+    
+    def record_ticks(self, data_type: str, data: Dict[str, Any]):
+        """把新数据中的价格写入对应序列的行情缓冲区（只追加比已有数据更新的点）"""
+        try:
+            ticks = extract_ticks(data_type, data.get('data'))
+        except (TypeError, ValueError, KeyError) as e:
+            logger.debug(f"提取行情数据失败: {data_type} - {e}")
+            return
+        
+        for series, timestamp, price in ticks:
+            buffer = self.ticks.get(series)
+            if buffer is None:
+                buffer = self.ticks[series] = TickBuffer(self.tick_capacity)
+            
+            last_timestamp = buffer.last_timestamp
+            if last_timestamp is None or timestamp > last_timestamp:
+                buffer.append(timestamp, price)
+                if self.tick_store is not None:
+                    self.tick_store.append(series, timestamp, price)
+    
+    def warm_start(self, seconds: float = 86400):
+        """
+        从行情历史存储加载最近的数据到行情缓冲区（重启后无需重新积累盘中数据）
+        
+        参数:
+            seconds: 加载的时间范围（秒）
+        """
+        if self.tick_store is None:
+            return
+        
+        start = time.time() - seconds
+        for series in self.tick_store.symbols():
+            timestamps, prices = self.tick_store.query(series, start=start)
+            if not len(timestamps):
+                continue
+            
+            buffer = self.ticks.get(series)
+            if buffer is None:
+                buffer = self.ticks[series] = TickBuffer(self.tick_capacity)
+            if len(buffer):
+                continue
+            
+            buffer.extend(timestamps / 1000.0, prices)
+            logger.info(f"行情预热: {series} {len(timestamps)} 个数据点")
+    
+    def get_tick_stats(self, series: str, seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        行情序列的窗口统计（均值、最高/最低、涨跌幅、波动率）
+        
+        参数:
+            series: 序列名，如 ^HSI、BTC-USD
+            seconds: 时间窗口（秒），默认缓冲区内全部数据
+        """
+        buffer = self.ticks.get(series)
+        if buffer is None:
+            return {'count': 0}
+        return buffer.stats(seconds=seconds)
+    
+    def save_snapshot(self):
+        """把数据缓存写入快照文件"""
+        if not self.snapshot_path:
+            return
+        try:
+            count = self.data_cache.save_snapshot(self.snapshot_path)
+            logger.debug(f"缓存快照已保存: {count} 个条目")
+        except Exception as e:
+            logger.error(f"保存缓存快照失败: {e}")
+    
+    def load_snapshot(self):
+        """
+        从快照文件恢复数据缓存（只在启动后执行一次）
+        
+        恢复的数据保留原始获取时间，由新鲜度规则决定直接使用、先返回再后台刷新还是重新获取
+        """
+        self._snapshot_loaded = True
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            count = self.data_cache.load_snapshot(self.snapshot_path)
+        except Exception as e:
+            logger.error(f"加载缓存快照失败: {e}")
+            return
+        
+        # 快照中的单调时钟时间在重启后无效，按条目的原始获取时间（墙上时钟换算的年龄）重新计算
+        now_ns = time.monotonic_ns()
+        for entry in self.data_cache.entries():
+            config = self.data_configs.get(entry.key[0])
+            if config is None or not isinstance(entry.value, dict):
+                continue
+            fetch_ns = now_ns - int(entry.age * NS_PER_SECOND)
+            for data in [entry.value, *entry.value.get('all_sources', {}).values()]:
+                if 'metadata' in data:
+                    stamp_fetch_times(data['metadata'], config, fetch_ns)
+        
+        logger.info(f"从快照恢复缓存: {count} 个条目")
+    
+    def _get_cached(self, data_type: str) -> Optional[Dict[str, Any]]:
+        """某数据类型最近一次缓存的数据（含已过期的数据）"""
+        entry = self.data_cache.latest_entry(data_type, allow_expired=True)
+        return entry.value if entry else None
+    
+    def _start_refresh(self, data_type: str, mode: Optional[str] = None) -> asyncio.Task:
+        """
+        启动刷新；已有进行中的刷新时直接返回该刷新任务（单飞合并）
+        
+        调用者通过 asyncio.shield 等待，刷新任务不随单个调用者取消而取消
+        """
+        task = self._inflight.get(data_type)
+        if task is not None and not task.done():
+            self.single_flight_stats['coalesced'] += 1
+            return task
+        
+        self.single_flight_stats['fetches'] += 1
+        task = asyncio.create_task(self._refresh(data_type, mode))
+        self._inflight[data_type] = task
+        
+        def _clear(finished: asyncio.Task):
+            if self._inflight.get(data_type) is finished:
+                del self._inflight[data_type]
+        
+        task.add_done_callback(_clear)
+        return task
+    
+    async def _refresh(self, data_type: str, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        从数据源获取新数据，更新缓存并通知订阅者
+        
+        返回:
+            新数据，所有数据源都失败时返回None
+        """
+        logger.info(f"获取实时数据: {data_type}")
+        
+        # 根据数据类型选择数据源
+        data_sources = self.get_data_sources(data_type)
+        
+        mode = mode or self.fetch_mode
+        data = None
+        
+        try:
+            if mode == 'gather':
+                # 并发获取全部数据源，按数据源优先级取主结果，其余结果供交叉验证
+                results = await self.fetch_all_sources(data_type)
+                for result in list(results.values())[1:]:
+                    self._store(data_type, result, data_sources)
+                if results:
+                    data = dict(next(iter(results.values())))
+                    data['all_sources'] = results
+            elif mode == 'hedged':
+                data = await self._fetch_hedged(data_type, data_sources)
+            else:
+                for source_name, source_info in data_sources.items():
+                    try:
+                        data = await self._fetch_source(data_type, source_name, source_info)
+                        break
+                    except Exception as e:
+                        logger.error(f"数据源 {source_name} 失败: {e}")
+        except Exception as e:
+            logger.error(f"刷新数据失败: {data_type} - {e}")
+            return None
+        
+        if data is not None:
+            # 更新缓存
+            self._store(data_type, data, data_sources)
+            self.record_ticks(data_type, data)
+            
+            # 通知订阅者
+            await self.notify_subscribers(data_type, data)
+        
+        return data
+    
     def get_data_sources(self, data_type: str) -> Dict[str, Dict[str, Any]]:
         """获取数据源配置"""
         sources = {
@@ -267,93 +656,264 @@ class RealTimeDataSystem:
         
         return sources.get(data_type, {})
     
+    def get_streaming_sources(self, data_type: str) -> Dict[str, Dict[str, Any]]:
+        """获取推送数据源配置（名称对应 STREAM_TYPES，url 为空时使用默认地址）"""
+        sources = {
+            'crypto_prices': {
+                'coinbase': {
+                    'url': None,
+                    'symbols': ['BTC-USD']
+                },
+                'binance': {
+                    'url': None,
+                    'symbols': ['BTCUSDT']
+                }
+            }
+        }
+        
+        return sources.get(data_type, {})
+    
+    def start_streams(self):
+        """为配置了推送数据源的数据类型建立长连接（已启动时不重复启动）"""
+        if not self.enable_streaming or self.streams:
+            return
+        
+        for data_type in self.data_configs:
+            for source_name, source_info in self.get_streaming_sources(data_type).items():
+                stream_class = STREAM_TYPES.get(source_name)
+                if stream_class is None:
+                    logger.warning(f"未知的推送数据源: {source_name}")
+                    continue
+                stream = stream_class(data_type, source_info['symbols'], self._on_stream_update,
+                                      url=source_info.get('url'))
+                stream.start()
+                self.streams.append(stream)
+        
+        if self.streams:
+            logger.info(f"推送数据源启动: {len(self.streams)} 个")
+    
+    async def stop_streams(self):
+        """关闭所有推送连接"""
+        streams, self.streams = self.streams, []
+        for stream in streams:
+            await stream.stop()
+    
+    async def _on_stream_update(self, data_type: str, source_name: str, payload: Dict[str, Any]):
+        """推送数据与REST数据格式一致，按相同方式写入缓存、行情缓冲区并通知订阅者"""
+        config = self.data_configs[data_type]
+        data = {
+            'data': payload,
+            'metadata': {
+                'fetch_time': datetime.now(timezone.utc).isoformat(),
+                'data_type': data_type,
+                'source_name': source_name,
+                'transport': 'websocket',
+                'freshness': DataFreshness.REALTIME.value,
+                'age_seconds': 0
+            }
+        }
+        stamp_fetch_times(data['metadata'], config, time.monotonic_ns())
+        
+        self._store(data_type, data, self.get_data_sources(data_type))
+        self.record_ticks(data_type, data)
+        await self.notify_subscribers(data_type, data)
+    
     async def notify_subscribers(self, data_type: str, data: Dict[str, Any]):
-        """通知订阅者"""
-        if data_type in self.subscribers:
-            for callback in self.subscribers[data_type]:
-                try:
-                    await callback(data_type, data)
-                except Exception as e:
-                    logger.error(f"通知订阅者失败: {e}")
-    
-    def subscribe(self, data_type: str, callback: callable):
-        """订阅数据更新"""
-        if data_type not in self.subscribers:
-            self.subscribers[data_type] = []
-        
-        self.subscribers[data_type].append(callback)
+        """通知订阅者（放入各订阅者队列后立即返回，由各自的分发任务调用回调）"""
+        await self.bus.publish(data_type, data)
+    
+    def subscribe(self, data_type: str, callback: callable, maxsize: int = 100,
+                  policy: str = DROP_OLDEST) -> Subscription:
+        """
+        订阅数据更新
+        
+        参数:
+            data_type: 数据类型
+            callback: 回调 callback(data_type, data)
+            maxsize: 待处理更新的队列容量
+            policy: 队列满时的处理策略 (drop_oldest / block / coalesce)
+        """
+        subscription = self.bus.subscribe(data_type, callback, maxsize=maxsize, policy=policy)
         logger.info(f"新的订阅者: {data_type}")
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        """取消订阅"""
+        self.bus.unsubscribe(subscription)
+    
+    def _cache_age_seconds(self, data_type: str) -> Optional[float]:
+        """缓存数据的年龄（秒），无缓存时返回None"""
+        cached_data = self._get_cached(data_type)
+        if not cached_data:
+            return None
+        return self.data_age_seconds(cached_data)
+    
+    def _jittered(self, interval: float) -> float:
+        """为刷新间隔加上随机抖动"""
+        return interval * (1 + random.uniform(-self.schedule_jitter, self.schedule_jitter))
+    
+    async def _scheduled_refresh(self, data_type: str):
+        """执行一次调度触发的刷新"""
+        try:
+            self._scheduled_data[data_type] = await self.get_or_refresh_data(data_type, force_refresh=True)
+        except Exception as e:
+            logger.error(f"监控 {data_type} 失败: {e}")
     
     async def start_monitoring(self):
-        """启动数据监控"""
+        """
+        启动数据监控
+        
+        每种数据类型按各自的 refresh_interval_seconds（带抖动）触发刷新，
+        刷新任务并发执行，慢数据源不会拖延其他数据类型；同一数据类型的
+        上一次刷新尚未完成时跳过本次触发
+        """
         self.is_running = True
         logger.info("实时数据监控启动")
         
-        while self.is_running:
-            try:
-                # 监控所有数据类型
-                for data_type, config in self.data_configs.items():
-                    try:
-                        # 检查是否需要刷新
-                        cached_data = self.data_cache.get(data_type)
-                        needs_refresh = False
-                        
-                        if not cached_data:
-                            needs_refresh = True
-                        else:
-                            metadata = cached_data.get('metadata', {})
-                            fetch_time = metadata.get('fetch_time')
-                            
-                            if fetch_time:
-                                fetch_datetime = datetime.fromisoformat(fetch_time.replace('Z', '+00:00'))
-                                age_seconds = (datetime.now() - fetch_datetime).total_seconds()
-                                
-                                if age_seconds > config.refresh_interval_seconds:
-                                    needs_refresh = True
-                        
-                        if needs_refresh:
-                            await self.get_or_refresh_data(data_type)
-                            
-                    except Exception as e:
-                        logger.error(f"监控 {data_type} 失败: {e}")
+        if not self._snapshot_loaded:
+            self.load_snapshot()
+        
+        try:
+            self.warm_start()
+        except Exception as e:
+            logger.error(f"行情预热失败: {e}")
+        
+        self.start_streams()
+        
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        next_snapshot = now + self.snapshot_interval_seconds
+        
+        # (截止时间, 序号, 数据类型)；首次触发在一个抖动窗口内错开
+        schedule = []
+        for seq, (data_type, config) in enumerate(self.data_configs.items()):
+            deadline = now + random.uniform(0, config.refresh_interval_seconds * self.schedule_jitter)
+            schedule.append((deadline, seq, data_type))
+            self.schedule_stats[data_type] = {
+                'fires': 0, 'skipped_fresh': 0, 'skipped_running': 0,
+                'last_lag_ms': 0.0, 'max_lag_ms': 0.0, 'total_lag_ms': 0.0
+            }
+        heapq.heapify(schedule)
+        
+        try:
+            while self.is_running and schedule:
+                if loop.time() >= next_snapshot:
+                    self.save_snapshot()
+                    next_snapshot = loop.time() + self.snapshot_interval_seconds
                 
-                # 等待下一次检查
-                await asyncio.sleep(10)  # 每10秒检查一次
+                deadline, seq, data_type = schedule[0]
+                delay = deadline - loop.time()
+                if delay > 0:
+                    # 最多等待1秒，以便及时响应 stop_monitoring
+                    await asyncio.sleep(min(delay, 1.0))
+                    continue
                 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"监控循环错误: {e}")
-                await asyncio.sleep(30)  # 错误后等待30秒
+                heapq.heappop(schedule)
+                config = self.data_configs[data_type]
+                stats = self.schedule_stats[data_type]
+                
+                now = loop.time()
+                lag_ms = (now - deadline) * 1000
+                stats['last_lag_ms'] = lag_ms
+                stats['max_lag_ms'] = max(stats['max_lag_ms'], lag_ms)
+                stats['total_lag_ms'] += lag_ms
+                stats['fires'] += 1
+                
+                next_deadline = deadline + self._jittered(config.refresh_interval_seconds)
+                
+                age_seconds = self._cache_age_seconds(data_type)
+                
+                task = self._refresh_tasks.get(data_type)
+                if task and not task.done():
+                    # 上一次刷新仍在进行，不重复发起
+                    stats['skipped_running'] += 1
+                elif (age_seconds is not None and age_seconds < config.refresh_interval_seconds / 2
+                      and self._get_cached(data_type) is not self._scheduled_data.get(data_type)):
+                    # 数据刚被按需刷新过（非调度刷新），顺延到该数据到期时再刷新
+                    stats['skipped_fresh'] += 1
+                    next_deadline = now + self._jittered(config.refresh_interval_seconds - age_seconds)
+                else:
+                    self._refresh_tasks[data_type] = asyncio.create_task(self._scheduled_refresh(data_type))
+                
+                # 落后超过一个周期时不补发积压的触发
+                if next_deadline < now:
+                    next_deadline = now + self._jittered(config.refresh_interval_seconds)
+                
+                self._next_due[data_type] = next_deadline
+                heapq.heappush(schedule, (next_deadline, seq, data_type))
+                
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for task in self._refresh_tasks.values():
+                task.cancel()
+            self._refresh_tasks.clear()
+            await self.stop_streams()
     
     async def stop_monitoring(self):
         """停止数据监控"""
         self.is_running = False
+        await self.stop_streams()
+        if self.tick_store is not None:
+            self.tick_store.flush()
+        self.save_snapshot()
+        self.bus.close()
         logger.info("实时数据监控停止")
     
+    def get_schedule_status(self) -> Dict[str, Any]:
+        """获取调度状态（触发次数、跳过次数和调度延迟）"""
+        try:
+            now = asyncio.get_running_loop().time()
+        except RuntimeError:
+            now = None
+        
+        schedule_info = {}
+        for data_type, stats in self.schedule_stats.items():
+            task = self._refresh_tasks.get(data_type)
+            next_due = self._next_due.get(data_type)
+            schedule_info[data_type] = {
+                'refresh_interval_seconds': self.data_configs[data_type].refresh_interval_seconds,
+                'fires': stats['fires'],
+                'skipped_fresh': stats['skipped_fresh'],
+                'skipped_running': stats['skipped_running'],
+                'last_lag_ms': round(stats['last_lag_ms'], 2),
+                'max_lag_ms': round(stats['max_lag_ms'], 2),
+                'avg_lag_ms': round(stats['total_lag_ms'] / stats['fires'], 2) if stats['fires'] else 0.0,
+                'refreshing': bool(task and not task.done()),
+                'next_due_in': round(next_due - now, 2) if next_due is not None and now is not None else None
+            }
+        return schedule_info
+    
     def get_system_status(self) -> Dict[str, Any]:
         """获取系统状态"""
         status = {
             'is_running': self.is_running,
             'data_types_monitored': list(self.data_configs.keys()),
             'cache_size': len(self.data_cache),
-            'subscriber_count': sum(len(subs) for subs in self.subscribers.values()),
+            'cache': self.data_cache.get_stats(),
+            'tick_series': {series: len(buffer) for series, buffer in self.ticks.items()},
+            'subscriber_count': self.bus.subscriber_count(),
+            'subscribers': self.bus.get_stats(),
             'source_health': self.source_status,
+            'http_pool': self.http_client.get_metrics(),
+            'scheduler': self.get_schedule_status(),
+            'single_flight': {**self.single_flight_stats, 'in_flight': sorted(self._inflight)},
+            'streams': {f"{stream.data_type}/{stream.name}": stream.get_status() for stream in self.streams},
             'timestamp': datetime.now().isoformat()
         }
         
         # 添加缓存数据新鲜度信息
         freshness_info = {}
-        for data_type, data in self.data_cache.items():
-            if 'metadata' in data:
+        for data_type in self.data_cache.data_types():
+            data = self._get_cached(data_type)
+            if data and 'metadata' in data:
                 metadata = data['metadata']
-                fetch_time = metadata.get('fetch_time', '')
-                freshness = self.calculate_freshness(fetch_time)
+                age_seconds = self.data_age_seconds(data)
                 
                 freshness_info[data_type] = {
-                    'freshness': freshness.value,
-                    'fetch_time': fetch_time,
-                    'age_seconds': (datetime.now() - datetime.fromisoformat(fetch_time.replace('Z', '+00:00'))).total_seconds() if fetch_time else 'unknown'
+                    'freshness': freshness_of_age(age_seconds).value if age_seconds is not None else DataFreshness.STALE.value,
+                    'fetch_time': metadata.get('fetch_time', ''),
+                    'age_seconds': age_seconds if age_seconds is not None else 'unknown'
                 }
         
         status['cache_freshness'] = freshness_info
@@ -379,13 +939,9 @@ async def ensure_realtime_data(data_type: str, max_age_seconds: int = 300) -> Di
     data = await realtime_system.get_or_refresh_data(data_type)
     
     # 检查数据新鲜度
-    metadata = data.get('metadata', {})
-    fetch_time = metadata.get('fetch_time')
+    age_seconds = realtime_system.data_age_seconds(data)
     
-    if fetch_time:
-        fetch_datetime = datetime.fromisoformat(fetch_time.replace('Z', '+00:00'))
-        age_seconds = (datetime.now() - fetch_datetime).total_seconds()
-        
+    if age_seconds is not None:
         if age_seconds > max_age_seconds:
             logger.warning(f"数据年龄 {age_seconds:.1f}秒 超过限制 {max_age_seconds}秒")
             
@@ -444,6 +1000,8 @@ async def example_usage():
         except asyncio.CancelledError:
             pass
         
+        await close_http_client()
+        
         print("\n✅ 实时数据系统示例完成")
 
 if __name__ == "__main__":
@@ -4,41 +4,183 @@
 """
 
 import abc
+import asyncio
 import logging
+import sys
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Awaitable, Callable, Tuple, AsyncIterator, Union
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import FrozenInstanceError
+from urllib.parse import urlparse
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库json
+    orjson = None
+
+from .checkpoint import CollectorCheckpoint
+from ..utils.http_client import HttpResponse, get_http_client
+from ..utils.http_cache import ValidatorCache, get_validator_cache
+from ..utils.rate_limiter import get_rate_limiter
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """序列化为JSON字符串（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _is_json(text: Union[bytes, str]) -> bool:
+    """文本是否为合法JSON（只解析校验，不保留结果）"""
+    try:
+        if orjson is not None:
+            orjson.loads(text)
+        else:
+            json.loads(text)
+    except ValueError:  # 包括 JSONDecodeError 和 UnicodeDecodeError
+        return False
+    return True
+
 
-@dataclass
 class CollectedItem:
-    """采集的数据项"""
-    source: str  # 数据源名称
-    source_type: str  # 数据源类型 (github, hackernews, news, social, hongkong)
-    title: str  # 标题
-    content: str  # 内容
-    url: str  # 原始URL
-    author: Optional[str] = None  # 作者
-    published_at: Optional[datetime] = None  # 发布时间
-    metadata: Optional[Dict[str, Any]] = None  # 元数据
-    raw_data: Optional[Dict[str, Any]] = None  # 原始数据
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        data = asdict(self)
-        if self.published_at:
-            data['published_at'] = self.published_at.isoformat()
-        if self.metadata is None:
-            data['metadata'] = {}
-        if self.raw_data is None:
-            data['raw_data'] = {}
+    """
+    采集的数据项
+    
+    使用 __slots__ 紧凑存储；source / source_type 会被驻留以共享字符串对象；
+    raw_data 可以直接传入原始JSON响应（bytes/str），首次访问时才解析。
+    调用 freeze() 或传入 frozen=True 后数据项不可修改
+    """
+    
+    __slots__ = ("source", "source_type", "title", "content", "url", "author",
+                 "published_at", "metadata", "_raw", "_frozen")
+    
+    _FIELDS = ("source", "source_type", "title", "content", "url", "author",
+               "published_at", "metadata", "raw_data")
+    
+    def __init__(self, source: str, source_type: str, title: str, content: str, url: str,
+                 author: Optional[str] = None, published_at: Optional[datetime] = None,
+                 metadata: Optional[Dict[str, Any]] = None,
+                 raw_data: Union[Dict[str, Any], bytes, str, None] = None, frozen: bool = False):
+        """
+        初始化数据项
+        
+        Args:
+            source: 数据源名称
+            source_type: 数据源类型 (github, hackernews, news, social, hongkong)
+            title: 标题
+            content: 内容
+            url: 原始URL
+            author: 作者
+            published_at: 发布时间
+            metadata: 元数据
+            raw_data: 原始数据，字典或未解析的JSON文本
+            frozen: 是否冻结为不可变对象
+        """
+        set_field = object.__setattr__
+        set_field(self, "source", sys.intern(source))
+        set_field(self, "source_type", sys.intern(source_type))
+        set_field(self, "title", title)
+        set_field(self, "content", content)
+        set_field(self, "url", url)
+        set_field(self, "author", author)
+        set_field(self, "published_at", published_at)
+        set_field(self, "metadata", metadata)
+        set_field(self, "_raw", raw_data)
+        set_field(self, "_frozen", frozen)
+    
+    def __setattr__(self, name: str, value: Any):
+        if self._frozen:
+            raise FrozenInstanceError(f"cannot assign to field '{name}'")
+        if name in ("source", "source_type"):
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+    
+    def __delattr__(self, name: str):
+        if self._frozen:
+            raise FrozenInstanceError(f"cannot delete field '{name}'")
+        object.__delattr__(self, name)
+    
+    @property
+    def raw_data(self) -> Optional[Dict[str, Any]]:
+        """原始数据（未解析的JSON文本在首次访问时解析）"""
+        raw = self._raw
+        if isinstance(raw, (bytes, str)):
+            raw = json.loads(raw)
+            object.__setattr__(self, "_raw", raw)
+        return raw
+    
+    @raw_data.setter
+    def raw_data(self, value: Union[Dict[str, Any], bytes, str, None]):
+        object.__setattr__(self, "_raw", value)
+    
+    @property
+    def frozen(self) -> bool:
+        """是否已冻结"""
+        return self._frozen
+    
+    def freeze(self) -> "CollectedItem":
+        """冻结数据项，之后任何字段赋值都会抛出 FrozenInstanceError"""
+        object.__setattr__(self, "_frozen", True)
+        return self
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self._FIELDS)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._FIELDS)
+        return f"{self.__class__.__name__}({fields})"
+    
+    def __reduce__(self):
+        return (self.__class__, (self.source, self.source_type, self.title, self.content, self.url,
+                                 self.author, self.published_at, self.metadata, self._raw, self._frozen))
+    
+    def to_dict(self, include_raw: bool = True) -> Dict[str, Any]:
+        """
+        转换为字典
+        
+        直接按字段构建，不做深拷贝：metadata / raw_data 与数据项共享同一对象
+        
+        Args:
+            include_raw: 是否包含原始数据
+        """
+        data = {
+            "source": self.source,
+            "source_type": self.source_type,
+            "title": self.title,
+            "content": self.content,
+            "url": self.url,
+            "author": self.author,
+            "published_at": self.published_at.isoformat() if self.published_at else None,
+            "metadata": self.metadata if self.metadata is not None else {}
+        }
+        if include_raw:
+            raw_data = self.raw_data
+            data["raw_data"] = raw_data if raw_data is not None else {}
         return data
     
     def to_json(self) -> str:
         """转换为JSON字符串"""
-        return json.dumps(self.to_dict(), ensure_ascii=False)
+        raw = self._raw
+        if not isinstance(raw, (bytes, str)):
+            return _dumps(self.to_dict())
+        
+        if not _is_json(raw):
+            # 不是JSON（HTML、截断的响应体、空白等）时按字符串输出
+            data = self.to_dict(include_raw=False)
+            data["raw_data"] = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+            return _dumps(data)
+        
+        # 原始JSON尚未解析时校验后直接拼接文本，避免解析后再序列化
+        head = _dumps(self.to_dict(include_raw=False))
+        raw_text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        separator = ", " if head != "{}" else ""
+        return f'{head[:-1]}{separator}"raw_data": {raw_text}}}'
 
 
 class BaseCollector(abc.ABC):
@@ -58,7 +200,65 @@ class BaseCollector(abc.ABC):
         self.items_collected = 0
         self.last_collection_time = None
         
+        # 并发与限速配置
+        self.max_concurrency = config.get("max_concurrency", 5)  # 子请求最大并发数
+        self.max_retries = config.get("max_retries", 2)  # 被限流(429/503)后的最大重试次数
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self.stream_buffer = config.get("stream_buffer", 100)  # 流式采集缓冲区大小（背压阈值）
+        
+        # 条件请求（ETag / If-Modified-Since）及按数据源统计的缓存命中
+        self.conditional_requests = config.get("conditional_requests", True)
+        self.cache_stats: Dict[str, Dict[str, int]] = {}
+        
+        # 增量采集：只产出检查点中未见过或已变化的项目
+        self.incremental = config.get("incremental", True)
+        self.checkpoint_dir = config.get("checkpoint_dir", "data/checkpoints")
+        self._checkpoint: Optional[CollectorCheckpoint] = None
+        
     @abc.abstractmethod
+    def collect_stream(self) -> AsyncIterator[CollectedItem]:
+        """
+        流式执行数据采集（异步生成器）
+        
+        子类以 async def + yield 实现，每采集到一个数据项立即产出，
+        下游处理速度跟不上时由有界缓冲区反压上游请求
+        
+        Yields:
+            采集到的数据项
+        """
+        pass
+    
+    @property
+    def checkpoint(self) -> CollectorCheckpoint:
+        """增量采集检查点（首次访问时从磁盘加载）"""
+        if self._checkpoint is None:
+            self._checkpoint = CollectorCheckpoint(self.name, self.checkpoint_dir)
+        return self._checkpoint
+    
+    def _is_new_item(self, key: Any, version: str = "", published_at: Optional[datetime] = None,
+                     scope: str = "default") -> bool:
+        """
+        判断项目是否需要产出，需要时记入检查点（采集成功完成后提交）
+        
+        Args:
+            key: 项目唯一键（ID、GUID或URL）
+            version: 项目版本（如更新时间），版本变化视为已变化的项目
+            published_at: 发布时间，用于推进高水位
+            scope: 高水位范围（如订阅源、编程语言）
+            
+        Returns:
+            是否为新增或已变化的项目
+        """
+        if not self.incremental:
+            return True
+        
+        if not self.checkpoint.is_new(key, version):
+            return False
+        
+        self.checkpoint.mark(key, version, published_at, scope)
+        return True
+    
     async def collect(self) -> List[CollectedItem]:
         """
         执行数据采集
@@ -66,7 +266,7 @@ class BaseCollector(abc.ABC):
         Returns:
             采集到的数据项列表
         """
-        pass
+        return [item async for item in self.collect_stream()]
     
     @abc.abstractmethod
     def validate_config(self) -> bool:
@@ -90,58 +290,175 @@ class BaseCollector(abc.ABC):
             "enabled": self.config.get("enabled", True),
             "items_collected": self.items_collected,
             "last_collection_time": self.last_collection_time.isoformat() if self.last_collection_time else None,
-            "config_valid": self.validate_config()
+            "config_valid": self.validate_config(),
+            "max_concurrency": self.max_concurrency,
+            "max_retries": self.max_retries,
+            "incremental": self.incremental,
+            "checkpoint": self.checkpoint.get_status() if self.incremental else None,
+            "http_cache": {
+                source: {
+                    **stats,
+                    "hit_rate": stats["not_modified"] / stats["requests"] if stats["requests"] else 0.0
+                }
+                for source, stats in self.cache_stats.items()
+            }
         }
     
-    async def run(self) -> List[CollectedItem]:
+    async def run_stream(self) -> AsyncIterator[CollectedItem]:
         """
-        运行采集器并返回结果
+        流式运行采集器
         
-        Returns:
-            采集到的数据项列表
+        Yields:
+            采集到的数据项
         """
         self.logger.info(f"开始采集数据: {self.name}")
         start_time = time.time()
+        count = 0
+        completed = False
         
         try:
             # 验证配置
             if not self.validate_config():
                 self.logger.error(f"配置无效: {self.name}")
-                return []
+                return
             
             # 执行采集
-            items = await self.collect()
+            async for item in self.collect_stream():
+                count += 1
+                self.items_collected += 1
+                yield item
+            
+            # 采集完整结束后才提交检查点，失败或中断的运行下次会重新产出
+            if self.incremental:
+                self.checkpoint.commit()
+            completed = True
             
             # 更新状态
-            self.items_collected += len(items)
             self.last_collection_time = datetime.now()
             
             # 记录日志
             elapsed_time = time.time() - start_time
-            self.logger.info(f"采集完成: {self.name}, 采集到 {len(items)} 个项目, 耗时 {elapsed_time:.2f} 秒")
-            
-            return items
+            self.logger.info(f"采集完成: {self.name}, 采集到 {count} 个项目, 耗时 {elapsed_time:.2f} 秒")
             
         except Exception as e:
-            self.logger.error(f"采集失败: {self.name}, 错误: {str(e)}", exc_info=True)
-            return []
+            self.logger.error(f"采集失败: {self.name}, 已采集 {count} 个项目, 错误: {str(e)}", exc_info=True)
+        finally:
+            if self.incremental and not completed and self._checkpoint is not None:
+                self._checkpoint.rollback()
+    
+    async def run(self) -> List[CollectedItem]:
+        """
+        运行采集器并返回结果
+        
+        Returns:
+            采集到的数据项列表
+        """
+        return [item async for item in self.run_stream()]
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环对应的并发信号量"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def _stream_limited(self, jobs: Iterable[Tuple[str, Callable[[], Awaitable[List[CollectedItem]]]]]
+                              ) -> AsyncIterator[CollectedItem]:
+        """
+        在并发上限约束下并发执行子请求，并按完成顺序流式产出数据项（请求速率由共享限速器按主机控制）
+        
+        各子请求的结果写入有界队列，消费者处理不过来时子请求会在写入处等待，
+        从而形成背压；消费者提前停止迭代时取消所有未完成的子请求
+        
+        Args:
+            jobs: (标签, 子请求工厂) 序列，工厂调用后返回数据项列表的协程
+            
+        Yields:
+            采集到的数据项
+        """
+        semaphore = self._get_semaphore()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.stream_buffer))
+        finished = object()
+        
+        async def _produce(label: str, job: Callable[[], Awaitable[List[CollectedItem]]]):
+            try:
+                async with semaphore:
+                    items = await job()
+                
+                for item in items:
+                    await queue.put(item)
+            except Exception as e:
+                self.logger.error(f"采集 {label} 失败: {str(e)}")
+            
+            await queue.put(finished)
+        
+        tasks = [asyncio.ensure_future(_produce(label, job)) for label, job in jobs]
+        remaining = len(tasks)
+        
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is finished:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
     
-    def _make_request(self, url: str, headers: Optional[Dict[str, str]] = None, 
-                     params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def _make_request(self, url: str, headers: Optional[Dict[str, str]] = None, 
+                            params: Optional[Dict[str, Any]] = None,
+                            source: Optional[str] = None) -> HttpResponse:
         """
-        发送HTTP请求（简化版，实际实现需要requests库）
+        发送HTTP GET请求（通过共享连接池，复用keep-alive连接）
+        
+        启用条件请求时会携带缓存的 ETag / Last-Modified，服务器返回304时
+        直接返回缓存的响应体，并将响应标记为 not_modified
+        
+        请求经过按主机的共享限速器；被限流(429/503)时按限速器给出的退避时间重试
         
         Args:
             url: 请求URL
             headers: 请求头
             params: 查询参数
+            source: 用于统计缓存命中率的数据源名称，默认使用主机名
             
         Returns:
-            响应数据
+            HTTP响应
         """
-        # 这里是一个简化实现，实际项目中应该使用requests库
         self.logger.debug(f"发送请求: {url}")
-        return {"url": url, "headers": headers, "params": params}
+        
+        cache = get_validator_cache() if self.conditional_requests else None
+        cache_key = ValidatorCache.make_key(url, params)
+        cached = await cache.get_async(cache_key) if cache else None
+        
+        if cached:
+            headers = {**(headers or {}), **cached.conditional_headers()}
+        
+        host = urlparse(url).netloc
+        limiter = get_rate_limiter()
+        
+        for attempt in range(self.max_retries + 1):
+            async with limiter.limit(host):
+                response = await get_http_client().get(url, headers=headers, params=params)
+            
+            delay = limiter.feedback(host, response.status, response.headers)
+            if delay is None or attempt >= self.max_retries:
+                break
+            self.logger.info(f"请求被限流，{delay:.1f} 秒后重试 ({attempt + 1}/{self.max_retries}): {url}")
+        
+        stats = self.cache_stats.setdefault(source or host, {"requests": 0, "not_modified": 0})
+        stats["requests"] += 1
+        
+        if response.status == 304 and cached:
+            stats["not_modified"] += 1
+            return cached.to_response(response.elapsed)
+        
+        if cache and response.ok:
+            await cache.store_async(cache_key, response)
+        
+        return response
     
     def _parse_html(self, html: str) -> Any:
         """
@@ -209,13 +526,11 @@ class ExampleCollector(BaseCollector):
         self.api_url = config.get("api_url", "")
         self.api_key = config.get("api_key", "")
     
-    async def collect(self) -> List[CollectedItem]:
+    async def collect_stream(self) -> AsyncIterator[CollectedItem]:
         """示例采集实现"""
-        items = []
-        
         # 模拟采集数据
         for i in range(3):
-            item = CollectedItem(
+            yield CollectedItem(
                 source=self.name,
                 source_type="example",
                 title=f"示例项目 {i+1}",
@@ -225,9 +540,6 @@ class ExampleCollector(BaseCollector):
                 published_at=datetime.now(),
                 metadata={"index": i, "source": self.name}
             )
-            items.append(item)
-        
-        return items
     
     def validate_config(self) -> bool:
         """验证配置"""
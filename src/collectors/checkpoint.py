@@ -0,0 +1,113 @@
+"""
+增量采集检查点
+记录每个采集器已见过的项目ID/版本和发布时间高水位，使后续采集只产出新增或变化的项目
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class CollectorCheckpoint:
+    """单个采集器的检查点"""
+
+    def __init__(self, name: str, directory: str = "data/checkpoints", max_seen: int = 20000):
+        """
+        初始化检查点
+
+        Args:
+            name: 采集器名称
+            directory: 检查点文件目录
+            max_seen: 保留的已见项目数上限，超出后淘汰最早记录的项目
+        """
+        self.name = name
+        self.path = os.path.join(directory, f"{name}.json") if directory else None
+        self.max_seen = max_seen
+        self.logger = logging.getLogger(f"collector.{name}.checkpoint")
+
+        self.seen: "OrderedDict[str, str]" = OrderedDict()  # 项目键 -> 版本
+        self.high_water: Dict[str, datetime] = {}  # 范围 -> 已采集的最新发布时间
+
+        # 本次运行尚未提交的变更，采集成功完成后才写入
+        self._pending_seen: Dict[str, str] = {}
+        self._pending_high_water: Dict[str, datetime] = {}
+
+        if self.path and os.path.exists(self.path):
+            self.load()
+
+    def is_new(self, key: str, version: str = "") -> bool:
+        """项目是否未见过或版本已变化"""
+        key = str(key)
+        if key in self._pending_seen:
+            return self._pending_seen[key] != version
+        return self.seen.get(key) != version
+
+    def mark(self, key: str, version: str = "", published_at: Optional[datetime] = None, scope: str = "default"):
+        """记录已产出的项目（待提交）"""
+        self._pending_seen[str(key)] = version
+        if published_at is not None:
+            current = self.get_high_water(scope)
+            if current is None or published_at > current:
+                self._pending_high_water[scope] = published_at
+
+    def get_high_water(self, scope: str = "default") -> Optional[datetime]:
+        """获取发布时间高水位"""
+        return self._pending_high_water.get(scope, self.high_water.get(scope))
+
+    def commit(self):
+        """提交本次运行的变更并写入磁盘"""
+        if not self._pending_seen and not self._pending_high_water:
+            return
+
+        for key, version in self._pending_seen.items():
+            self.seen[key] = version
+            self.seen.move_to_end(key)
+        while len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+
+        self.high_water.update(self._pending_high_water)
+        self._pending_seen = {}
+        self._pending_high_water = {}
+        self.save()
+
+    def rollback(self):
+        """丢弃本次运行的变更（采集失败或被中断时）"""
+        self._pending_seen = {}
+        self._pending_high_water = {}
+
+    def load(self):
+        """从磁盘加载"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"加载检查点失败: {str(e)}")
+            return
+
+        self.seen = OrderedDict(data.get("seen", {}))
+        self.high_water = {scope: datetime.fromisoformat(value)
+                           for scope, value in data.get("high_water", {}).items()}
+
+    def save(self):
+        """写入磁盘"""
+        if not self.path:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "seen": self.seen,
+                "high_water": {scope: value.isoformat() for scope, value in self.high_water.items()}
+            }, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取检查点状态"""
+        return {
+            "seen_items": len(self.seen),
+            "high_water": {scope: value.isoformat() for scope, value in self.high_water.items()}
+        }
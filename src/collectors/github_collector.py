@@ -3,9 +3,9 @@ GitHub数据采集器
 采集GitHub Trending Repositories和热门项目
 """
 
+import functools
 import logging
-import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from datetime import datetime, timedelta
 import json
 
@@ -36,30 +36,20 @@ class GitHubCollector(BaseCollector):
         if self.api_token:
             self.headers["Authorization"] = f"token {self.api_token}"
     
-    async def collect(self) -> List[CollectedItem]:
-        """采集GitHub数据"""
-        items = []
+    async def collect_stream(self) -> AsyncIterator[CollectedItem]:
+        """流式采集GitHub数据（Trending与各语言热门项目并发）"""
+        count = 0
         
-        try:
-            # 1. 采集Trending Repositories
-            trending_items = await self._collect_trending_repositories()
-            items.extend(trending_items)
-            
-            # 2. 按语言采集热门项目
-            for language in self.languages[:3]:  # 限制前3种语言
-                try:
-                    language_items = await self._collect_by_language(language)
-                    items.extend(language_items)
-                    time.sleep(1)  # 避免请求过快
-                except Exception as e:
-                    self.logger.error(f"采集语言 {language} 失败: {str(e)}")
-            
-            self.logger.info(f"GitHub采集完成，共采集 {len(items)} 个项目")
-            
-        except Exception as e:
-            self.logger.error(f"GitHub采集失败: {str(e)}", exc_info=True)
+        languages = self.languages[:3]  # 限制前3种语言
+        jobs = [("trending", self._collect_trending_repositories)] + [
+            (language, functools.partial(self._collect_by_language, language)) for language in languages
+        ]
         
-        return items
+        async for item in self._stream_limited(jobs):
+            count += 1
+            yield item
+        
+        self.logger.info(f"GitHub采集完成，共采集 {count} 个项目")
     
     async def _collect_trending_repositories(self) -> List[CollectedItem]:
         """采集Trending Repositories"""
@@ -101,6 +91,10 @@ class GitHubCollector(BaseCollector):
             ]
             
             for repo in trending_repos:
+                # Trending 榜单按天变化，同一仓库每天最多产出一次
+                if not self._is_new_item(repo["url"], version=datetime.now().date().isoformat(), scope="trending"):
+                    continue
+                
                 item = CollectedItem(
                     source="github",
                     source_type="github_trending",
@@ -131,41 +125,34 @@ class GitHubCollector(BaseCollector):
         items = []
         
         try:
-            # 模拟按语言搜索热门项目
-            # 实际项目中使用GitHub Search API: /search/repositories?q=language:{language}&sort=stars&order=desc
+            # 每种语言平均分配仓库配额
+            per_language = max(1, self.max_repositories // max(1, len(self.languages[:3])))
+            scope = f"language:{language}"
             
-            language_repos = [
-                {
-                    "name": f"{language}-project-1",
-                    "description": f"使用{language}开发的高性能计算框架",
-                    "url": f"https://github.com/user/{language}-project-1",
-                    "stars": 1000,
-                    "forks": 200,
-                    "updated_at": (datetime.now() - timedelta(days=2)).isoformat()
-                },
-                {
-                    "name": f"{language}-project-2",
-                    "description": f"基于{language}的机器学习库",
-                    "url": f"https://github.com/user/{language}-project-2",
-                    "stars": 800,
-                    "forks": 150,
-                    "updated_at": (datetime.now() - timedelta(days=5)).isoformat()
-                }
-            ]
+            # 始终按星数取该语言的热门仓库，不在查询中加时间条件（否则榜单会变成“某日之后有推送的仓库”）；
+            # 增量采集在本地按 updated_at 版本过滤，未变化的仓库不再产出
+            language_repos = await self._search_repositories(scope, per_page=per_language)
             
             for repo in language_repos:
+                updated_at = repo.get("updated_at") or repo.get("pushed_at")
+                published_at = datetime.fromisoformat(updated_at.replace("Z", "+00:00")) if updated_at else None
+                
+                if not self._is_new_item(repo.get("full_name", repo["html_url"]), version=updated_at or "",
+                                         published_at=published_at, scope=scope):
+                    continue
+                
                 item = CollectedItem(
                     source="github",
                     source_type="github_language",
                     title=repo["name"],
-                    content=repo["description"],
-                    url=repo["url"],
-                    author=repo["url"].split("/")[-2],
-                    published_at=datetime.fromisoformat(repo["updated_at"].replace("Z", "+00:00")),
+                    content=repo.get("description") or "",
+                    url=repo["html_url"],
+                    author=(repo.get("owner") or {}).get("login", repo["html_url"].split("/")[-2]),
+                    published_at=published_at,
                     metadata={
                         "language": language,
-                        "stars": repo["stars"],
-                        "forks": repo["forks"],
+                        "stars": repo.get("stargazers_count", 0),
+                        "forks": repo.get("forks_count", 0),
                         "language_specific": True
                     }
                 )
@@ -178,25 +165,23 @@ class GitHubCollector(BaseCollector):
         
         return items
     
-    async def _search_repositories(self, query: str, sort: str = "stars", order: str = "desc") -> List[Dict[str, Any]]:
-        """搜索GitHub仓库（简化实现）"""
-        # 实际实现应该调用GitHub Search API
-        # 这里返回模拟数据
-        
+    async def _search_repositories(self, query: str, sort: str = "stars", order: str = "desc",
+                                   per_page: int = 30) -> List[Dict[str, Any]]:
+        """调用GitHub Search API搜索仓库"""
         self.logger.debug(f"搜索仓库: query={query}, sort={sort}, order={order}")
         
-        # 模拟API响应
-        return [
-            {
-                "name": "search-result-1",
-                "description": f"搜索结果1: {query}",
-                "html_url": "https://github.com/user/search-result-1",
-                "language": "Python",
-                "stargazers_count": 500,
-                "forks_count": 100,
-                "updated_at": "2024-01-15T10:30:00Z"
-            }
-        ]
+        response = await self._make_request(
+            f"{self.base_url}/search/repositories",
+            headers=self.headers,
+            params={"q": query, "sort": sort, "order": order, "per_page": min(per_page, 100)},
+            source="github_search"
+        )
+        
+        if not response.ok:
+            self.logger.warning(f"搜索仓库失败: HTTP {response.status}, query={query}")
+            return []
+        
+        return response.json().get("items", [])
     
     def validate_config(self) -> bool:
         """验证配置"""
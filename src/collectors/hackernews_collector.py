@@ -3,9 +3,10 @@ Hacker News数据采集器
 采集Hacker News热门故事和最新文章
 """
 
+import functools
 import logging
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from datetime import datetime, timedelta
 import json
 
@@ -20,6 +21,7 @@ class HackerNewsCollector(BaseCollector):
         
         # Hacker News配置
         self.top_stories_count = config.get("top_stories", 30)
+        self.max_concurrency = config.get("max_concurrency", 10)
         self.base_url = "https://hacker-news.firebaseio.com/v0"
         
         # 请求头
@@ -28,44 +30,52 @@ class HackerNewsCollector(BaseCollector):
             "Accept": "application/json"
         }
     
-    async def collect(self) -> List[CollectedItem]:
-        """采集Hacker News数据"""
-        items = []
-        
-        try:
-            # 1. 采集Top Stories
-            top_stories = await self._get_top_stories()
-            
-            # 2. 获取每个故事的详细信息
-            for story_id in top_stories[:self.top_stories_count]:
-                try:
-                    story_item = await self._get_item_details(story_id)
-                    if story_item and self._is_valid_story(story_item):
-                        collected_item = self._convert_to_collected_item(story_item)
-                        items.append(collected_item)
-                    
-                    time.sleep(0.1)  # 避免请求过快
-                    
-                except Exception as e:
-                    self.logger.error(f"获取故事 {story_id} 详情失败: {str(e)}")
-            
-            self.logger.info(f"Hacker News采集完成，共采集 {len(items)} 个故事")
-            
-        except Exception as e:
-            self.logger.error(f"Hacker News采集失败: {str(e)}", exc_info=True)
+    async def collect_stream(self) -> AsyncIterator[CollectedItem]:
+        """流式采集Hacker News数据（故事详情并发获取）"""
+        count = 0
+        
+        # 1. 采集Top Stories
+        top_stories = await self._get_top_stories()
+        
+        # 2. 并发获取每个故事的详细信息
+        story_ids = top_stories[:self.top_stories_count]
+        
+        # 增量采集：跳过检查点中已处理过的故事，不再请求详情
+        if self.incremental:
+            story_ids = [story_id for story_id in story_ids if self.checkpoint.is_new(story_id)]
+        async for item in self._stream_limited(
+            (f"故事 {story_id}", functools.partial(self._collect_story, story_id))
+            for story_id in story_ids
+        ):
+            count += 1
+            yield item
+        
+        self.logger.info(f"Hacker News采集完成，共采集 {count} 个故事")
+    
+    async def _collect_story(self, story_id: int) -> List[CollectedItem]:
+        """获取单个故事并转换为数据项"""
+        story_item = await self._get_item_details(story_id)
+        if not story_item:
+            return []
         
-        return items
+        # 无效故事同样记入检查点，避免每次重复请求
+        item = self._convert_to_collected_item(story_item) if self._is_valid_story(story_item) else None
+        if not self._is_new_item(story_id, published_at=item.published_at if item else None) or item is None:
+            return []
+        return [item]
     
     async def _get_top_stories(self) -> List[int]:
         """获取Top Stories ID列表"""
         try:
-            # 模拟API调用
-            # 实际实现: response = requests.get(f"{self.base_url}/topstories.json", headers=self.headers)
-            
             self.logger.debug("获取Top Stories列表")
             
-            # 模拟数据
-            return [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]  # 简化示例
+            response = await self._make_request(f"{self.base_url}/topstories.json", headers=self.headers,
+                                                source="hackernews_topstories")
+            if not response.ok:
+                self.logger.warning(f"获取Top Stories失败: HTTP {response.status}")
+                return []
+            
+            return response.json() or []
             
         except Exception as e:
             self.logger.error(f"获取Top Stories失败: {str(e)}")
@@ -74,71 +84,15 @@ class HackerNewsCollector(BaseCollector):
     async def _get_item_details(self, item_id: int) -> Optional[Dict[str, Any]]:
         """获取项目详细信息"""
         try:
-            # 模拟API调用
-            # 实际实现: response = requests.get(f"{self.base_url}/item/{item_id}.json", headers=self.headers)
-            
             self.logger.debug(f"获取项目详情: {item_id}")
             
-            # 根据ID生成模拟数据
-            stories = {
-                1: {
-                    "id": 1,
-                    "type": "story",
-                    "title": "新的AI模型在代码生成任务上超越GPT-4",
-                    "url": "https://example.com/ai-model-beats-gpt4",
-                    "text": "研究人员开发了一种新的AI模型，在代码生成任务上表现优于GPT-4...",
-                    "by": "ai_researcher",
-                    "time": int(time.time()) - 3600,  # 1小时前
-                    "score": 450,
-                    "descendants": 120
-                },
-                2: {
-                    "id": 2,
-                    "type": "story",
-                    "title": "量子计算突破：实现100量子比特系统",
-                    "url": "https://example.com/quantum-computing-breakthrough",
-                    "text": "科学家宣布在量子计算领域取得重大突破...",
-                    "by": "quantum_scientist",
-                    "time": int(time.time()) - 7200,  # 2小时前
-                    "score": 380,
-                    "descendants": 85
-                },
-                3: {
-                    "id": 3,
-                    "type": "story",
-                    "title": "新的编程语言Zig 1.0发布",
-                    "url": "https://example.com/zig-1.0-released",
-                    "text": "Zig编程语言发布了1.0版本，带来了许多改进和新特性...",
-                    "by": "zig_dev",
-                    "time": int(time.time()) - 10800,  # 3小时前
-                    "score": 320,
-                    "descendants": 65
-                },
-                4: {
-                    "id": 4,
-                    "type": "story",
-                    "title": "WebAssembly在边缘计算中的应用",
-                    "url": "https://example.com/webassembly-edge-computing",
-                    "text": "WebAssembly正在改变边缘计算的格局...",
-                    "by": "webassembly_fan",
-                    "time": int(time.time()) - 14400,  # 4小时前
-                    "score": 280,
-                    "descendants": 45
-                },
-                5: {
-                    "id": 5,
-                    "type": "story",
-                    "title": "开源数据库性能基准测试2024",
-                    "url": "https://example.com/database-benchmark-2024",
-                    "text": "最新的开源数据库性能基准测试结果发布...",
-                    "by": "db_enthusiast",
-                    "time": int(time.time()) - 18000,  # 5小时前
-                    "score": 240,
-                    "descendants": 35
-                }
-            }
+            response = await self._make_request(f"{self.base_url}/item/{item_id}.json", headers=self.headers,
+                                                source="hackernews_items")
+            if not response.ok:
+                self.logger.warning(f"获取项目 {item_id} 详情失败: HTTP {response.status}")
+                return None
             
-            return stories.get(item_id, None)
+            return response.json()
             
         except Exception as e:
             self.logger.error(f"获取项目 {item_id} 详情失败: {str(e)}")
@@ -0,0 +1,156 @@
+"""
+列式数据项批量容器
+将大量 CollectedItem 按列存储，便于批量过滤、统计和序列化
+"""
+
+import math
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Sequence
+
+from .base_collector import CollectedItem
+from ..utils.timestamps import join_datetime, split_datetime
+
+
+class CollectedItemBatch:
+    """列式批量容器"""
+
+    COLUMNS = ("source", "source_type", "title", "content", "url", "author",
+               "published_at", "metadata", "raw_data")
+
+    def __init__(self):
+        # 低基数字符串列使用字典编码：值表 + 整数编码数组
+        self._source_values: List[str] = []
+        self._source_index: Dict[str, int] = {}
+        self._source_type_values: List[str] = []
+        self._source_type_index: Dict[str, int] = {}
+        self.source_codes = array("I")
+        self.source_type_codes = array("I")
+
+        # 高基数文本列
+        self.titles: List[str] = []
+        self.contents: List[str] = []
+        self.urls: List[str] = []
+        self.authors: List[Optional[str]] = []
+
+        # 发布时间以Unix时间戳存储，缺失值为NaN；UTC偏移（秒）单独存储，无时区的时间为NaN
+        self.published_ts = array("d")
+        self.published_offsets = array("d")
+
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+        self.raw: List[Any] = []
+
+    @classmethod
+    def from_items(cls, items: Iterable[CollectedItem]) -> "CollectedItemBatch":
+        """由数据项构建批量容器"""
+        batch = cls()
+        batch.extend(items)
+        return batch
+
+    @staticmethod
+    def _encode(value: str, values: List[str], index: Dict[str, int]) -> int:
+        """字典编码"""
+        code = index.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            index[value] = code
+        return code
+
+    def append(self, item: CollectedItem):
+        """追加一个数据项"""
+        self.source_codes.append(self._encode(item.source, self._source_values, self._source_index))
+        self.source_type_codes.append(
+            self._encode(item.source_type, self._source_type_values, self._source_type_index))
+        self.titles.append(item.title)
+        self.contents.append(item.content)
+        self.urls.append(item.url)
+        self.authors.append(item.author)
+        if item.published_at:
+            ts, offset = split_datetime(item.published_at)
+            self.published_ts.append(ts)
+            self.published_offsets.append(math.nan if offset is None else offset)
+        else:
+            self.published_ts.append(math.nan)
+            self.published_offsets.append(math.nan)
+        self.metadata.append(item.metadata)
+        # 保留未解析的原始数据，避免批量构建时触发JSON解析
+        self.raw.append(item._raw)
+
+    def extend(self, items: Iterable[CollectedItem]):
+        """批量追加数据项"""
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, index: int) -> CollectedItem:
+        ts, offset = self.published_ts[index], self.published_offsets[index]
+        return CollectedItem(
+            source=self._source_values[self.source_codes[index]],
+            source_type=self._source_type_values[self.source_type_codes[index]],
+            title=self.titles[index],
+            content=self.contents[index],
+            url=self.urls[index],
+            author=self.authors[index],
+            published_at=None if math.isnan(ts) else join_datetime(ts, None if math.isnan(offset) else offset),
+            metadata=self.metadata[index],
+            raw_data=self.raw[index]
+        )
+
+    def __iter__(self) -> Iterator[CollectedItem]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        获取整列数据
+
+        Args:
+            name: 列名，取值见 COLUMNS
+
+        Returns:
+            列数据（source / source_type 返回解码后的列表，published_at 返回时间戳数组）
+        """
+        if name == "source":
+            return [self._source_values[code] for code in self.source_codes]
+        if name == "source_type":
+            return [self._source_type_values[code] for code in self.source_type_codes]
+        if name == "published_at":
+            return self.published_ts
+        columns = {
+            "title": self.titles,
+            "content": self.contents,
+            "url": self.urls,
+            "author": self.authors,
+            "metadata": self.metadata,
+            "raw_data": self.raw
+        }
+        if name not in columns:
+            raise KeyError(f"未知的列: {name}")
+        return columns[name]
+
+    def select(self, indices: Iterable[int]) -> "CollectedItemBatch":
+        """按行号选取子集，返回新的批量容器"""
+        return CollectedItemBatch.from_items(self[index] for index in indices)
+
+    def published_since(self, since: datetime) -> List[int]:
+        """返回发布时间不早于 since 的行号"""
+        threshold = since.timestamp()
+        return [index for index, ts in enumerate(self.published_ts) if ts >= threshold]
+
+    def count_by_source_type(self) -> Dict[str, int]:
+        """按数据源类型计数"""
+        counts = Counter(self.source_type_codes)
+        return {self._source_type_values[code]: count for code, count in counts.items()}
+
+    def count_by_source(self) -> Dict[str, int]:
+        """按数据源计数"""
+        counts = Counter(self.source_codes)
+        return {self._source_values[code]: count for code, count in counts.items()}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """转换为字典列表"""
+        return [item.to_dict() for item in self]
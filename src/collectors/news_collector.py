@@ -3,14 +3,15 @@
 采集科技新闻和商业新闻
 """
 
+import functools
 import logging
-import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from datetime import datetime, timedelta
 import json
 from urllib.parse import urlparse
 
 from .base_collector import BaseCollector, CollectedItem, CollectorFactory
+from .parsing import get_payload_parser
 
 
 class NewsCollector(BaseCollector):
@@ -34,6 +35,9 @@ class NewsCollector(BaseCollector):
             "Accept": "application/xml, application/json, text/html"
         }
         
+        # 最近一次解析结果（订阅源/网页返回304时复用）
+        self._parsed_feeds: Dict[str, List[CollectedItem]] = {}
+        
         # 新闻源映射
         self.source_names = {
             "techcrunch.com": "TechCrunch",
@@ -44,29 +48,18 @@ class NewsCollector(BaseCollector):
             "reuters.com": "Reuters"
         }
     
-    async def collect(self) -> List[CollectedItem]:
-        """采集新闻数据"""
-        items = []
+    async def collect_stream(self) -> AsyncIterator[CollectedItem]:
+        """流式采集新闻数据（各新闻源并发，按完成顺序产出）"""
+        count = 0
         
-        try:
-            # 遍历所有新闻源
-            for source_url in self.sources:
-                try:
-                    source_items = await self._collect_from_source(source_url)
-                    items.extend(source_items)
-                    
-                    self.logger.info(f"从 {source_url} 采集到 {len(source_items)} 篇文章")
-                    time.sleep(1)  # 避免请求过快
-                    
-                except Exception as e:
-                    self.logger.error(f"采集新闻源 {source_url} 失败: {str(e)}")
-            
-            self.logger.info(f"新闻采集完成，共采集 {len(items)} 篇文章")
-            
-        except Exception as e:
-            self.logger.error(f"新闻采集失败: {str(e)}", exc_info=True)
+        async for item in self._stream_limited(
+            (source_url, functools.partial(self._collect_from_source, source_url))
+            for source_url in self.sources
+        ):
+            count += 1
+            yield item
         
-        return items
+        self.logger.info(f"新闻采集完成，共采集 {count} 篇文章")
     
     async def _collect_from_source(self, source_url: str) -> List[CollectedItem]:
         """从单个新闻源采集数据"""
@@ -80,7 +73,7 @@ class NewsCollector(BaseCollector):
             source_name = self.source_names.get(domain, domain)
             
             # 检查是否是RSS源
-            if source_url.endswith(".rss") or source_url.endswith("/feed") or "rss" in source_url:
+            if source_url.endswith(".rss") or source_url.rstrip("/").endswith("/feed") or "rss" in source_url:
                 rss_items = await self._parse_rss_feed(source_url, source_name)
                 items.extend(rss_items[:self.max_articles_per_source])
             
@@ -94,6 +87,15 @@ class NewsCollector(BaseCollector):
                 html_items = await self._parse_website(source_url, source_name)
                 items.extend(html_items[:self.max_articles_per_source])
             
+            # 增量采集：按GUID（无GUID时按URL）过滤已产出过的文章
+            items = [
+                item for item in items
+                if self._is_new_item((item.metadata or {}).get("guid") or item.url,
+                                     published_at=item.published_at, scope=source_url)
+            ]
+            
+            self.logger.info(f"从 {source_url} 采集到 {len(items)} 篇新文章")
+            
         except Exception as e:
             self.logger.error(f"处理新闻源 {source_url} 失败: {str(e)}")
         
@@ -104,56 +106,39 @@ class NewsCollector(BaseCollector):
         items = []
         
         try:
-            # 模拟RSS解析
-            # 实际实现应该使用feedparser库
-            
             self.logger.debug(f"解析RSS订阅源: {feed_url}")
             
-            # 模拟RSS数据
-            rss_items = [
-                {
-                    "title": "AI芯片公司发布新一代处理器",
-                    "description": "一家AI芯片初创公司发布了新一代处理器，性能提升3倍...",
-                    "link": "https://techcrunch.com/ai-chip-new-processor",
-                    "published": (datetime.now() - timedelta(hours=2)).isoformat(),
-                    "author": "Tech Reporter"
-                },
-                {
-                    "title": "电动汽车销量在2024年第一季度增长40%",
-                    "description": "全球电动汽车销量持续增长，中国品牌表现突出...",
-                    "link": "https://techcrunch.com/ev-sales-growth-2024",
-                    "published": (datetime.now() - timedelta(hours=5)).isoformat(),
-                    "author": "Auto Analyst"
-                },
-                {
-                    "title": "量子加密技术取得突破",
-                    "description": "研究人员在量子加密领域取得重要突破，提升网络安全...",
-                    "link": "https://techcrunch.com/quantum-encryption-breakthrough",
-                    "published": (datetime.now() - timedelta(hours=8)).isoformat(),
-                    "author": "Security Expert"
-                }
-            ]
+            response = await self._make_request(feed_url, headers=self.headers, source=source_name)
+            if not response.ok:
+                self.logger.warning(f"获取RSS订阅源失败: HTTP {response.status} - {feed_url}")
+                return items
+            
+            # 订阅源未变化（304），直接复用上次的解析结果
+            if response.not_modified and feed_url in self._parsed_feeds:
+                self.logger.debug(f"RSS订阅源未变化: {feed_url}")
+                return list(self._parsed_feeds[feed_url])
             
-            for rss_item in rss_items:
+            # 解析在进程池中进行，不阻塞其他新闻源的网络请求
+            records = await get_payload_parser().parse_rss(response.body, self.max_articles_per_source)
+            domain = urlparse(feed_url).netloc
+            
+            for record in records:
                 try:
-                    # 发布时间
-                    published_at = datetime.fromisoformat(rss_item["published"].replace("Z", "+00:00"))
-                    
-                    # 内容
-                    content = rss_item.get("description", rss_item["title"])
+                    published_ts = record["published_ts"]
                     
                     item = CollectedItem(
                         source=source_name,
                         source_type="news_rss",
-                        title=rss_item["title"],
-                        content=content,
-                        url=rss_item["link"],
-                        author=rss_item.get("author"),
-                        published_at=published_at,
+                        title=record["title"],
+                        content=record["summary"],
+                        url=record["link"],
+                        author=record["author"],
+                        published_at=datetime.fromtimestamp(published_ts) if published_ts is not None else None,
                         metadata={
                             "feed_url": feed_url,
                             "source_type": "rss",
-                            "domain": urlparse(feed_url).netloc
+                            "domain": domain,
+                            "guid": record["guid"]
                         }
                     )
                     items.append(item)
@@ -161,6 +146,7 @@ class NewsCollector(BaseCollector):
                 except Exception as e:
                     self.logger.error(f"解析RSS项目失败: {str(e)}")
             
+            self._parsed_feeds[feed_url] = list(items)
             self.logger.debug(f"从RSS订阅源解析到 {len(items)} 篇文章")
             
         except Exception as e:
@@ -169,36 +155,22 @@ class NewsCollector(BaseCollector):
         return items
     
     async def _fetch_from_api(self, api_url: str, source_name: str) -> List[CollectedItem]:
-        """从API获取新闻"""
+        """从API获取新闻（NewsAPI兼容格式）"""
         items = []
         
         try:
-            # 模拟API调用
-            # 实际实现应该使用requests库
-            
             self.logger.debug(f"从API获取新闻: {api_url}")
             
-            # 模拟API响应
-            api_data = {
-                "articles": [
-                    {
-                        "title": "科技巨头发布2024年第一季度财报",
-                        "content": "多家科技公司发布了2024年第一季度财报，表现超出预期...",
-                        "url": "https://newsapi.org/article/tech-earnings-2024-q1",
-                        "author": "Financial Reporter",
-                        "publishedAt": (datetime.now() - timedelta(hours=1)).isoformat(),
-                        "source": {"name": source_name}
-                    },
-                    {
-                        "title": "初创公司获得1亿美元融资",
-                        "description": "一家AI初创公司成功获得1亿美元B轮融资...",
-                        "url": "https://newsapi.org/article/startup-funding-100m",
-                        "author": "VC Analyst",
-                        "publishedAt": (datetime.now() - timedelta(hours=3)).isoformat(),
-                        "source": {"name": source_name}
-                    }
-                ]
-            }
+            headers = dict(self.headers, Accept="application/json")
+            if self.api_key:
+                headers["X-Api-Key"] = self.api_key
+            
+            response = await self._make_request(api_url, headers=headers, source=source_name)
+            if not response.ok:
+                self.logger.warning(f"API调用失败: HTTP {response.status} - {api_url}")
+                return items
+            
+            api_data = response.json()
             
             for article in api_data.get("articles", []):
                 try:
@@ -210,7 +182,7 @@ class NewsCollector(BaseCollector):
                         published_at = datetime.now() - timedelta(days=1)
                     
                     # 内容
-                    content = article.get("content", article.get("description", article["title"]))
+                    content = article.get("content") or article.get("description") or article["title"]
                     
                     item = CollectedItem(
                         source=source_name,
@@ -243,41 +215,37 @@ class NewsCollector(BaseCollector):
         items = []
         
         try:
-            # 模拟网页解析
-            # 实际实现应该使用BeautifulSoup
-            
             self.logger.debug(f"解析网站: {website_url}")
             
-            # 模拟网页内容
-            website_articles = [
-                {
-                    "title": "全球科技趋势2024报告发布",
-                    "summary": "最新发布的全球科技趋势报告揭示了2024年的关键发展方向...",
-                    "url": f"{website_url}/global-tech-trends-2024",
-                    "date": "2024-01-15",
-                    "author": "Research Team"
-                },
-                {
-                    "title": "数字化转型加速企业创新",
-                    "summary": "越来越多的企业通过数字化转型提升竞争力...",
-                    "url": f"{website_url}/digital-transformation-innovation",
-                    "date": "2024-01-14",
-                    "author": "Business Analyst"
-                }
-            ]
+            headers = dict(self.headers, Accept="text/html")
+            response = await self._make_request(website_url, headers=headers, source=source_name)
+            if not response.ok:
+                self.logger.warning(f"获取网页失败: HTTP {response.status} - {website_url}")
+                return items
+            
+            # 网页未变化（304），直接复用上次的解析结果
+            if response.not_modified and website_url in self._parsed_feeds:
+                return list(self._parsed_feeds[website_url])
+            
+            records = await get_payload_parser().parse_html(response.body, website_url, self.max_articles_per_source)
             
-            for article in website_articles:
+            for record in records:
                 try:
-                    # 发布时间
-                    published_at = datetime.strptime(article["date"], "%Y-%m-%d")
+                    # 发布时间（<time datetime="..."> 通常为ISO格式）
+                    published_at = None
+                    if record["published"]:
+                        try:
+                            published_at = datetime.fromisoformat(record["published"].replace("Z", "+00:00"))
+                        except ValueError:
+                            pass
                     
                     item = CollectedItem(
                         source=source_name,
                         source_type="news_website",
-                        title=article["title"],
-                        content=article["summary"],
-                        url=article["url"],
-                        author=article.get("author"),
+                        title=record["title"],
+                        content=record["summary"],
+                        url=record["link"],
+                        author=record["author"],
                         published_at=published_at,
                         metadata={
                             "website_url": website_url,
@@ -290,6 +258,7 @@ class NewsCollector(BaseCollector):
                 except Exception as e:
                     self.logger.error(f"解析网页文章失败: {str(e)}")
             
+            self._parsed_feeds[website_url] = list(items)
             self.logger.debug(f"从网站解析到 {len(items)} 篇文章")
             
         except Exception as e:
@@ -337,7 +306,8 @@ class NewsCollector(BaseCollector):
             "sources_count": len(self.sources),
             "sources": self.sources[:3],  # 只显示前3个
             "max_articles_per_source": self.max_articles_per_source,
-            "api_key_configured": bool(self.api_key)
+            "api_key_configured": bool(self.api_key),
+            "parsing": get_payload_parser().get_stats()
         })
         return status
 
@@ -0,0 +1,252 @@
+"""
+采集编排器
+在同一个事件循环中并发运行所有已注册的采集器
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Dict, List, Any, Optional, Callable, Tuple, AsyncIterator
+from datetime import datetime
+
+from .base_collector import BaseCollector, CollectedItem, CollectorFactory
+from .dedup import DedupStage
+from .parsing import configure_payload_parser
+from ..database.item_store import ItemStore
+from ..utils.http_client import configure_http_client
+from ..utils.http_cache import configure_validator_cache
+from ..utils.rate_limiter import configure_rate_limiter, get_rate_limiter
+# 导入采集器模块以完成注册
+from . import github_collector, hackernews_collector, news_collector  # noqa: F401
+
+
+class CollectionOrchestrator:
+    """采集编排器"""
+
+    def __init__(self, collectors: List[BaseCollector], collector_timeout: Optional[float] = None,
+                 stages: Optional[List[Callable[[CollectedItem], Any]]] = None, stream_buffer: int = 500):
+        """
+        初始化编排器
+
+        Args:
+            collectors: 采集器实例列表
+            collector_timeout: 单个采集器的超时时间（秒），None表示不限制
+            stages: 处理阶段列表（如去重、评分），按顺序作用于每个到达的数据项
+            stream_buffer: 汇总队列大小，下游处理不过来时反压各采集器
+        """
+        self.collectors = collectors
+        self.collector_timeout = collector_timeout
+        self.stages: List[Callable[[CollectedItem], Any]] = list(stages or [])
+        self.stream_buffer = stream_buffer
+        self.logger = logging.getLogger("collector.orchestrator")
+
+        self.is_running = False
+        self.cycles_completed = 0
+        self.last_cycle_time = None
+        self.last_cycle_seconds = 0.0
+        self.last_durations: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any],
+                    database_config: Optional[Dict[str, Any]] = None) -> "CollectionOrchestrator":
+        """
+        根据 data_collection 配置段创建编排器
+
+        Args:
+            config: data_collection 配置字典
+            database_config: database 配置字典，提供时采集结果写入 database.sqlite.path
+
+        Returns:
+            编排器实例
+        """
+        if config.get("http"):
+            configure_http_client(**config["http"])
+
+        if config.get("parsing"):
+            configure_payload_parser(**config["parsing"])
+
+        if config.get("rate_limits"):
+            configure_rate_limiter(**config["rate_limits"])
+
+        cache_config = config.get("http_cache", {})
+        if cache_config.get("path"):
+            configure_validator_cache(cache_config["path"])
+
+        collectors = []
+        for name in CollectorFactory.get_available_collectors():
+            collector_config = config.get(name)
+            if not isinstance(collector_config, dict) or not collector_config.get("enabled", True):
+                continue
+
+            collector_config = dict(collector_config)
+            collector_config.setdefault("conditional_requests", cache_config.get("enabled", True))
+            collector_config.setdefault("checkpoint_dir", config.get("checkpoint_dir", "data/checkpoints"))
+            collector = CollectorFactory.create(name, collector_config)
+            if collector:
+                collectors.append(collector)
+
+        stages = []
+        dedup_config = dict(config.get("dedup", {}))
+        if dedup_config.pop("enabled", True):
+            stages.append(DedupStage(**dedup_config))
+
+        sqlite_config = (database_config or {}).get("sqlite")
+        if sqlite_config and sqlite_config.get("path"):
+            stages.append(ItemStore(sqlite_config["path"], batch_size=sqlite_config.get("batch_size", 500)))
+
+        return cls(collectors, collector_timeout=config.get("collector_timeout"),
+                   stages=stages, stream_buffer=config.get("stream_buffer", 500))
+
+    def add_stage(self, stage: Callable[[CollectedItem], Any]):
+        """
+        添加处理阶段
+
+        阶段接收一个数据项，返回（或 await 后得到）处理后的数据项，返回 None 表示丢弃；
+        阶段对象可选实现 flush()，在每个采集周期结束时调用
+
+        Args:
+            stage: 处理阶段
+        """
+        self.stages.append(stage)
+
+    async def _pump(self, collector: BaseCollector, queue: asyncio.Queue):
+        """将单个采集器的数据流写入汇总队列"""
+        async for item in collector.run_stream():
+            await queue.put((collector.name, item))
+
+    async def _run_collector(self, collector: BaseCollector, queue: asyncio.Queue, finished: object):
+        """运行单个采集器并记录耗时"""
+        start_time = time.time()
+
+        try:
+            if self.collector_timeout:
+                await asyncio.wait_for(self._pump(collector, queue), timeout=self.collector_timeout)
+            else:
+                await self._pump(collector, queue)
+        except asyncio.TimeoutError:
+            self.logger.error(f"采集超时: {collector.name} (超过 {self.collector_timeout} 秒)")
+        except Exception as e:
+            self.logger.error(f"采集器异常: {collector.name}, 错误: {str(e)}", exc_info=True)
+        finally:
+            self.last_durations[collector.name] = time.time() - start_time
+
+        await queue.put(finished)
+
+    async def _apply_stages(self, item: CollectedItem) -> Optional[CollectedItem]:
+        """依次执行处理阶段"""
+        for stage in self.stages:
+            item = stage(item)
+            if inspect.isawaitable(item):
+                item = await item
+            if item is None:
+                return None
+        return item
+
+    async def _flush_stages(self):
+        """周期结束时刷新各处理阶段"""
+        for stage in self.stages:
+            flush = getattr(stage, "flush", None)
+            if flush is None:
+                continue
+            try:
+                result = flush()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"处理阶段刷新失败: {stage!r}, 错误: {str(e)}", exc_info=True)
+
+    async def stream(self) -> AsyncIterator[Tuple[str, CollectedItem]]:
+        """
+        并发运行所有采集器，按到达顺序流式产出经过处理阶段的数据项
+
+        Yields:
+            (采集器名称, 数据项)
+        """
+        start_time = time.time()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.stream_buffer))
+        finished = object()
+        total = 0
+
+        tasks = [asyncio.ensure_future(self._run_collector(c, queue, finished)) for c in self.collectors]
+        remaining = len(tasks)
+
+        try:
+            while remaining:
+                entry = await queue.get()
+                if entry is finished:
+                    remaining -= 1
+                    continue
+
+                name, item = entry
+                item = await self._apply_stages(item)
+                if item is not None:
+                    total += 1
+                    yield name, item
+        finally:
+            # 消费方提前退出（break / aclose）时同样停止采集器并刷新各阶段，缓冲中的数据不会丢失
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._flush_stages()
+
+        self.cycles_completed += 1
+        self.last_cycle_time = datetime.now()
+        self.last_cycle_seconds = time.time() - start_time
+
+        self.logger.info(f"采集周期完成: {len(self.collectors)} 个采集器, 共 {total} 个项目, "
+                         f"耗时 {self.last_cycle_seconds:.2f} 秒")
+
+    async def run_once(self) -> Dict[str, List[CollectedItem]]:
+        """
+        并发运行所有采集器一次
+
+        Returns:
+            采集器名称到采集结果的映射
+        """
+        results: Dict[str, List[CollectedItem]] = {collector.name: [] for collector in self.collectors}
+
+        async for name, item in self.stream():
+            results[name].append(item)
+
+        return results
+
+    async def run_forever(self, interval: float):
+        """
+        按固定间隔循环采集
+
+        Args:
+            interval: 采集周期（秒），对应 data_collection.interval
+        """
+        self.is_running = True
+
+        while self.is_running:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"采集周期失败: {str(e)}", exc_info=True)
+
+            # 扣除本周期耗时，保持固定节奏
+            await asyncio.sleep(max(0.0, interval - self.last_cycle_seconds))
+
+    def stop(self):
+        """停止循环采集"""
+        self.is_running = False
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取编排器状态"""
+        return {
+            "is_running": self.is_running,
+            "cycles_completed": self.cycles_completed,
+            "last_cycle_time": self.last_cycle_time.isoformat() if self.last_cycle_time else None,
+            "last_cycle_seconds": self.last_cycle_seconds,
+            "collector_durations": dict(self.last_durations),
+            "rate_limits": get_rate_limiter().get_status(),
+            "stages": {
+                stage.__class__.__name__: stage.get_stats()
+                for stage in self.stages if hasattr(stage, "get_stats")
+            },
+            "collectors": [collector.get_status() for collector in self.collectors]
+        }
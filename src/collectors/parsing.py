@@ -0,0 +1,219 @@
+"""
+订阅源/网页解析阶段
+把原始响应体交给进程池解析（CPU密集，避免阻塞事件循环），返回精简的解析记录
+"""
+
+import asyncio
+import calendar
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Callable
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- 解析函数（模块级，供工作进程调用） ----------
+
+def parse_rss_payload(body: bytes, max_items: int = 0) -> List[Dict[str, Any]]:
+    """
+    解析RSS/Atom订阅源
+
+    Args:
+        body: 响应体
+        max_items: 最多返回的条目数，0表示不限制
+
+    Returns:
+        解析记录列表：title / summary / link / author / guid / published_ts（UTC时间戳，可能为None）
+    """
+    import feedparser
+
+    feed = feedparser.parse(body)
+    entries = feed.entries[:max_items] if max_items else feed.entries
+
+    records = []
+    for entry in entries:
+        # feedparser统一解析为UTC的struct_time
+        published_parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        records.append({
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", entry.get("title", "")),
+            "link": entry.get("link", ""),
+            "author": entry.get("author"),
+            "guid": entry.get("id", entry.get("link", "")),
+            "published_ts": calendar.timegm(published_parsed) if published_parsed else None
+        })
+    return records
+
+
+def parse_html_payload(body: bytes, base_url: str, max_items: int = 0) -> List[Dict[str, Any]]:
+    """
+    从网页中提取文章列表
+
+    优先解析 <article> 元素；页面没有 <article> 时退化为提取 h2/h3 标题链接
+
+    Args:
+        body: 响应体
+        base_url: 页面URL，用于补全相对链接
+        max_items: 最多返回的文章数，0表示不限制
+
+    Returns:
+        解析记录列表：title / summary / link / author / published（日期字符串，可能为None）
+    """
+    from bs4 import BeautifulSoup
+
+    try:
+        soup = BeautifulSoup(body, "lxml")
+    except Exception:  # 未安装lxml
+        soup = BeautifulSoup(body, "html.parser")
+
+    records = []
+    seen_links = set()
+
+    def _add(title: str, link: str, summary: str = "", author: Optional[str] = None,
+             published: Optional[str] = None):
+        link = urljoin(base_url, link)
+        if not title or link in seen_links:
+            return
+        seen_links.add(link)
+        records.append({"title": title, "summary": summary or title, "link": link,
+                        "author": author, "published": published})
+
+    for article in soup.find_all("article"):
+        heading = article.find(["h1", "h2", "h3"])
+        anchor = (heading.find("a", href=True) if heading else None) or article.find("a", href=True)
+        if not anchor:
+            continue
+
+        paragraph = article.find("p")
+        author = article.find(attrs={"rel": "author"}) or article.find(class_="author")
+        time_tag = article.find("time")
+
+        _add(
+            title=(heading or anchor).get_text(" ", strip=True),
+            link=anchor["href"],
+            summary=paragraph.get_text(" ", strip=True) if paragraph else "",
+            author=author.get_text(" ", strip=True) if author else None,
+            published=(time_tag.get("datetime") or time_tag.get_text(strip=True)) if time_tag else None
+        )
+        if max_items and len(records) >= max_items:
+            return records
+
+    if not records:
+        for heading in soup.find_all(["h2", "h3"]):
+            anchor = heading.find("a", href=True)
+            if anchor:
+                _add(title=anchor.get_text(" ", strip=True), link=anchor["href"])
+                if max_items and len(records) >= max_items:
+                    break
+
+    return records
+
+
+# ---------- 进程池 ----------
+
+class PayloadParser:
+    """进程池解析器"""
+
+    def __init__(self, workers: Optional[int] = None, inline_threshold: int = 32 * 1024):
+        """
+        初始化解析器
+
+        Args:
+            workers: 工作进程数，默认 CPU核数-1；0表示全部在当前进程解析
+            inline_threshold: 小于该字节数的响应体直接在当前进程解析（省去进程间传输开销）
+        """
+        self.workers = max(1, (os.cpu_count() or 2) - 1) if workers is None else workers
+        self.inline_threshold = inline_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.stats = {"inline": 0, "pooled": 0, "failures": 0, "parse_seconds": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """获取进程池，首次使用时创建"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info(f"创建解析进程池: {self.workers} 个工作进程")
+        return self._executor
+
+    async def _run(self, func: Callable[..., List[Dict[str, Any]]], body: bytes, *args) -> List[Dict[str, Any]]:
+        """按响应体大小选择在当前进程或进程池中解析"""
+        start_time = time.monotonic()
+
+        try:
+            if self.workers <= 0 or len(body) < self.inline_threshold:
+                self.stats["inline"] += 1
+                return func(body, *args)
+
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, body, *args)
+            except BrokenProcessPool:
+                # 工作进程异常退出，关闭损坏的进程池（释放其管理线程和队列），下次使用时重建，本次在当前进程完成解析
+                logger.error("解析进程池已损坏，重建进程池")
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                self.stats["failures"] += 1
+                self.stats["inline"] += 1
+                return func(body, *args)
+
+            self.stats["pooled"] += 1
+            return result
+        finally:
+            self.stats["parse_seconds"] += time.monotonic() - start_time
+
+    async def parse_rss(self, body: bytes, max_items: int = 0) -> List[Dict[str, Any]]:
+        """解析RSS/Atom订阅源，参见 parse_rss_payload"""
+        return await self._run(parse_rss_payload, body, max_items)
+
+    async def parse_html(self, body: bytes, base_url: str, max_items: int = 0) -> List[Dict[str, Any]]:
+        """从网页中提取文章列表，参见 parse_html_payload"""
+        return await self._run(parse_html_payload, body, base_url, max_items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取解析统计"""
+        return {"workers": self.workers, "inline_threshold": self.inline_threshold, **self.stats}
+
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# 进程内共享的默认解析器
+_default_parser: Optional[PayloadParser] = None
+
+
+def get_payload_parser() -> PayloadParser:
+    """获取共享解析器"""
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = PayloadParser()
+    return _default_parser
+
+
+def configure_payload_parser(**options) -> PayloadParser:
+    """
+    按配置重建共享解析器
+
+    Args:
+        options: PayloadParser 构造参数（对应 data_collection.parsing）
+
+    Returns:
+        新的共享解析器
+    """
+    global _default_parser
+    if _default_parser is not None:
+        _default_parser.close()
+    _default_parser = PayloadParser(**options)
+    return _default_parser
+
+
+def close_payload_parser():
+    """关闭共享解析器的进程池"""
+    if _default_parser is not None:
+        _default_parser.close()
@@ -0,0 +1,252 @@
+"""
+采集数据存储
+基于SQLite（WAL模式）持久化 CollectedItem，支持批量写入和全文检索；
+作为处理阶段使用时，批量写入在专用线程中执行，SQLite的写入和提交不阻塞事件循环
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterable
+
+from ..collectors.base_collector import CollectedItem
+from ..utils.timestamps import join_datetime, split_datetime
+from ..utils.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    canonical_url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT,
+    author TEXT,
+    published_at REAL,
+    published_offset REAL,
+    collected_at REAL NOT NULL,
+    metadata TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_items_source_type_published ON items (source_type, published_at);
+CREATE INDEX IF NOT EXISTS idx_items_published ON items (published_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (
+    title, content, content='items', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO items_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO items (canonical_url, url, source, source_type, title, content, author,
+                   published_at, published_offset, collected_at, metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (canonical_url) DO UPDATE SET
+    title = excluded.title,
+    content = excluded.content,
+    author = excluded.author,
+    published_offset = CASE WHEN excluded.published_at IS NULL THEN items.published_offset
+                            ELSE excluded.published_offset END,
+    published_at = COALESCE(excluded.published_at, items.published_at),
+    collected_at = excluded.collected_at,
+    metadata = excluded.metadata
+"""
+
+COLUMNS = "url, source, source_type, title, content, author, published_at, published_offset, metadata"
+
+
+class ItemStore:
+    """采集数据存储"""
+
+    def __init__(self, path: str = "data/opportunities.db", batch_size: int = 500):
+        """
+        初始化存储
+
+        Args:
+            path: SQLite数据库路径，对应 database.sqlite.path
+            batch_size: 作为处理阶段使用时的批量写入大小
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[CollectedItem] = []
+        self.items_written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 连接在写入线程和调用线程之间共用，由锁保证同一时间只有一个线程使用
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.executescript(SCHEMA)
+        # 旧版本创建的数据库没有 published_offset 列（原有的发布时间按无时区的本地时间读取）
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(items)")}
+        if "published_offset" not in columns:
+            self._conn.execute("ALTER TABLE items ADD COLUMN published_offset REAL")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_row(item: CollectedItem, collected_at: float) -> tuple:
+        """数据项转换为数据库行（发布时间拆分为时间戳和UTC偏移，无时区时偏移为NULL）"""
+        published_at, published_offset = split_datetime(item.published_at) if item.published_at else (None, None)
+        return (
+            canonicalize_url(item.url),
+            item.url,
+            item.source,
+            item.source_type,
+            item.title,
+            item.content,
+            item.author,
+            published_at,
+            published_offset,
+            collected_at,
+            json.dumps(item.metadata, ensure_ascii=False, default=str) if item.metadata else None
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> CollectedItem:
+        """数据库行转换为数据项"""
+        url, source, source_type, title, content, author, published_at, published_offset, metadata = row
+        return CollectedItem(
+            source=source,
+            source_type=source_type,
+            title=title,
+            content=content or "",
+            url=url,
+            author=author,
+            published_at=join_datetime(published_at, published_offset) if published_at is not None else None,
+            metadata=json.loads(metadata) if metadata else None
+        )
+
+    def upsert_many(self, items: Iterable[CollectedItem]) -> int:
+        """
+        批量写入数据项（按规范化URL去重更新），整批在一个事务中提交
+
+        Args:
+            items: 数据项
+
+        Returns:
+            写入的行数
+        """
+        collected_at = time.time()
+        rows = [self._to_row(item, collected_at) for item in items if item.url]
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_SQL, rows)
+
+        self.items_written += len(rows)
+        return len(rows)
+
+    def recent_by_source(self, source_type: str, hours: float = 24, limit: int = 500) -> List[CollectedItem]:
+        """
+        查询某数据源类型最近一段时间发布的数据项
+
+        Args:
+            source_type: 数据源类型
+            hours: 时间窗口（小时）
+            limit: 最大返回条数
+
+        Returns:
+            按发布时间倒序排列的数据项
+        """
+        since = (datetime.now() - timedelta(hours=hours)).timestamp()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM items WHERE source_type = ? AND published_at >= ? "
+                f"ORDER BY published_at DESC LIMIT ?",
+                (source_type, since, limit)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def search(self, query: str, limit: int = 50) -> List[CollectedItem]:
+        """
+        全文检索标题和内容
+
+        Args:
+            query: FTS5查询表达式
+            limit: 最大返回条数
+
+        Returns:
+            按相关度排序的数据项
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join('items.' + c.strip() for c in COLUMNS.split(','))} "
+                f"FROM items_fts JOIN items ON items.id = items_fts.rowid "
+                f"WHERE items_fts MATCH ? ORDER BY bm25(items_fts) LIMIT ?",
+                (query, limit)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def count(self, source_type: Optional[str] = None) -> int:
+        """统计数据项数量"""
+        with self._lock:
+            if source_type:
+                return self._conn.execute("SELECT COUNT(*) FROM items WHERE source_type = ?",
+                                          (source_type,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取写入线程，首次使用时创建（单线程，批次按提交顺序写入）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="item-store")
+        return self._executor
+
+    async def upsert_many_async(self, items: List[CollectedItem]) -> int:
+        """在写入线程中批量写入，参见 upsert_many"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.upsert_many, items)
+
+    async def __call__(self, item: CollectedItem) -> CollectedItem:
+        """处理阶段入口：缓冲数据项，达到批量大小时在写入线程中写入"""
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        return item
+
+    async def flush(self):
+        """在写入线程中写入缓冲区中的数据项"""
+        if self._buffer:
+            buffer, self._buffer = self._buffer, []
+            await self.upsert_many_async(buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取存储统计"""
+        return {"path": self.path, "items_written": self.items_written, "buffered": len(self._buffer)}
+
+    def close(self):
+        """等待进行中的写入完成，写入剩余数据并关闭连接"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._buffer:
+            buffer, self._buffer = self._buffer, []
+            self.upsert_many(buffer)
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,317 @@
+"""
+行情历史存储
+按品种、按天分区的追加写列式文件（int64毫秒时间戳列 + float64价格列），查询时通过mmap按需读取
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TS_SUFFIX = ".ts.i64"
+VALUE_SUFFIX = ".px.f64"
+
+
+def _day_of(timestamp_ms: int) -> str:
+    """毫秒时间戳所在的UTC日期（分区名）"""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime("%Y%m%d")
+
+
+def _day_start_ms(day: str) -> int:
+    """分区的起始毫秒时间戳"""
+    return int(datetime.strptime(day, "%Y%m%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class TickStore:
+    """行情历史存储"""
+
+    def __init__(self, root: str = "data/ticks", flush_size: int = 256, flush_interval: float = 5.0):
+        """
+        初始化存储
+
+        Args:
+            root: 存储目录，每个品种一个子目录
+            flush_size: 缓冲的数据点达到该数量时写入磁盘
+            flush_interval: 距上次写入超过该秒数时写入磁盘
+        """
+        self.root = root
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._pending: Dict[str, Tuple[List[int], List[float]]] = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self._last_ts: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+        self.points_written = 0
+
+    @staticmethod
+    def _safe_name(symbol: str) -> str:
+        """品种名转换为目录名"""
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", symbol)
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, self._safe_name(symbol))
+
+    def _index(self, symbol: str) -> Dict[str, Dict[str, int]]:
+        """
+        品种的分区索引：日期 -> {count, first, last}（毫秒时间戳）
+
+        首次加载时与数据文件核对，不一致（如写入中途退出）时以数据文件长度为准
+        """
+        index = self._indexes.get(symbol)
+        if index is None:
+            index = {}
+            path = os.path.join(self._symbol_dir(symbol), "index.json")
+            if os.path.exists(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        index = json.load(f).get("days", {})
+                except (OSError, ValueError) as e:
+                    logger.error(f"加载行情索引失败: {symbol} - {e}")
+            self._indexes[symbol] = index
+            self._reconcile_index(symbol, index)
+        return index
+
+    def _reconcile_index(self, symbol: str, index: Dict[str, Dict[str, int]]):
+        """
+        按数据文件修正索引：两列长度不一致时截断到较短的一列，补上索引中缺失的分区，
+        条数不一致的分区重新读取首末时间戳
+        """
+        directory = self._symbol_dir(symbol)
+        if not os.path.isdir(directory):
+            return
+
+        days = {name[:-len(TS_SUFFIX)] for name in os.listdir(directory) if name.endswith(TS_SUFFIX)}
+        changed = False
+        for day in sorted(days | set(index)):
+            self._truncate_day(symbol, day)
+            timestamps, _ = self._open_day(symbol, day)
+            entry = index.get(day)
+            if not len(timestamps):
+                if index.pop(day, None) is not None:
+                    changed = True
+            elif entry is None or entry["count"] != len(timestamps):
+                index[day] = {"count": len(timestamps), "first": int(timestamps[0]), "last": int(timestamps[-1])}
+                changed = True
+
+        if changed:
+            logger.warning(f"行情索引与数据文件不一致，已按数据文件修正: {symbol}")
+            self._save_index(symbol)
+
+    def _truncate_day(self, symbol: str, day: str):
+        """把某天的两个列文件截断到相同的完整条数（写入中途退出会留下半条记录或多出的一列）"""
+        base = os.path.join(self._symbol_dir(symbol), day)
+        paths = [base + TS_SUFFIX, base + VALUE_SUFFIX]
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in paths]
+        size = min(sizes) // 8 * 8
+        for path, current in zip(paths, sizes):
+            if current > size:
+                logger.warning(f"截断不完整的行情文件: {path} ({current} -> {size} 字节)")
+                os.truncate(path, size)
+
+    def _save_index(self, symbol: str):
+        """写入品种索引"""
+        path = os.path.join(self._symbol_dir(symbol), "index.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"symbol": symbol, "days": self._indexes[symbol]}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    # ---------- 写入 ----------
+
+    def append(self, symbol: str, timestamp: float, value: float):
+        """
+        追加一个数据点（时间戳不晚于该品种已有最新数据的点会被忽略）
+
+        Args:
+            symbol: 品种
+            timestamp: Unix时间戳（秒）
+            value: 价格
+        """
+        timestamp_ms = int(round(timestamp * 1000))
+        last_ts = self._last_ts.get(symbol)
+        if last_ts is None:
+            last_ts = self._last_ts[symbol] = self._latest_timestamp_ms(symbol)
+        if last_ts is not None and timestamp_ms <= last_ts:
+            return
+
+        timestamps, values = self._pending.setdefault(symbol, ([], []))
+        timestamps.append(timestamp_ms)
+        values.append(value)
+        self._last_ts[symbol] = timestamp_ms
+        self._pending_count += 1
+
+        if self._pending_count >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def append_many(self, symbol: str, timestamps, values):
+        """批量追加数据点（时间戳单位为秒）"""
+        for timestamp, value in zip(timestamps, values):
+            self.append(symbol, float(timestamp), float(value))
+
+    def flush(self):
+        """把缓冲的数据点按天追加写入列文件并更新索引"""
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+        for symbol, (timestamps, values) in pending.items():
+            directory = self._symbol_dir(symbol)
+            os.makedirs(directory, exist_ok=True)
+            index = self._index(symbol)
+
+            ts_array = np.asarray(timestamps, dtype=np.int64)
+            value_array = np.asarray(values, dtype=np.float64)
+            first_day = _day_of(int(ts_array[0]))
+
+            # 多数情况下整批落在同一天，否则按天切分
+            if first_day == _day_of(int(ts_array[-1])):
+                groups = [(first_day, ts_array, value_array)]
+            else:
+                day_keys = np.array([_day_of(int(ts)) for ts in ts_array])
+                groups = [(day, ts_array[day_keys == day], value_array[day_keys == day])
+                          for day in dict.fromkeys(day_keys)]
+
+            for day, day_ts, day_values in groups:
+                base = os.path.join(directory, day)
+                with open(base + TS_SUFFIX, "ab") as f:
+                    f.write(day_ts.tobytes())
+                with open(base + VALUE_SUFFIX, "ab") as f:
+                    f.write(day_values.tobytes())
+
+                entry = index.setdefault(day, {"count": 0, "first": int(day_ts[0]), "last": int(day_ts[-1])})
+                entry["count"] += len(day_ts)
+                entry["last"] = int(day_ts[-1])
+                self.points_written += len(day_ts)
+
+            self._save_index(symbol)
+
+    # ---------- 查询 ----------
+
+    def _open_day(self, symbol: str, day: str) -> Tuple[np.ndarray, np.ndarray]:
+        """以只读mmap打开某天的列文件"""
+        base = os.path.join(self._symbol_dir(symbol), day)
+        try:
+            count = min(os.path.getsize(base + TS_SUFFIX) // 8, os.path.getsize(base + VALUE_SUFFIX) // 8)
+        except OSError:
+            count = 0
+        if not count:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        timestamps = np.memmap(base + TS_SUFFIX, dtype=np.int64, mode="r", shape=(count,))
+        values = np.memmap(base + VALUE_SUFFIX, dtype=np.float64, mode="r", shape=(count,))
+        return timestamps, values
+
+    def query(self, symbol: str, start: Optional[float] = None,
+              end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        查询时间范围内的数据点（只映射与范围相交的分区，分区内二分定位）
+
+        Args:
+            symbol: 品种
+            start: 起始Unix时间戳（秒，含）
+            end: 结束Unix时间戳（秒，含）
+
+        Returns:
+            (毫秒时间戳数组, 价格数组)；范围只落在一天内时为mmap视图，否则为拼接后的数组
+        """
+        if self._pending.get(symbol):
+            self.flush()
+
+        start_ms = int(start * 1000) if start is not None else None
+        end_ms = int(end * 1000) if end is not None else None
+
+        ts_parts, value_parts = [], []
+        for day in sorted(self._index(symbol)):
+            day_start = _day_start_ms(day)
+            if end_ms is not None and day_start > end_ms:
+                break
+            if start_ms is not None and day_start + 86400000 <= start_ms:
+                continue
+
+            timestamps, values = self._open_day(symbol, day)
+            lo = np.searchsorted(timestamps, start_ms, side="left") if start_ms is not None else 0
+            hi = np.searchsorted(timestamps, end_ms, side="right") if end_ms is not None else len(timestamps)
+            if hi > lo:
+                ts_parts.append(timestamps[lo:hi])
+                value_parts.append(values[lo:hi])
+
+        if not ts_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        if len(ts_parts) == 1:
+            return ts_parts[0], value_parts[0]
+        return np.concatenate(ts_parts), np.concatenate(value_parts)
+
+    def latest(self, symbol: str, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        最近 count 个数据点（从最新的分区向前读取）
+
+        Returns:
+            (毫秒时间戳数组, 价格数组)
+        """
+        if self._pending.get(symbol):
+            self.flush()
+
+        ts_parts, value_parts = [], []
+        remaining = count
+        for day in sorted(self._index(symbol), reverse=True):
+            if remaining <= 0:
+                break
+            timestamps, values = self._open_day(symbol, day)
+            ts_parts.append(timestamps[-remaining:])
+            value_parts.append(values[-remaining:])
+            remaining -= len(ts_parts[-1])
+
+        if not ts_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.concatenate(ts_parts[::-1]), np.concatenate(value_parts[::-1])
+
+    def _latest_timestamp_ms(self, symbol: str) -> Optional[int]:
+        """磁盘上该品种的最新时间戳"""
+        index = self._index(symbol)
+        if not index:
+            return None
+        return index[max(index)]["last"]
+
+    def symbols(self) -> List[str]:
+        """已存储的品种"""
+        if not os.path.isdir(self.root):
+            return []
+
+        symbols = []
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name, "index.json")
+            if os.path.exists(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        symbols.append(json.load(f).get("symbol", name))
+                except (OSError, ValueError):
+                    continue
+        return symbols
+
+    def days(self, symbol: str) -> List[str]:
+        """品种已有的日期分区"""
+        return sorted(self._index(symbol))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取存储统计"""
+        return {
+            "root": self.root,
+            "points_written": self.points_written,
+            "pending": self._pending_count,
+            "symbols": {symbol: sum(entry["count"] for entry in index.values())
+                        for symbol, index in self._indexes.items()}
+        }
+
+    def close(self):
+        """写入剩余数据"""
+        self.flush()
@@ -0,0 +1,167 @@
+"""
+结构化数据指纹
+把嵌套结构按规范形式编码（键排序的紧凑JSON），再用快速非加密哈希生成内容ID；
+默认安装了xxhash时使用xxh3_64，否则使用 blake2b(digest_size=8)。默认算法随环境变化，
+持久化或写入日志的ID应显式使用 STABLE_ALGORITHM
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, time as dt_time
+from enum import Enum
+from typing import Any, Optional
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库json
+    orjson = None
+
+DEFAULT_ALGORITHM = "xxh3_64" if HAS_XXHASH else "blake2b"
+
+# 与是否安装xxhash无关的算法，用于需要跨环境保持一致的ID（持久化索引、日志ID、数据哈希）
+STABLE_ALGORITHM = "blake2b"
+
+
+def _new_hasher(algorithm: str):
+    if algorithm == "xxh3_64":
+        if not HAS_XXHASH:
+            raise ValueError("未安装xxhash，无法使用xxh3_64")
+        return xxhash.xxh3_64()
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=8)
+    raise ValueError(f"未知的哈希算法: {algorithm}")
+
+
+def _to_int(digest: bytes) -> int:
+    """8字节摘要转换为整数（intdigest 与 hash64 统一使用小端序）"""
+    return int.from_bytes(digest, "little")
+
+
+def _default(value: Any) -> Any:
+    """JSON无法直接表示的类型转换为规范形式"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=lambda item: (type(item).__name__, str(item)))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "tolist"):  # NumPy数组和标量
+        return value.tolist()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return repr(value)
+
+
+def canonical_bytes(value: Any) -> bytes:
+    """
+    值的规范编码：相同内容得到相同字节串，与字典插入顺序无关
+
+    Args:
+        value: 由字典、列表、字符串、数字等组成的嵌套结构
+
+    Returns:
+        键排序的紧凑JSON（UTF-8）
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=_default, sort_keys=True, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class Fingerprinter:
+    """增量指纹：逐个加入值（如逐条记录），无需先组装成一个大的结构"""
+
+    def __init__(self, algorithm: Optional[str] = None):
+        """
+        初始化
+
+        Args:
+            algorithm: xxh3_64 或 blake2b，默认优先使用xxh3_64
+        """
+        self.algorithm = algorithm or DEFAULT_ALGORITHM
+        self._hasher = _new_hasher(self.algorithm)
+
+    def update(self, value: Any) -> "Fingerprinter":
+        """加入一个值"""
+        self._hasher.update(canonical_bytes(value))
+        return self
+
+    def intdigest(self) -> int:
+        """64位整数指纹（与 hash64(canonical_bytes(value)) 相同）"""
+        return _to_int(self._hasher.digest())
+
+    def hexdigest(self, length: int = 16) -> str:
+        """
+        十六进制指纹
+
+        Args:
+            length: 保留的十六进制字符数（最多16）
+        """
+        return self._hasher.hexdigest()[:length]
+
+
+def fingerprint(value: Any, length: int = 16, algorithm: Optional[str] = None) -> str:
+    """
+    计算结构化数据的十六进制指纹（与字典键顺序无关）
+
+    Args:
+        value: 嵌套结构
+        length: 保留的十六进制字符数（最多16）
+        algorithm: xxh3_64 或 blake2b，默认优先使用xxh3_64；持久化或记录的ID传入 STABLE_ALGORITHM
+
+    Returns:
+        十六进制字符串
+    """
+    return Fingerprinter(algorithm).update(value).hexdigest(length)
+
+
+def hash64(data: bytes, algorithm: Optional[str] = None) -> int:
+    """
+    字节串的64位哈希
+
+    需要跨环境保持一致的场景（如持久化索引）应使用 STABLE_ALGORITHM
+    """
+    hasher = _new_hasher(algorithm or DEFAULT_ALGORITHM)
+    hasher.update(data)
+    return _to_int(hasher.digest())
+
+
+if __name__ == "__main__":
+    import timeit
+
+    sample = {
+        "data_type": "financial",
+        "validation_passed": True,
+        "confidence_score": 99.97,
+        "issues": [],
+        "validated_data": {"value": 27450.25, "range": "27448.90-27452.80", "sources": 3},
+        "points": [
+            {"source": name, "price": 27450.25 + i * 0.5, "timestamp": f"2026-02-11T07:0{i}:00Z"}
+            for i, name in enumerate(["yahoo", "investing", "bloomberg", "reuters", "wsj"])
+        ]
+    }
+    reordered = json.loads(json.dumps(dict(reversed(list(sample.items())))))
+
+    def legacy():
+        return hashlib.md5(str(sample).encode()).hexdigest()[:12]
+
+    candidates = [("md5(str())", legacy)]
+    for name in ["blake2b"] + (["xxh3_64"] if HAS_XXHASH else []):
+        candidates.append((name, lambda name=name: fingerprint(sample, 12, name)))
+
+    number = 20000
+    for name, func in candidates:
+        seconds = timeit.timeit(func, number=number)
+        print(f"{name:12s} {seconds / number * 1e6:8.2f} us/次  {func()}")
+
+    print(f"键顺序无关: md5(str())={legacy() == hashlib.md5(str(reordered).encode()).hexdigest()[:12]}  "
+          f"fingerprint={fingerprint(sample) == fingerprint(reordered)}")
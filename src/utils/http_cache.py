@@ -0,0 +1,198 @@
+"""
+HTTP校验器缓存
+按URL保存 ETag / Last-Modified 及响应体，用于发送条件请求并在304时直接复用缓存；
+异步调用方通过 get_async / store_async 在专用线程中读写，SQLite的查询和提交不阻塞事件循环
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+from .http_client import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "data/http_cache.db"
+
+
+@dataclass
+class CachedResponse:
+    """缓存的响应及其校验器"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """生成条件请求头"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, elapsed: float = 0.0) -> HttpResponse:
+        """转换为未修改（来自缓存）的HTTP响应"""
+        return HttpResponse(
+            url=self.url,
+            status=200,
+            headers=self.headers,
+            body=self.body,
+            elapsed=elapsed,
+            not_modified=True
+        )
+
+
+class ValidatorCache:
+    """基于SQLite的磁盘校验器缓存"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        初始化缓存
+
+        Args:
+            path: SQLite数据库文件路径
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 连接在专用线程和调用线程之间共用，由锁保证同一时间只有一个线程使用
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_validators (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT,
+                body BLOB,
+                stored_at REAL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """根据URL和查询参数生成缓存键"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取读写线程，首次使用时创建（单线程，写入按提交顺序执行）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="http-cache")
+        return self._executor
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """读取缓存条目"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, headers, body, stored_at FROM http_validators WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        url, etag, last_modified, headers, body, stored_at = row
+        return CachedResponse(url, etag, last_modified, json.loads(headers or "{}"), body or b"", stored_at)
+
+    def store(self, key: str, response: HttpResponse) -> bool:
+        """
+        保存带校验器的响应
+
+        Args:
+            key: 缓存键
+            response: 2xx响应
+
+        Returns:
+            是否写入（响应没有 ETag / Last-Modified 时不缓存）
+        """
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+
+        if not etag and not last_modified:
+            return False
+
+        kept_headers = {name: value for name, value in response.headers.items()
+                        if name.lower() in ("content-type", "etag", "last-modified")}
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_validators VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, etag, last_modified, json.dumps(kept_headers), response.body, time.time())
+            )
+            self._conn.commit()
+        return True
+
+    async def get_async(self, key: str) -> Optional[CachedResponse]:
+        """在读写线程中读取缓存条目，参见 get"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.get, key)
+
+    async def store_async(self, key: str, response: HttpResponse) -> bool:
+        """在读写线程中保存响应，参见 store"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.store, key, response)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM http_validators")
+            self._conn.commit()
+
+    def close(self):
+        """等待进行中的读写完成后关闭数据库连接"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            self._conn.close()
+
+
+# 进程内共享的默认缓存
+_default_cache: Optional[ValidatorCache] = None
+
+
+def get_validator_cache() -> ValidatorCache:
+    """获取共享校验器缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ValidatorCache()
+    return _default_cache
+
+
+def configure_validator_cache(path: str = DEFAULT_CACHE_PATH) -> ValidatorCache:
+    """
+    按配置重建共享校验器缓存
+
+    Args:
+        path: SQLite数据库文件路径
+
+    Returns:
+        新的共享缓存
+    """
+    global _default_cache
+    if _default_cache is not None:
+        _default_cache.close()
+    _default_cache = ValidatorCache(path)
+    return _default_cache
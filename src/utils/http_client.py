@@ -0,0 +1,266 @@
+"""
+共享HTTP客户端
+为采集器和实时数据系统提供统一的连接池化异步HTTP传输层
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:  # 旧版本aiohttp
+    HAS_BROTLI = False
+
+logger = logging.getLogger(__name__)
+
+# 安装 brotli / brotlicffi 后 aiohttp 会自动解压 br 编码
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+
+@dataclass
+class HttpResponse:
+    """已读取完毕的HTTP响应（连接已归还连接池）"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    elapsed: float  # 请求耗时（秒）
+    not_modified: bool = False  # 服务器返回304，响应体来自本地缓存
+
+    @property
+    def ok(self) -> bool:
+        """是否为2xx响应"""
+        return 200 <= self.status < 300
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """按文本解码响应体"""
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self) -> Any:
+        """按JSON解析响应体"""
+        return json.loads(self.body)
+
+
+class HttpClient:
+    """连接池化的异步HTTP客户端"""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 8, dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30.0, timeout: float = 10.0,
+                 user_agent: str = "GlobalOpportunityMonitor/1.0"):
+        """
+        初始化客户端
+
+        Args:
+            limit: 连接池总连接数上限
+            limit_per_host: 单个主机的连接数上限
+            dns_cache_ttl: DNS缓存有效期（秒）
+            keepalive_timeout: 空闲keep-alive连接保留时间（秒）
+            timeout: 默认请求超时（秒）
+            user_agent: 默认User-Agent
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.user_agent = user_agent
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+
+        # 连接复用指标
+        self.metrics = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "bytes_received": 0
+        }
+        self.host_metrics: Dict[str, Dict[str, int]] = {}
+
+    def _host_stats(self, host: str) -> Dict[str, int]:
+        """获取单个主机的统计计数器"""
+        if host not in self.host_metrics:
+            self.host_metrics[host] = {"requests": 0, "connections_created": 0, "connections_reused": 0}
+        return self.host_metrics[host]
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """构建用于统计连接复用和DNS缓存命中的追踪配置"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.host = params.url.host or ""
+
+        async def on_connection_create_end(session, ctx, params):
+            self.metrics["connections_created"] += 1
+            self._host_stats(getattr(ctx, "host", ""))["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.metrics["connections_reused"] += 1
+            self._host_stats(getattr(ctx, "host", ""))["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.metrics["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.metrics["dns_cache_misses"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取当前事件循环上的共享会话，必要时创建"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent, "Accept-Encoding": ACCEPT_ENCODING},
+                trace_configs=[self._build_trace_config()],
+                auto_decompress=True
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+                      **kwargs) -> HttpResponse:
+        """
+        发送HTTP请求并读取完整响应体
+
+        Args:
+            method: 请求方法
+            url: 请求URL
+            headers: 请求头
+            params: 查询参数
+            timeout: 本次请求超时（秒），默认使用客户端超时
+
+        Returns:
+            HTTP响应
+
+        Raises:
+            aiohttp.ClientError: 网络错误
+            asyncio.TimeoutError: 请求超时
+        """
+        session = await self._get_session()
+        if timeout:
+            # 未指定时不传timeout，否则aiohttp会把None当作不限时而覆盖会话的默认超时
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        self.metrics["requests"] += 1
+        self._host_stats(urlparse(url).hostname or "")["requests"] += 1
+        start_time = time.monotonic()
+
+        try:
+            async with session.request(method, url, headers=headers, params=params, **kwargs) as response:
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.metrics["errors"] += 1
+            raise
+
+        self.metrics["bytes_received"] += len(body)
+
+        return HttpResponse(
+            url=str(response.url),
+            status=response.status,
+            headers=dict(response.headers),
+            body=body,
+            elapsed=time.monotonic() - start_time
+        )
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+                  **kwargs) -> HttpResponse:
+        """发送GET请求"""
+        return await self.request("GET", url, headers=headers, params=params, timeout=timeout, **kwargs)
+
+    async def ws_connect(self, url: str, heartbeat: Optional[float] = 30.0,
+                         **kwargs) -> aiohttp.ClientWebSocketResponse:
+        """
+        通过共享会话建立WebSocket连接（调用方负责关闭）
+
+        Args:
+            url: WebSocket地址
+            heartbeat: ping间隔（秒），超时未收到pong时断开
+
+        Returns:
+            WebSocket连接
+        """
+        session = await self._get_session()
+        return await session.ws_connect(url, heartbeat=heartbeat, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        获取连接池指标
+
+        Returns:
+            包含连接复用率的指标字典
+        """
+        connections = self.metrics["connections_created"] + self.metrics["connections_reused"]
+        return {
+            **self.metrics,
+            "connection_reuse_rate": self.metrics["connections_reused"] / connections if connections else 0.0,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "hosts": {host: dict(stats) for host, stats in self.host_metrics.items()}
+        }
+
+    async def close(self):
+        """关闭会话并释放连接池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+
+# 进程内共享的默认客户端
+_default_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """获取共享HTTP客户端"""
+    global _default_client
+    if _default_client is None:
+        _default_client = HttpClient()
+    return _default_client
+
+
+def configure_http_client(**options) -> HttpClient:
+    """
+    按配置重建共享HTTP客户端（应在发出任何请求前调用）
+
+    Args:
+        options: HttpClient 构造参数
+
+    Returns:
+        新的共享客户端
+    """
+    global _default_client
+    _default_client = HttpClient(**options)
+    return _default_client
+
+
+async def close_http_client():
+    """关闭共享HTTP客户端"""
+    if _default_client is not None:
+        await _default_client.close()
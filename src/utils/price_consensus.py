@@ -0,0 +1,240 @@
+"""
+多数据源价格共识
+每个品种保留各数据源的最新报价，按数据源可靠性加权取中位数，基于MAD剔除离群报价；
+数据源可靠性按EWMA更新，新报价到达时只重新计算该品种的共识值
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+# MAD换算为正态分布标准差的系数
+MAD_SCALE = 1.4826
+
+
+@dataclass
+class ConsensusResult:
+    """共识结果"""
+    symbol: str
+    value: Optional[float]
+    sources: List[str] = field(default_factory=list)  # 参与共识的数据源
+    outliers: List[str] = field(default_factory=list)  # 被剔除的数据源
+    consistency: float = 0.0  # 1 - 入选报价相对共识值的加权平均偏差
+    low: Optional[float] = None
+    high: Optional[float] = None
+    updated_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'symbol': self.symbol,
+            'value': self.value,
+            'sources': self.sources,
+            'outliers': self.outliers,
+            'consistency': self.consistency,
+            'low': self.low,
+            'high': self.high,
+            'updated_at': self.updated_at
+        }
+
+
+def weighted_median(values: List[float], weights: List[float]) -> float:
+    """
+    加权中位数
+
+    Args:
+        values: 数值
+        weights: 非负权重（全部为0时按等权计算）
+
+    Returns:
+        累计权重首次达到总权重一半处的数值
+    """
+    pairs = sorted(zip(values, weights))
+    total = sum(weight for _, weight in pairs)
+    if total <= 0:
+        pairs = [(value, 1.0) for value, _ in pairs]
+        total = float(len(pairs))
+
+    cumulative = 0.0
+    for i, (value, weight) in enumerate(pairs):
+        cumulative += weight
+        if cumulative >= total / 2:
+            # 恰好平分总权重时取相邻两值的中点（等权时与普通中位数一致）
+            if abs(cumulative - total / 2) <= 1e-12 * total and i + 1 < len(pairs):
+                return (value + pairs[i + 1][0]) / 2
+            return value
+    return pairs[-1][0]
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class PriceConsensus:
+    """多数据源价格共识引擎"""
+
+    def __init__(self, mad_threshold: float = 3.5, min_spread: float = 0.001, reliability_alpha: float = 0.1,
+                 max_age_seconds: float = 300.0, min_reliability: float = 0.05):
+        """
+        初始化共识引擎
+
+        Args:
+            mad_threshold: 报价偏离中位数超过该倍数的MAD（换算为标准差）时视为离群
+            min_spread: MAD的下限（相对中位数的比例），避免报价几乎一致时把微小差异判为离群
+            reliability_alpha: 数据源可靠性EWMA的平滑系数
+            max_age_seconds: 超过该时间未更新的报价不参与共识
+            min_reliability: 数据源权重下限，可靠性很低的数据源恢复正常后仍能逐步提高权重
+        """
+        self.mad_threshold = mad_threshold
+        self.min_spread = min_spread
+        self.reliability_alpha = reliability_alpha
+        self.max_age_seconds = max_age_seconds
+        self.min_reliability = min_reliability
+
+        self._quotes: Dict[str, Dict[str, Tuple[float, float]]] = {}  # 品种 -> 数据源 -> (价格, 时间)
+        self._results: Dict[str, ConsensusResult] = {}
+        self.reliability: Dict[str, float] = {}  # 数据源 -> 可靠性（0~1）
+
+        self.stats = {"quotes": 0, "outliers": 0}
+
+    def update(self, source: str, price: float, symbol: str = "default",
+               timestamp: Optional[float] = None) -> ConsensusResult:
+        """
+        接收一个报价并更新该品种的共识值
+
+        Args:
+            source: 数据源名称
+            price: 价格
+            symbol: 品种
+            timestamp: 报价时间（Unix秒），默认当前时间
+
+        Returns:
+            更新后的共识结果
+        """
+        return self.update_many({source: price}, symbol, timestamp)
+
+    def update_many(self, quotes: Dict[str, float], symbol: str = "default",
+                    timestamp: Optional[float] = None) -> ConsensusResult:
+        """
+        同时接收多个数据源的报价（只重新计算一次共识）
+
+        Args:
+            quotes: 数据源 -> 价格
+            symbol: 品种
+            timestamp: 报价时间（Unix秒），默认当前时间
+
+        Returns:
+            更新后的共识结果
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        book = self._quotes.setdefault(symbol, {})
+        for source, price in quotes.items():
+            book[source] = (float(price), timestamp)
+            self.stats["quotes"] += 1
+
+        result = self._recompute(symbol, timestamp)
+        self._update_reliability(quotes, result)
+        return result
+
+    def evaluate(self, quotes: Dict[str, float], symbol: Optional[str] = None,
+                 timestamp: Optional[float] = None) -> ConsensusResult:
+        """
+        只用本次给出的报价计算共识（一次性验证多个数据源的报价时使用）
+
+        与 update_many 不同，之前其他数据源的报价不参与计算；数据源可靠性照常更新
+
+        Args:
+            quotes: 数据源 -> 价格
+            symbol: 品种；给出时该品种的报价簿替换为本次报价，并可通过 consensus() 读取结果
+            timestamp: 报价时间（Unix秒），默认当前时间
+
+        Returns:
+            共识结果
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        live = {source: float(price) for source, price in quotes.items()}
+        self.stats["quotes"] += len(live)
+
+        result = self._compute(symbol or "", live, timestamp)
+        if symbol is not None:
+            self._quotes[symbol] = {source: (price, timestamp) for source, price in live.items()}
+            self._results[symbol] = result
+        self._update_reliability(quotes, result)
+        return result
+
+    def _update_reliability(self, quotes: Dict[str, float], result: ConsensusResult):
+        """只更新本次报价的数据源的可靠性：入选记1，离群记0"""
+        alpha = self.reliability_alpha
+        for source in quotes:
+            if source in result.sources or source in result.outliers:
+                score = 0.0 if source in result.outliers else 1.0
+                self.reliability[source] = (1 - alpha) * self.reliability.get(source, 1.0) + alpha * score
+
+    def _recompute(self, symbol: str, now: float) -> ConsensusResult:
+        """按该品种各数据源的最新报价计算共识值"""
+        book = self._quotes.get(symbol, {})
+        live = {source: price for source, (price, ts) in book.items() if now - ts <= self.max_age_seconds}
+        result = self._compute(symbol, live, now)
+        self._results[symbol] = result
+        return result
+
+    def _compute(self, symbol: str, live: Dict[str, float], now: float) -> ConsensusResult:
+        """由一组报价计算共识值"""
+        if not live:
+            return ConsensusResult(symbol=symbol, value=None, updated_at=now)
+
+        # 离群判断：|价格 - 中位数| > 阈值 × MAD标准差（MAD有下限）
+        median = _median(list(live.values()))
+        mad = _median([abs(price - median) for price in live.values()]) * MAD_SCALE
+        scale = max(mad, abs(median) * self.min_spread)
+
+        inliers, outliers = {}, []
+        for source, price in live.items():
+            if len(live) >= 3 and abs(price - median) > self.mad_threshold * scale:
+                outliers.append(source)
+            else:
+                inliers[source] = price
+        self.stats["outliers"] += len(outliers)
+
+        weights = [max(self.min_reliability, self.reliability.get(source, 1.0)) for source in inliers]
+        prices = list(inliers.values())
+        value = weighted_median(prices, weights)
+
+        consistency = 0.0
+        if value:
+            total_weight = sum(weights)
+            deviation = sum(weight * abs(price - value) for price, weight in zip(prices, weights)) / total_weight
+            consistency = 1 - deviation / abs(value)
+
+        return ConsensusResult(
+            symbol=symbol,
+            value=value,
+            sources=list(inliers),
+            outliers=outliers,
+            consistency=consistency,
+            low=min(prices),
+            high=max(prices),
+            updated_at=now
+        )
+
+    def consensus(self, symbol: str = "default") -> Optional[ConsensusResult]:
+        """最近一次计算的共识结果（不重新计算）"""
+        return self._results.get(symbol)
+
+    def remove_source(self, source: str, symbol: Optional[str] = None):
+        """移除数据源的报价（symbol为None时移除所有品种）"""
+        symbols = [symbol] if symbol is not None else list(self._quotes)
+        for name in symbols:
+            if self._quotes.get(name, {}).pop(source, None) is not None:
+                self._recompute(name, time.time())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计"""
+        return {
+            "symbols": len(self._quotes),
+            "reliability": dict(self.reliability),
+            **self.stats
+        }
@@ -0,0 +1,253 @@
+"""
+按主机的异步限速器
+令牌桶控制请求速率，AIMD调整并发数，并遵循 Retry-After / X-RateLimit-* 响应头退避
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST_CONFIG = {
+    "rate": 5.0,  # 每秒请求数
+    "burst": 5,  # 令牌桶容量
+    "concurrency": 4,  # 初始并发数
+    "max_concurrency": 16,  # 并发数上限
+    "min_concurrency": 1  # 并发数下限
+}
+
+# 常用API的内置限额，可被配置中的 hosts 覆盖
+KNOWN_HOST_LIMITS = {
+    "api.github.com": {"rate": 0.5, "burst": 5, "concurrency": 2, "max_concurrency": 4},  # 搜索API约30次/分钟
+    "hacker-news.firebaseio.com": {"rate": 20.0, "burst": 20, "concurrency": 10, "max_concurrency": 32}
+}
+
+
+class TokenBucket:
+    """令牌桶"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        预订一个令牌
+
+        Returns:
+            需要等待的秒数（令牌不足时允许透支，后续请求顺延）
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class HostState:
+    """单个主机的限速状态"""
+
+    def __init__(self, host: str, config: Dict[str, Any]):
+        self.host = host
+        self.bucket = TokenBucket(config["rate"], config["burst"])
+        self.concurrency = config["concurrency"]
+        self.max_concurrency = config["max_concurrency"]
+        self.min_concurrency = config["min_concurrency"]
+
+        self.in_flight = 0
+        self.successes = 0  # 自上次调整以来的连续成功次数
+        self.backoff_level = 0  # 连续被限流次数
+        self.blocked_until = 0.0  # 单调时钟时间，之前不得发起请求
+        self.throttled = 0  # 累计被限流次数
+        self.rate_limit_remaining: Optional[int] = None
+
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop = None
+
+    def condition(self) -> asyncio.Condition:
+        """获取当前事件循环上的条件变量"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+
+class RateLimiter:
+    """按主机的异步限速器"""
+
+    def __init__(self, default: Optional[Dict[str, Any]] = None, hosts: Optional[Dict[str, Dict[str, Any]]] = None,
+                 base_backoff: float = 1.0, max_backoff: float = 300.0):
+        """
+        初始化限速器
+
+        Args:
+            default: 默认主机配置（rate / burst / concurrency / max_concurrency / min_concurrency）
+            hosts: 按主机名覆盖的配置
+            base_backoff: 被限流且没有 Retry-After 时的初始退避（秒），每次翻倍
+            max_backoff: 退避上限（秒）
+        """
+        self.default = {**DEFAULT_HOST_CONFIG, **(default or {})}
+        self.host_configs = {**KNOWN_HOST_LIMITS, **(hosts or {})}
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._hosts: Dict[str, HostState] = {}
+
+    def _state(self, host: str) -> HostState:
+        """获取主机状态"""
+        state = self._hosts.get(host)
+        if state is None:
+            config = {**self.default, **self.host_configs.get(host, {})}
+            state = self._hosts[host] = HostState(host, config)
+        return state
+
+    @asynccontextmanager
+    async def limit(self, host: str) -> AsyncIterator[None]:
+        """
+        在主机的速率、并发和退避约束下执行一次请求
+
+        Args:
+            host: 主机名
+        """
+        state = self._state(host)
+        condition = state.condition()
+
+        async with condition:
+            await condition.wait_for(lambda: state.in_flight < state.concurrency)
+            state.in_flight += 1
+
+        try:
+            # 先等待退避窗口结束，再按令牌桶节奏发起
+            blocked_for = state.blocked_until - time.monotonic()
+            if blocked_for > 0:
+                await asyncio.sleep(blocked_for)
+
+            wait = state.bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            yield
+        finally:
+            async with condition:
+                state.in_flight -= 1
+                condition.notify_all()
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """解析 Retry-After（秒数或HTTP日期）"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def feedback(self, host: str, status: int, headers: Dict[str, str]) -> Optional[float]:
+        """
+        根据响应调整主机限速状态
+
+        - 429/503：按 Retry-After 或指数退避暂停该主机，并发数减半（乘性减）
+        - X-RateLimit-Remaining 为0：暂停到 X-RateLimit-Reset（成功响应本身仍然有效，不需要重试）
+        - 成功：每累计“当前并发数”次成功，并发数加1（加性增）
+
+        Args:
+            host: 主机名
+            status: HTTP状态码
+            headers: 响应头
+
+        Returns:
+            本次请求被限流（429/503，或额度耗尽时的403）时返回重试前需要等待的秒数，否则返回 None
+        """
+        state = self._state(host)
+        headers = {name.lower(): value for name, value in headers.items()}
+        now = time.monotonic()
+        delay = None
+        throttled = status in (429, 503)
+
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.isdigit():
+            state.rate_limit_remaining = int(remaining)
+            reset = headers.get("x-ratelimit-reset")
+            if state.rate_limit_remaining == 0 and reset and reset.isdigit():
+                delay = max(0.0, int(reset) - time.time())
+
+        throttled = throttled or (status == 403 and state.rate_limit_remaining == 0)
+        if throttled:
+            retry_after = self._parse_retry_after(headers.get("retry-after"))
+            if retry_after is not None:
+                delay = retry_after
+            elif delay is None:
+                delay = min(self.max_backoff, self.base_backoff * (2 ** state.backoff_level))
+
+            state.backoff_level += 1
+            state.throttled += 1
+            state.successes = 0
+            state.concurrency = max(state.min_concurrency, state.concurrency // 2)
+            logger.warning(f"主机 {host} 限流 (HTTP {status})，退避 {delay:.1f} 秒，并发降为 {state.concurrency}")
+
+        elif status < 400:
+            state.backoff_level = 0
+            state.successes += 1
+            if state.successes >= state.concurrency and state.concurrency < state.max_concurrency:
+                state.concurrency += 1
+                state.successes = 0
+
+        if delay:
+            state.blocked_until = max(state.blocked_until, now + delay)
+        return delay if throttled else None
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取各主机限速状态"""
+        now = time.monotonic()
+        return {
+            host: {
+                "rate": state.bucket.rate,
+                "concurrency": state.concurrency,
+                "in_flight": state.in_flight,
+                "throttled": state.throttled,
+                "blocked_for": max(0.0, state.blocked_until - now),
+                "rate_limit_remaining": state.rate_limit_remaining
+            }
+            for host, state in self._hosts.items()
+        }
+
+
+# 进程内共享的默认限速器
+_default_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取共享限速器"""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = RateLimiter()
+    return _default_limiter
+
+
+def configure_rate_limiter(**options) -> RateLimiter:
+    """
+    按配置重建共享限速器
+
+    Args:
+        options: RateLimiter 构造参数（对应 data_collection.rate_limits）
+
+    Returns:
+        新的共享限速器
+    """
+    global _default_limiter
+    _default_limiter = RateLimiter(**options)
+    return _default_limiter
@@ -0,0 +1,195 @@
+"""
+实时数据发布/订阅总线
+每个订阅者拥有独立的有界队列和分发任务，慢订阅者不会拖慢发布方和其他订阅者
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# 队列满时的处理策略
+DROP_OLDEST = "drop_oldest"  # 丢弃最早的消息
+BLOCK = "block"  # 发布方等待队列有空位（对该订阅者施加背压）
+COALESCE = "coalesce"  # 用新消息覆盖队尾消息，只保证送达最新值
+
+POLICIES = (DROP_OLDEST, BLOCK, COALESCE)
+
+
+class Subscription:
+    """订阅"""
+
+    def __init__(self, topic: str, callback: Callable, maxsize: int = 100,
+                 policy: str = DROP_OLDEST, name: Optional[str] = None):
+        """
+        初始化订阅
+
+        Args:
+            topic: 订阅主题（数据类型）
+            callback: 回调 callback(topic, data)，可以是普通函数或协程函数
+            maxsize: 队列容量
+            policy: 队列满时的处理策略 (drop_oldest / block / coalesce)
+            name: 订阅者名称，用于统计
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"未知的队列策略: {policy}")
+
+        self.topic = topic
+        self.callback = callback
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+
+        self._items: deque = deque()  # (入队时间, 数据)
+        self._not_empty: Optional[asyncio.Event] = None
+        self._not_full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0, "coalesced": 0, "errors": 0,
+                      "last_lag_ms": 0.0, "max_lag_ms": 0.0, "total_lag_ms": 0.0}
+
+    def _ensure_dispatcher(self):
+        """确保当前事件循环上有分发任务在运行"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+            self._not_full.set()
+            self._loop = loop
+            self._task = None
+            if self._items:
+                self._not_empty.set()
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._dispatch())
+
+    async def put(self, data: Any):
+        """按队列策略加入一条消息"""
+        self._ensure_dispatcher()
+        self.stats["published"] += 1
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == DROP_OLDEST:
+                self._items.popleft()
+                self.stats["dropped"] += 1
+            elif self.policy == COALESCE:
+                self._items.pop()
+                self.stats["coalesced"] += 1
+            else:
+                while len(self._items) >= self.maxsize:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+
+        self._items.append((time.monotonic(), data))
+        self._not_empty.set()
+
+    async def _dispatch(self):
+        """分发循环：逐条取出消息并调用回调"""
+        while True:
+            if not self._items:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+
+            enqueued_at, data = self._items.popleft()
+            self._not_full.set()
+
+            lag_ms = (time.monotonic() - enqueued_at) * 1000
+            self.stats["last_lag_ms"] = lag_ms
+            self.stats["max_lag_ms"] = max(self.stats["max_lag_ms"], lag_ms)
+            self.stats["total_lag_ms"] += lag_ms
+
+            try:
+                result = self.callback(self.topic, data)
+                if inspect.isawaitable(result):
+                    await result
+                self.stats["delivered"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"通知订阅者失败: {self.name} - {e}")
+
+    def stop(self):
+        """停止分发任务（未送达的消息保留，下次发布时继续分发）"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取订阅统计"""
+        handled = self.stats["delivered"] + self.stats["errors"]
+        return {
+            "topic": self.topic,
+            "name": self.name,
+            "policy": self.policy,
+            "queue_size": len(self._items),
+            "maxsize": self.maxsize,
+            "avg_lag_ms": self.stats["total_lag_ms"] / handled if handled else 0.0,
+            **self.stats
+        }
+
+
+class RealtimeBus:
+    """发布/订阅总线"""
+
+    def __init__(self):
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+
+    def subscribe(self, topic: str, callback: Callable, maxsize: int = 100,
+                  policy: str = DROP_OLDEST, name: Optional[str] = None) -> Subscription:
+        """
+        订阅主题
+
+        Args:
+            topic: 主题（数据类型）
+            callback: 回调 callback(topic, data)
+            maxsize: 该订阅者的队列容量
+            policy: 队列满时的处理策略 (drop_oldest / block / coalesce)
+            name: 订阅者名称
+
+        Returns:
+            订阅对象，可用于取消订阅和查看统计
+        """
+        subscription = Subscription(topic, callback, maxsize, policy, name)
+        self._subscriptions.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """取消订阅"""
+        subscription.stop()
+        subscriptions = self._subscriptions.get(subscription.topic, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+
+    async def publish(self, topic: str, data: Any):
+        """
+        发布消息；只有使用 block 策略且队列已满的订阅者会让发布方等待
+
+        Args:
+            topic: 主题
+            data: 消息
+        """
+        for subscription in list(self._subscriptions.get(topic, ())):
+            await subscription.put(data)
+
+    def subscriber_count(self) -> int:
+        """订阅者总数"""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def close(self):
+        """停止所有分发任务"""
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.stop()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """获取所有订阅者的统计"""
+        return [subscription.get_stats()
+                for subscriptions in self._subscriptions.values()
+                for subscription in subscriptions]
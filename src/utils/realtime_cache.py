@@ -0,0 +1,318 @@
+"""
+实时数据缓存
+按 (数据类型, 数据源, 参数) 缓存，条目带TTL，按条目数和估算内存上限做LRU淘汰
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Hashable
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+logger = logging.getLogger(__name__)
+
+# 快照文件头：魔数 + 格式标记（m = msgpack，j = zlib压缩的JSON）
+SNAPSHOT_MAGIC = b"RTC1"
+
+CacheKey = Tuple[str, str, Tuple]
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    估算对象占用的内存字节数（递归计算容器内容，深度超过32层的部分忽略）
+
+    Args:
+        value: 对象
+
+    Returns:
+        估算字节数
+    """
+    size = sys.getsizeof(value)
+    if _depth > 32:
+        return size
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, _depth + 1) + estimate_size(item, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+def _thaw_key(value: Any) -> Any:
+    """把反序列化得到的列表还原为缓存键使用的元组"""
+    if isinstance(value, list):
+        return tuple(_thaw_key(item) for item in value)
+    return value
+
+
+def _freeze(value: Any) -> Hashable:
+    """把参数转换为可哈希、与顺序无关的形式"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+class CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ("key", "value", "stored_at", "expires_at", "size")
+
+    def __init__(self, key: CacheKey, value: Any, ttl: float, size: int, age: float = 0.0):
+        self.key = key
+        self.value = value
+        self.stored_at = time.monotonic() - age
+        self.expires_at = self.stored_at + ttl
+        self.size = size
+
+    @property
+    def expired(self) -> bool:
+        """是否已超过TTL"""
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def age(self) -> float:
+        """写入后经过的秒数"""
+        return time.monotonic() - self.stored_at
+
+
+class RealTimeCache:
+    """带TTL和内存统计的LRU缓存"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 估算内存上限（字节）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        # 数据类型 -> 该类型的键（按写入顺序，最后一个为最近写入），删除最近写入的键后回退到前一个
+        self._by_type: Dict[str, "OrderedDict[CacheKey, None]"] = {}
+        self.total_bytes = 0
+        self._last_sweep = 0.0
+
+        self.stats = {"hits": 0, "misses": 0, "stale_hits": 0, "sets": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def make_key(data_type: str, source: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        """
+        构建缓存键
+
+        Args:
+            data_type: 数据类型
+            source: 数据源名称
+            params: 请求参数（与键值顺序无关）
+        """
+        return data_type, source or "", _freeze(params or {})
+
+    def set(self, key: CacheKey, value: Any, ttl: float, age: float = 0.0) -> CacheEntry:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键（make_key 的返回值）
+            value: 缓存值
+            ttl: 有效期（秒）
+            age: 数据写入时已有的年龄（秒），从快照恢复时使用
+
+        Returns:
+            新的缓存条目
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old.size
+
+        entry = CacheEntry(key, value, ttl, estimate_size(value), age)
+        self._entries[key] = entry
+        self.total_bytes += entry.size
+        keys = self._by_type.setdefault(key[0], OrderedDict())
+        keys[key] = None
+        keys.move_to_end(key)
+        self.stats["sets"] += 1
+
+        self._evict()
+        return entry
+
+    def get_entry(self, key: CacheKey, allow_expired: bool = False) -> Optional[CacheEntry]:
+        """
+        读取缓存条目
+
+        Args:
+            key: 缓存键
+            allow_expired: 是否返回已过期的条目（用于数据源全部失败时的兜底）
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        if entry.expired:
+            if not allow_expired:
+                self.stats["misses"] += 1
+                return None
+            self.stats["stale_hits"] += 1
+        else:
+            self.stats["hits"] += 1
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        """读取未过期的缓存值"""
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else default
+
+    def latest_entry(self, data_type: str, allow_expired: bool = False) -> Optional[CacheEntry]:
+        """读取某数据类型最近写入的缓存条目（不区分数据源和参数）"""
+        keys = self._by_type.get(data_type)
+        key = next(reversed(keys)) if keys else None
+        if key is None:
+            self.stats["misses"] += 1
+            return None
+        return self.get_entry(key, allow_expired)
+
+    def delete(self, key: CacheKey) -> bool:
+        """删除缓存条目"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        self.total_bytes -= entry.size
+        keys = self._by_type.get(key[0])
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self._by_type[key[0]]
+        return True
+
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+        self._by_type.clear()
+        self.total_bytes = 0
+
+    def _evict(self):
+        """超出上限时先淘汰已过期的条目（全量扫描每秒最多一次），再按LRU顺序淘汰"""
+        if len(self._entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return
+
+        now = time.monotonic()
+        if now - self._last_sweep >= 1.0:
+            self._last_sweep = now
+            for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+                self.delete(key)
+                self.stats["expirations"] += 1
+
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self.delete(key)
+            self.stats["evictions"] += 1
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        把缓存写入快照文件（按写入顺序保存，记录墙上时钟的写入时间）
+
+        Args:
+            path: 快照路径
+
+        Returns:
+            写入的条目数
+        """
+        now_wall, now_mono = time.time(), time.monotonic()
+        latest = {next(reversed(keys)) for keys in self._by_type.values()}
+
+        # 各数据类型最近写入的条目放在最后，恢复时 latest 指向不变
+        entries = sorted(self._entries.values(), key=lambda entry: (entry.key in latest, entry.stored_at))
+        records = [
+            [list(entry.key), entry.value, now_wall - (now_mono - entry.stored_at), entry.expires_at - entry.stored_at]
+            for entry in entries
+        ]
+
+        if HAS_MSGPACK:
+            payload = b"m" + msgpack.packb(records, default=str, use_bin_type=True)
+        else:
+            payload = b"j" + zlib.compress(json.dumps(records, ensure_ascii=False, default=str,
+                                                      separators=(",", ":")).encode("utf-8"))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + payload)
+        os.replace(tmp_path, path)
+        return len(records)
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        从快照文件恢复缓存，条目保留原始写入时间（已过期的条目仍可通过 allow_expired 读取）
+
+        Args:
+            path: 快照路径
+
+        Returns:
+            恢复的条目数
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError("不是有效的缓存快照文件")
+
+        fmt, payload = data[len(SNAPSHOT_MAGIC):len(SNAPSHOT_MAGIC) + 1], data[len(SNAPSHOT_MAGIC) + 1:]
+        if fmt == b"m":
+            if not HAS_MSGPACK:
+                raise ValueError("快照为msgpack格式，但未安装msgpack")
+            records = msgpack.unpackb(payload, raw=False)
+        else:
+            records = json.loads(zlib.decompress(payload).decode("utf-8"))
+
+        now_wall = time.time()
+        for key, value, stored_at_wall, ttl in records:
+            self.set(_thaw_key(key), value, ttl, age=max(0.0, now_wall - stored_at_wall))
+        return len(records)
+
+    def entries(self):
+        """遍历所有缓存条目（不影响LRU顺序和命中统计）"""
+        return list(self._entries.values())
+
+    def data_types(self):
+        """有缓存数据的数据类型"""
+        return list(self._by_type)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["stale_hits"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            **self.stats
+        }
@@ -0,0 +1,204 @@
+"""
+WebSocket推送数据源
+维持长连接，断线后自动重连并重新订阅，把推送的行情转换为与REST接口相同的格式交给回调
+"""
+
+import abc
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+import aiohttp
+
+from .http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# 回调参数：(数据类型, 数据源名称, 与REST接口格式一致的数据)
+UpdateCallback = Callable[[str, str, Dict[str, Any]], Awaitable[None]]
+
+
+class StreamingSource(abc.ABC):
+    """WebSocket推送数据源基类"""
+
+    name = "stream"
+    default_url = ""
+
+    def __init__(self, data_type: str, symbols: List[str], on_update: UpdateCallback,
+                 url: Optional[str] = None, reconnect_delay: float = 1.0, max_reconnect_delay: float = 60.0,
+                 heartbeat: float = 30.0):
+        """
+        初始化推送数据源
+
+        Args:
+            data_type: 推送数据对应的数据类型
+            symbols: 订阅的品种
+            on_update: 收到更新时的回调
+            url: WebSocket地址，默认使用交易所公开地址（测试时可指向本地服务器）
+            reconnect_delay: 首次重连等待（秒），连续失败时翻倍
+            max_reconnect_delay: 重连等待上限（秒）
+            heartbeat: ping间隔（秒）
+        """
+        self.data_type = data_type
+        self.symbols = list(symbols)
+        self.on_update = on_update
+        self.url = url or self.default_url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.heartbeat = heartbeat
+
+        self.connected = False
+        self.last_update_at: Optional[float] = None  # 单调时钟
+        self._task: Optional[asyncio.Task] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+
+        self.stats = {"connects": 0, "disconnects": 0, "messages": 0, "updates": 0, "errors": 0}
+
+    @abc.abstractmethod
+    def subscribe_messages(self) -> List[Dict[str, Any]]:
+        """连接建立后发送的订阅消息"""
+        pass
+
+    @abc.abstractmethod
+    def parse_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        解析推送消息
+
+        Returns:
+            与REST接口格式一致的数据，非行情消息（订阅确认、心跳等）返回None
+        """
+        pass
+
+    async def _session(self):
+        """一次连接的生命周期：连接、订阅、接收消息，连接断开时返回"""
+        self._ws = await get_http_client().ws_connect(self.url, heartbeat=self.heartbeat)
+        try:
+            self.connected = True
+            self.stats["connects"] += 1
+            logger.info(f"推送数据源已连接: {self.name} ({self.url})")
+
+            for message in self.subscribe_messages():
+                await self._ws.send_json(message)
+
+            async for msg in self._ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        raise self._ws.exception() or ConnectionError("WebSocket错误")
+                    continue
+
+                self.stats["messages"] += 1
+                try:
+                    payload = self.parse_message(json.loads(msg.data))
+                except (ValueError, KeyError, TypeError) as e:
+                    self.stats["errors"] += 1
+                    logger.debug(f"解析推送消息失败: {self.name} - {e}")
+                    continue
+
+                if payload is not None:
+                    self.stats["updates"] += 1
+                    self.last_update_at = time.monotonic()
+                    await self.on_update(self.data_type, self.name, payload)
+        finally:
+            # 只统计建立成功的连接的断开，连接失败计入 errors
+            self.connected = False
+            self.stats["disconnects"] += 1
+            await self._ws.close()
+            self._ws = None
+
+    async def run(self):
+        """保持连接：断线后按指数退避（带抖动）重连并重新订阅"""
+        delay = self.reconnect_delay
+        while True:
+            started = time.monotonic()
+            try:
+                await self._session()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"推送数据源连接失败: {self.name} - {e}")
+
+            # 连接保持过一段时间说明不是持续性故障，重置退避
+            if time.monotonic() - started > self.max_reconnect_delay:
+                delay = self.reconnect_delay
+
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(self.max_reconnect_delay, delay * 2)
+
+    def start(self) -> asyncio.Task:
+        """在后台启动"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        """停止并关闭连接"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def is_live(self, max_silence: float) -> bool:
+        """连接正常且最近 max_silence 秒内收到过更新"""
+        return (self.connected and self.last_update_at is not None
+                and time.monotonic() - self.last_update_at <= max_silence)
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取连接状态"""
+        return {
+            "data_type": self.data_type,
+            "url": self.url,
+            "symbols": self.symbols,
+            "connected": self.connected,
+            "seconds_since_update": time.monotonic() - self.last_update_at if self.last_update_at else None,
+            **self.stats
+        }
+
+
+class BinanceTickerStream(StreamingSource):
+    """Binance 24小时行情推送"""
+
+    name = "binance"
+    default_url = "wss://stream.binance.com:9443/ws"
+
+    def subscribe_messages(self) -> List[Dict[str, Any]]:
+        return [{
+            "method": "SUBSCRIBE",
+            "params": [f"{symbol.lower()}@ticker" for symbol in self.symbols],
+            "id": 1
+        }]
+
+    def parse_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if message.get("e") != "24hrTicker":
+            return None
+        # 与 /api/v3/ticker/price 的返回格式一致
+        return {"symbol": message["s"], "price": message["c"]}
+
+
+class CoinbaseTickerStream(StreamingSource):
+    """Coinbase 行情推送"""
+
+    name = "coinbase"
+    default_url = "wss://ws-feed.exchange.coinbase.com"
+
+    def subscribe_messages(self) -> List[Dict[str, Any]]:
+        return [{"type": "subscribe", "product_ids": self.symbols, "channels": ["ticker"]}]
+
+    def parse_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if message.get("type") != "ticker":
+            return None
+        base, currency = message["product_id"].split("-", 1)
+        # 与 /v2/prices/{product}/spot 的返回格式一致
+        return {"data": {"base": base, "currency": currency, "amount": message["price"]}}
+
+
+STREAM_TYPES = {
+    BinanceTickerStream.name: BinanceTickerStream,
+    CoinbaseTickerStream.name: CoinbaseTickerStream
+}
@@ -0,0 +1,181 @@
+"""
+实时行情环形缓冲区
+基于NumPy的定长时间序列缓冲（时间戳列 + 数值列），O(1)追加，窗口统计向量化计算
+"""
+
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+class TickBuffer:
+    """
+    定长环形缓冲区
+
+    每个值同时写入位置 i 和 i + capacity，因此最近 n 个值始终是底层数组中的一段连续切片，
+    读取窗口时无需拷贝即可得到按时间顺序排列的视图
+    """
+
+    def __init__(self, capacity: int = 10000):
+        """
+        初始化缓冲区
+
+        Args:
+            capacity: 保留的最大数据点数
+        """
+        if capacity <= 0:
+            raise ValueError("capacity必须大于0")
+
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity * 2, dtype=np.float64)
+        self._values = np.zeros(capacity * 2, dtype=np.float64)
+        self._next = 0  # 下一个写入位置（0 ~ capacity-1）
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        """最新数据点的时间戳"""
+        if not self._count:
+            return None
+        return float(self._timestamps[self._next - 1 + self.capacity])
+
+    @property
+    def last_value(self) -> Optional[float]:
+        """最新数据点的值"""
+        if not self._count:
+            return None
+        return float(self._values[self._next - 1 + self.capacity])
+
+    def append(self, timestamp: float, value: float):
+        """
+        追加一个数据点
+
+        Args:
+            timestamp: Unix时间戳（秒），应单调不减
+            value: 数值
+        """
+        index = self._next
+        self._timestamps[index] = self._timestamps[index + self.capacity] = timestamp
+        self._values[index] = self._values[index + self.capacity] = value
+
+        self._next = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, timestamps, values):
+        """
+        批量追加数据点
+
+        Args:
+            timestamps: 时间戳序列
+            values: 数值序列
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)[-self.capacity:]
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps与values长度不一致")
+
+        # 按环形位置分段写入（至多两段），镜像区同步写入
+        n = len(timestamps)
+        first = min(n, self.capacity - self._next)
+        for start, length, offset in ((self._next, first, 0), (0, n - first, first)):
+            if length:
+                for column, source in ((self._timestamps, timestamps), (self._values, values)):
+                    column[start:start + length] = source[offset:offset + length]
+                    column[start + self.capacity:start + self.capacity + length] = source[offset:offset + length]
+
+        self._next = (self._next + n) % self.capacity
+        self._count = min(self.capacity, self._count + n)
+
+    def view(self, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        最近 count 个数据点的只读视图（不拷贝）
+
+        Args:
+            count: 数据点数，默认全部
+
+        Returns:
+            (时间戳数组, 数值数组)，按时间顺序排列
+        """
+        count = self._count if count is None else min(count, self._count)
+        end = self._next + self.capacity
+        timestamps = self._timestamps[end - count:end]
+        values = self._values[end - count:end]
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+        return timestamps, values
+
+    def window(self, seconds: Optional[float] = None, count: Optional[int] = None,
+               now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按时间或数量截取窗口视图
+
+        Args:
+            seconds: 时间窗口长度（秒），以 now（默认最新数据点时间）为终点
+            count: 最多数据点数
+            now: 时间窗口终点
+
+        Returns:
+            (时间戳数组, 数值数组)
+        """
+        timestamps, values = self.view(count)
+        if seconds is not None and len(timestamps):
+            end = timestamps[-1] if now is None else now
+            start = np.searchsorted(timestamps, end - seconds, side="left")
+            timestamps, values = timestamps[start:], values[start:]
+        return timestamps, values
+
+    def rolling_mean(self, window: int, count: Optional[int] = None) -> np.ndarray:
+        """
+        滚动均值
+
+        Args:
+            window: 滚动窗口数据点数
+            count: 参与计算的最近数据点数，默认全部
+
+        Returns:
+            长度为 n - window + 1 的数组
+        """
+        _, values = self.view(count)
+        if window <= 0 or len(values) < window:
+            return np.empty(0)
+        cumsum = np.cumsum(np.concatenate(([0.0], values)))
+        return (cumsum[window:] - cumsum[:-window]) / window
+
+    def stats(self, seconds: Optional[float] = None, count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        窗口统计
+
+        Args:
+            seconds: 时间窗口长度（秒）
+            count: 最多数据点数
+
+        Returns:
+            数据点数、首末值、均值、最小/最大值、涨跌幅和波动率（对数收益率标准差）
+        """
+        timestamps, values = self.window(seconds, count)
+        n = len(values)
+        if not n:
+            return {"count": 0}
+
+        first, last = float(values[0]), float(values[-1])
+        volatility = 0.0
+        if n > 2 and np.all(values > 0):
+            volatility = float(np.std(np.diff(np.log(values)), ddof=1))
+
+        return {
+            "count": n,
+            "start_time": float(timestamps[0]),
+            "end_time": float(timestamps[-1]),
+            "first": first,
+            "last": last,
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "change": last - first,
+            "change_percent": (last - first) / first * 100 if first else 0.0,
+            "volatility": volatility
+        }
@@ -0,0 +1,38 @@
+"""
+时间戳工具函数
+datetime 与 (Unix时间戳, UTC偏移) 之间的转换，带时区的时间往返后时区不丢失，无时区的时间仍按本地时间处理
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+
+def split_datetime(value: datetime) -> Tuple[float, Optional[float]]:
+    """
+    拆分为Unix时间戳和UTC偏移
+
+    Args:
+        value: 时间（可以带时区）
+
+    Returns:
+        (时间戳, UTC偏移秒数)，无时区的时间偏移为None
+    """
+    offset = value.utcoffset()
+    return value.timestamp(), offset.total_seconds() if offset is not None else None
+
+
+def join_datetime(timestamp: float, offset: Optional[float]) -> datetime:
+    """
+    由Unix时间戳和UTC偏移还原时间（split_datetime 的逆操作）
+
+    Args:
+        timestamp: Unix时间戳
+        offset: UTC偏移秒数，None表示无时区的本地时间
+
+    Returns:
+        时间，offset 为0时时区为 timezone.utc
+    """
+    if offset is None:
+        return datetime.fromtimestamp(timestamp)
+    tz = timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+    return datetime.fromtimestamp(timestamp, tz=tz)
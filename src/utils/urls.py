@@ -0,0 +1,64 @@
+"""
+URL工具函数
+"""
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 不影响内容的跟踪参数
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "spm", "share", "via"
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化URL，使同一内容的不同写法得到相同结果
+
+    - scheme 统一为 https，主机名小写并去掉 www. 前缀和默认端口
+    - 去掉 utm_* 等跟踪参数，其余查询参数排序
+    - 去掉片段和路径末尾的斜杠
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL，无法解析时返回去除首尾空白的原始URL
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    if not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    if scheme in DEFAULT_PORTS:
+        scheme = "https"
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
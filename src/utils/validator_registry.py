@@ -0,0 +1,227 @@
+"""
+验证器注册表
+按数据类型注册检查函数，编译为按成本和选择性排序的检查流水线，记录每项检查的耗时和失败率
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 检查函数：check(context) -> 问题描述（None / 字符串 / 字符串列表，空表示通过）
+CheckFunc = Callable[[Dict[str, Any]], Union[None, str, List[str]]]
+
+
+@dataclass
+class CheckSpec:
+    """检查项声明"""
+    name: str
+    func: CheckFunc
+    cost: float = 1.0  # 相对成本
+    selectivity: float = 0.1  # 预估失败概率
+    fatal: bool = False  # 失败后不再执行后续检查
+    requires: Tuple[str, ...] = ()  # 需要先执行的检查（如提取数据）
+
+
+def order_checks(specs: Iterable[CheckSpec], stats: Optional[Dict[str, Dict[str, float]]] = None) -> List[CheckSpec]:
+    """
+    排列检查顺序：按 成本 / 失败概率 从小到大（最便宜、最可能失败的检查先执行），同时满足依赖关系
+
+    Args:
+        specs: 检查项
+        stats: 实测统计（检查名 -> {calls, failures, total_ms}），有样本时代替声明的成本和失败概率
+    """
+    def score(spec: CheckSpec) -> float:
+        cost, selectivity = spec.cost, spec.selectivity
+        observed = (stats or {}).get(spec.name)
+        if observed and observed["calls"] >= 100:
+            cost = observed["total_ms"] / observed["calls"]
+            selectivity = observed["failures"] / observed["calls"]
+        return cost / max(selectivity, 0.01)
+
+    specs = sorted(specs, key=score)
+    by_name = {spec.name: spec for spec in specs}
+    ordered: List[CheckSpec] = []
+    placed = set()
+
+    def place(spec: CheckSpec, path: Tuple[str, ...]):
+        if spec.name in placed:
+            return
+        if spec.name in path:
+            raise ValueError(f"检查项存在循环依赖: {' -> '.join(path + (spec.name,))}")
+        # 依赖项紧接在需要它的检查之前执行
+        for name in spec.requires:
+            if name in by_name:
+                place(by_name[name], path + (spec.name,))
+        ordered.append(spec)
+        placed.add(spec.name)
+
+    for spec in specs:
+        place(spec, ())
+    return ordered
+
+
+class ValidationPipeline:
+    """编译后的检查流水线"""
+
+    def __init__(self, data_type: str, specs: List[CheckSpec], short_circuit: bool = False,
+                 reorder_interval: int = 1000):
+        """
+        初始化流水线
+
+        Args:
+            data_type: 数据类型
+            specs: 检查项
+            short_circuit: 任一检查失败即停止（否则只有 fatal 检查失败时停止，其余问题全部收集）
+            reorder_interval: 短路模式下每执行该次数后按实测成本和失败率重新排序，0表示不重排
+        """
+        self.data_type = data_type
+        self.specs = list(specs)
+        self.short_circuit = short_circuit
+        self.reorder_interval = reorder_interval
+
+        self.runs = 0
+        self.stats: Dict[str, Dict[str, float]] = {
+            spec.name: {"calls": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0} for spec in self.specs
+        }
+        self._compile()
+
+    def _compile(self):
+        """按当前统计排列检查顺序，生成执行用的元组"""
+        ordered = order_checks(self.specs, self.stats)
+        self._steps = tuple(
+            (spec.name, spec.func, spec.fatal or self.short_circuit, self.stats[spec.name]) for spec in ordered
+        )
+
+    @property
+    def order(self) -> List[str]:
+        """当前的检查顺序"""
+        return [name for name, _, _, _ in self._steps]
+
+    def run(self, context: Dict[str, Any]) -> List[str]:
+        """
+        依次执行检查
+
+        Args:
+            context: 检查上下文，检查函数可以读写其中的数据
+
+        Returns:
+            问题描述列表，为空表示全部通过
+        """
+        issues: List[str] = []
+        perf_counter = time.perf_counter
+
+        for name, func, stop_on_failure, stats in self._steps:
+            started = perf_counter()
+            found = func(context)
+            elapsed_ms = (perf_counter() - started) * 1000
+
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            if elapsed_ms > stats["max_ms"]:
+                stats["max_ms"] = elapsed_ms
+
+            if found:
+                stats["failures"] += 1
+                if isinstance(found, str):
+                    issues.append(found)
+                else:
+                    issues.extend(found)
+                if stop_on_failure:
+                    break
+
+        self.runs += 1
+        if self.short_circuit and self.reorder_interval and self.runs % self.reorder_interval == 0:
+            self._compile()
+        return issues
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各检查的调用次数、失败率和耗时"""
+        checks = {}
+        for name in self.order:
+            stats = self.stats[name]
+            calls = stats["calls"]
+            checks[name] = {
+                "calls": calls,
+                "failure_rate": stats["failures"] / calls if calls else 0.0,
+                "avg_ms": stats["total_ms"] / calls if calls else 0.0,
+                "max_ms": stats["max_ms"]
+            }
+        return {"runs": self.runs, "short_circuit": self.short_circuit, "order": self.order, "checks": checks}
+
+
+class ValidatorRegistry:
+    """验证器注册表"""
+
+    def __init__(self):
+        self._checks: Dict[str, Dict[str, CheckSpec]] = {}
+        self._pipelines: Dict[str, ValidationPipeline] = {}
+
+    def register(self, data_type: str, name: str, func: CheckFunc, cost: float = 1.0, selectivity: float = 0.1,
+                 fatal: bool = False, requires: Iterable[str] = ()):
+        """
+        注册检查项（同名检查项会被替换）
+
+        Args:
+            data_type: 数据类型
+            name: 检查名称，与验证配置中的 required_checks 对应
+            func: 检查函数
+            cost: 相对成本
+            selectivity: 预估失败概率
+            fatal: 失败后不再执行后续检查
+            requires: 依赖的检查（即使未在 required_checks 中列出也会执行）
+        """
+        self._checks.setdefault(data_type, {})[name] = CheckSpec(name, func, cost, selectivity, fatal,
+                                                                 tuple(requires))
+        self._pipelines.pop(data_type, None)
+
+    def compile(self, data_type: str, required_checks: Optional[Iterable[str]] = None,
+                short_circuit: bool = False) -> ValidationPipeline:
+        """
+        编译数据类型的检查流水线（结果会被缓存，直到该类型注册新的检查项）
+
+        Args:
+            data_type: 数据类型
+            required_checks: 需要执行的检查，None表示全部；依赖的检查自动加入
+            short_circuit: 任一检查失败即停止
+
+        Returns:
+            检查流水线
+        """
+        checks = self._checks.get(data_type)
+        if not checks:
+            raise KeyError(f"未注册验证器的数据类型: {data_type}")
+
+        names = list(checks) if required_checks is None else list(required_checks)
+        unknown = [name for name in names if name not in checks]
+        if unknown:
+            raise KeyError(f"{data_type} 未注册的检查项: {', '.join(unknown)}")
+
+        selected: Dict[str, CheckSpec] = {}
+        while names:
+            name = names.pop()
+            if name not in selected:
+                selected[name] = checks[name]
+                names.extend(dep for dep in checks[name].requires if dep in checks)
+
+        pipeline = ValidationPipeline(data_type, list(selected.values()), short_circuit)
+        self._pipelines[data_type] = pipeline
+        logger.debug(f"编译验证流水线: {data_type} -> {pipeline.order}")
+        return pipeline
+
+    def pipeline(self, data_type: str) -> Optional[ValidationPipeline]:
+        """已编译的流水线"""
+        return self._pipelines.get(data_type)
+
+    def data_types(self) -> List[str]:
+        """已注册验证器的数据类型"""
+        return list(self._checks)
+
+    def __contains__(self, data_type: str) -> bool:
+        return data_type in self._checks
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取所有已编译流水线的统计"""
+        return {data_type: pipeline.get_stats() for data_type, pipeline in self._pipelines.items()}
@@ -0,0 +1,24 @@
+"""测试用的本地HTTP/WebSocket服务器"""
+
+from aiohttp import web
+
+
+class LocalServer:
+    """在 127.0.0.1 的随机端口上运行 aiohttp 应用"""
+
+    def __init__(self, app: web.Application):
+        self.app = app
+        self.runner = None
+        self.url = None
+
+    async def __aenter__(self) -> "LocalServer":
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
@@ -0,0 +1,41 @@
+import pytest
+
+from src.utils import realtime_cache
+from src.utils.realtime_cache import RealTimeCache
+
+
+@pytest.fixture(params=[True, False], ids=["msgpack", "json"])
+def use_msgpack(request, monkeypatch):
+    if request.param and not realtime_cache.HAS_MSGPACK:
+        pytest.skip("msgpack not installed")
+    monkeypatch.setattr(realtime_cache, "HAS_MSGPACK", request.param)
+    return request.param
+
+
+def test_snapshot_round_trip_keeps_keys_ages_and_latest(tmp_path, use_msgpack):
+    path = str(tmp_path / "snap" / "cache.snapshot")
+    cache = RealTimeCache()
+    cache.set(cache.make_key("quotes", "yahoo", {"symbols": "AAPL"}), {"price": 1.5}, ttl=60, age=10)
+    cache.set(cache.make_key("quotes", "investing"), {"price": 1.6}, ttl=60)
+    cache.set(cache.make_key("news", "rss"), ["a", "b"], ttl=5, age=30)
+    cache.get(cache.make_key("quotes", "yahoo", {"symbols": "AAPL"}))  # LRU顺序不应影响 latest
+
+    assert cache.save_snapshot(path) == 3
+
+    restored = RealTimeCache()
+    assert restored.load_snapshot(path) == 3
+
+    entry = restored.get_entry(restored.make_key("quotes", "yahoo", {"symbols": "AAPL"}))
+    assert entry.value == {"price": 1.5}
+    assert entry.age == pytest.approx(10, abs=1)
+    assert restored.latest_entry("quotes").value == {"price": 1.6}
+
+    news = restored.latest_entry("news", allow_expired=True)
+    assert news.expired and news.value == ["a", "b"]
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path):
+    path = tmp_path / "bogus"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        RealTimeCache().load_snapshot(str(path))
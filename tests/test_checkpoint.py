@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+
+from src.collectors.base_collector import ExampleCollector
+from src.collectors.checkpoint import CollectorCheckpoint
+
+
+def test_commit_persists_seen_items_and_high_water(tmp_path):
+    checkpoint = CollectorCheckpoint("c", str(tmp_path))
+    assert checkpoint.is_new("a", "v1")
+
+    checkpoint.mark("a", "v1", datetime(2026, 1, 2), scope="feed")
+    checkpoint.mark("b", "v1", datetime(2026, 1, 1), scope="feed")
+    assert not checkpoint.is_new("a", "v1")
+    assert checkpoint.get_high_water("feed") == datetime(2026, 1, 2)
+    checkpoint.commit()
+
+    reloaded = CollectorCheckpoint("c", str(tmp_path))
+    assert not reloaded.is_new("a", "v1")
+    assert reloaded.is_new("a", "v2")  # 版本变化视为已变化的项目
+    assert reloaded.get_status()["high_water"] == {"feed": "2026-01-02T00:00:00"}
+
+
+def test_rollback_discards_pending_changes(tmp_path):
+    checkpoint = CollectorCheckpoint("c", str(tmp_path))
+    checkpoint.mark("a", "v1", datetime(2026, 1, 2))
+    checkpoint.rollback()
+
+    assert checkpoint.is_new("a", "v1")
+    assert checkpoint.get_high_water() is None
+    assert not (tmp_path / "c.json").exists()
+
+
+def test_seen_items_are_capped(tmp_path):
+    checkpoint = CollectorCheckpoint("c", str(tmp_path), max_seen=2)
+    for key in "abc":
+        checkpoint.mark(key)
+    checkpoint.commit()
+
+    assert list(checkpoint.seen) == ["b", "c"]
+    assert checkpoint.is_new("a")
+
+
+def test_collector_only_emits_new_items_after_a_completed_run(tmp_path):
+    config = {"api_url": "http://example.com", "checkpoint_dir": str(tmp_path)}
+
+    class Incremental(ExampleCollector):
+        async def collect_stream(self):
+            async for item in super().collect_stream():
+                if self._is_new_item(item.url):
+                    yield item
+
+    assert len(asyncio.run(Incremental("inc", config).run())) == 3
+    assert asyncio.run(Incremental("inc", config).run()) == []
+
+    # 中途停止的运行不提交检查点
+    async def first_only():
+        stream = Incremental("partial", config).run_stream()
+        async for item in stream:
+            await stream.aclose()
+            return item
+
+    asyncio.run(first_only())
+    assert len(asyncio.run(Incremental("partial", config).run())) == 3
@@ -0,0 +1,111 @@
+import json
+import pickle
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.collectors import base_collector
+from src.collectors.base_collector import CollectedItem
+from src.collectors.item_batch import CollectedItemBatch
+
+
+def make_item(i=0, source_type="news", published_at=datetime(2026, 1, 2, 3, 4, 5), raw_data=None):
+    return CollectedItem(source="".join(["src", str(i % 2)]), source_type=source_type, title=f"title {i}",
+                         content=f"content {i}", url=f"https://example.com/{i}", author="a",
+                         published_at=published_at, metadata={"i": i}, raw_data=raw_data)
+
+
+def test_slots_and_interned_sources():
+    item = make_item()
+    assert not hasattr(item, "__dict__")
+    with pytest.raises(AttributeError):
+        item.unknown = 1
+    assert item.source is make_item(2).source
+
+
+def test_raw_json_is_parsed_lazily_and_serialised_without_parsing():
+    item = make_item(raw_data=b'{"score": 5}')
+    assert json.loads(item.to_json())["raw_data"] == {"score": 5}
+    assert isinstance(item._raw, bytes)
+
+    assert item.raw_data == {"score": 5}
+    assert item.to_dict()["raw_data"] == {"score": 5}
+    assert json.loads(item.to_json())["published_at"] == "2026-01-02T03:04:05"
+
+
+def test_freeze_equality_and_pickle():
+    item = make_item(raw_data='{"a": 1}')
+    assert item == make_item(raw_data={"a": 1})
+
+    item.freeze()
+    with pytest.raises(FrozenInstanceError):
+        item.title = "changed"
+
+    restored = pickle.loads(pickle.dumps(item))
+    assert restored == item and restored.frozen
+    with pytest.raises(TypeError):
+        hash(item)
+
+
+def test_batch_round_trip_and_columns():
+    items = [make_item(i, source_type="news" if i % 3 else "github",
+                       published_at=datetime(2026, 1, i + 1) if i != 4 else None) for i in range(6)]
+    batch = CollectedItemBatch.from_items(items)
+
+    assert len(batch) == 6
+    assert list(batch) == items
+    assert batch.column("source") == ["src0", "src1"] * 3
+    assert batch.column("title")[5] == "title 5"
+    with pytest.raises(KeyError):
+        batch.column("missing")
+
+    assert batch.count_by_source_type() == {"github": 2, "news": 4}
+    assert batch.count_by_source() == {"src0": 3, "src1": 3}
+    assert batch.published_since(datetime(2026, 1, 3)) == [2, 3, 5]
+
+    subset = batch.select([1, 3])
+    assert [item.title for item in subset] == ["title 1", "title 3"]
+    assert batch.to_records()[0]["metadata"] == {"i": 0}
+
+
+def test_batch_keeps_timezone_of_published_at():
+    utc = make_item(0, published_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+    hkt = make_item(1, published_at=datetime(2026, 1, 2, 11, 4, 5, tzinfo=timezone(timedelta(hours=8))))
+    naive = make_item(2)
+    batch = CollectedItemBatch.from_items([utc, hkt, naive])
+
+    assert list(batch) == [utc, hkt, naive]
+    assert batch[0].published_at.tzinfo is timezone.utc
+    assert batch[1].published_at.utcoffset() == timedelta(hours=8)
+    assert batch[2].published_at.tzinfo is None
+    assert batch[0].published_at == batch[1].published_at
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(base_collector, "orjson", None)
+    elif base_collector.orjson is None:
+        pytest.skip("orjson not installed")
+
+
+@pytest.mark.parametrize("raw", ["<html>not json</html>", '{"truncated": ', "", "   ", b"\xff\xfe"])
+def test_non_json_raw_text_is_encoded_as_a_string(json_backend, raw):
+    output = json.loads(make_item(raw_data=raw).to_json())
+    expected = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+    assert output["raw_data"] == expected
+    assert output["title"] == "title 0"
+
+
+def test_raw_json_splices_into_item_without_other_fields(json_backend):
+    class Bare(CollectedItem):
+        __slots__ = ()
+
+        def to_dict(self, include_raw=True):
+            return {"raw_data": self.raw_data} if include_raw else {}
+
+    assert json.loads(Bare("s", "t", "", "", "", raw_data=b' [1, 2] ').to_json()) == {"raw_data": [1, 2]}
+
+    empty = CollectedItem("", "", "", "", "", raw_data="null")
+    assert json.loads(empty.to_json())["raw_data"] is None
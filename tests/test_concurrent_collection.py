@@ -0,0 +1,78 @@
+import asyncio
+import functools
+import time
+
+from src.collectors.base_collector import BaseCollector, CollectedItem
+from src.collectors.orchestrator import CollectionOrchestrator
+
+
+class SleepyCollector(BaseCollector):
+    """每个子请求等待 delay 秒后返回一个数据项"""
+
+    def __init__(self, name, jobs=4, delay=0.1, fail=(), **config):
+        super().__init__(name, {"incremental": False, **config})
+        self.jobs, self.delay, self.fail = jobs, delay, set(fail)
+        self.active = self.peak = 0
+        self.cancelled = 0
+
+    async def _job(self, index):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        if index in self.fail:
+            raise RuntimeError("boom")
+        return [CollectedItem(self.name, "test", f"{self.name}-{index}", "", f"https://example.com/{self.name}/{index}")]
+
+    async def collect_stream(self):
+        jobs = [(str(i), functools.partial(self._job, i)) for i in range(self.jobs)]
+        async for item in self._stream_limited(jobs):
+            yield item
+
+    def validate_config(self):
+        return True
+
+
+def test_sub_requests_run_concurrently_under_the_limit():
+    collector = SleepyCollector("c", jobs=6, delay=0.1, max_concurrency=3, fail=[2])
+
+    started = time.monotonic()
+    items = asyncio.run(collector.run())
+    elapsed = time.monotonic() - started
+
+    assert sorted(item.title for item in items) == ["c-0", "c-1", "c-3", "c-4", "c-5"]
+    assert collector.peak == 3
+    assert elapsed < 0.45  # 两批并发，而不是依次执行的0.6秒
+
+
+def test_stopping_early_cancels_pending_sub_requests():
+    collector = SleepyCollector("c", jobs=5, delay=0.05, max_concurrency=1)
+
+    async def first_item():
+        stream = collector.collect_stream()
+        async for item in stream:
+            await stream.aclose()
+            return item
+
+    assert asyncio.run(first_item()).title == "c-0"
+    assert collector.active == 0
+
+
+def test_collectors_run_side_by_side_and_slow_ones_time_out():
+    fast = [SleepyCollector(f"fast{i}", jobs=2, delay=0.1) for i in range(3)]
+    slow = SleepyCollector("slow", jobs=1, delay=5)
+    orchestrator = CollectionOrchestrator(fast + [slow], collector_timeout=0.3)
+
+    started = time.monotonic()
+    results = asyncio.run(orchestrator.run_once())
+    elapsed = time.monotonic() - started
+
+    assert {name: len(items) for name, items in results.items()} == {"fast0": 2, "fast1": 2, "fast2": 2, "slow": 0}
+    assert elapsed < 1.0
+    assert slow.cancelled == 1
+    assert set(orchestrator.get_status()["collector_durations"]) == {"fast0", "fast1", "fast2", "slow"}
@@ -0,0 +1,96 @@
+import random
+import time
+
+from src.collectors.base_collector import CollectedItem
+from src.collectors.dedup import DedupStage, normalize_text
+
+TITLE = "Central bank holds rates steady as inflation cools"
+CONTENT = ("The central bank left interest rates unchanged on Thursday, citing slowing inflation and a cooling labour "
+           "market, while signalling that cuts could come later this year. Policymakers voted seven to two to keep the "
+           "benchmark rate at its current level, with the two dissenters favouring an immediate reduction.")
+
+
+def make_item(url, title=TITLE, content=CONTENT, source="a"):
+    return CollectedItem(source=source, source_type="news", title=title, content=content, url=url)
+
+
+def test_normalize_text():
+    assert normalize_text("Hello,  World! 3.5%") == "hello world 3 5"
+    assert normalize_text("港股 HSI，上涨") == "港股 hsi 上涨"
+    assert normalize_text(None) == ""
+
+
+def test_exact_and_near_duplicates():
+    stage = DedupStage(index_path=None)
+
+    assert stage(make_item("https://www.example.com/news/1/?utm_source=rss")) is not None
+    # 同一URL的不同写法
+    assert stage(make_item("http://example.com/news/1?fbclid=abc", title="Other", content="Other")) is None
+    # 转载：URL不同，标题和内容相同（大小写和标点不同）
+    assert stage(make_item("https://mirror.example.org/a", title="CENTRAL BANK HOLDS RATES STEADY, AS INFLATION COOLS!",
+                           content=CONTENT.upper())) is None
+    # 转载时标题加了前缀
+    assert stage(make_item("https://other.example.net/b", title=f"Breaking: {TITLE}")) is None
+    # 不同的文章
+    assert stage(make_item("https://example.com/news/2", title="Tech shares rally after strong earnings",
+                           content="Chip makers led gains as quarterly results beat expectations.")) is not None
+
+    stats = stage.get_stats()
+    assert (stats["url_duplicates"], stats["hash_duplicates"], stats["near_duplicates"]) == (1, 1, 1)
+    assert stats["passed"] == 2 and stats["index_size"] == 2
+
+
+def test_cjk_near_duplicate():
+    stage = DedupStage(index_path=None)
+    content = ("恒生指数今日高开低走，收市下跌百分之一点二，科技股普遍受压，成交额较上一交易日有所减少。"
+               "分析师认为，市场仍在等待美国公布通胀数据，短期内港股或继续在区间内震荡。")
+    assert stage(make_item("https://a.hk/1", title="恒指收市下跌 科技股受压", content=content)) is not None
+    assert stage(make_item("https://b.hk/2", title="恒指收市下跌 科技股受压（更新）", content=content)) is None
+    assert stage.stats["near_duplicates"] == 1
+
+
+def test_fingerprint_is_stable():
+    # 指纹会持久化到索引中，计算方式变化会导致已有索引失效
+    item = make_item("https://www.example.com/x/?utm_source=a&b=1", title="恒指收市下跌 Central bank holds rates",
+                     content="The central bank left rates unchanged; 科技股普遍受压。")
+    assert DedupStage(index_path=None).fingerprint(item) == (
+        12002488461006399564, 1643827499436162358, 14548369991899386061, 12041043418734016698)
+
+
+def test_index_persists_across_runs(tmp_path):
+    path = str(tmp_path / "dedup" / "index.json")
+    stage = DedupStage(index_path=path)
+    assert stage(make_item("https://example.com/news/1")) is not None
+    stage.flush()
+
+    reloaded = DedupStage(index_path=path)
+    assert reloaded.get_stats()["index_size"] == 1
+    assert reloaded(make_item("https://example.com/news/1")) is None
+    assert reloaded(make_item("https://mirror.example.org/a")) is None
+    assert reloaded.stats["url_duplicates"] == 1 and reloaded.stats["hash_duplicates"] == 1
+
+
+def test_eviction_forgets_oldest_entries():
+    stage = DedupStage(index_path=None, max_entries=2)
+    for i in range(3):
+        assert stage(make_item(f"https://example.com/{i}", title=f"Story number {i} " * 3, content=f"body {i}"))
+
+    assert stage.get_stats()["index_size"] == 2
+    assert stage(make_item("https://example.com/0", title="Story number 0 " * 3, content="body 0")) is not None
+
+
+def test_throughput():
+    random.seed(0)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    items = [make_item(f"https://example.com/{i}?utm_source=feed", title=" ".join(random.choices(vocabulary, k=10)),
+                       content=" ".join(random.choices(vocabulary, k=80))) for i in range(5000)]
+    stage = DedupStage(index_path=None)
+
+    started = time.perf_counter()
+    for item in items:
+        stage(item)
+    rate = len(items) / (time.perf_counter() - started)
+
+    assert stage.stats["passed"] == len(items)
+    # 开发机上约1万～1.7万条/秒，这里只防止数量级的退化
+    assert rate > 2000, f"{rate:.0f} items/s"
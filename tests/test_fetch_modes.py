@@ -0,0 +1,103 @@
+import asyncio
+import time
+from collections import deque
+
+import pytest
+
+from realtime_data_system import RealTimeDataSystem
+
+SOURCES = {
+    'primary': {'url': 'https://primary.example/quote'},
+    'backup': {'url': 'https://backup.example/quote'},
+}
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system = RealTimeDataSystem()
+    system.get_data_sources = lambda data_type: SOURCES
+    system.hedge_delay_default = 0.1
+    return system
+
+
+def fake_sources(system, **behaviour):
+    """behaviour: 数据源URL主机名 -> 延迟秒数，负数表示延迟后失败"""
+    system.started, system.cancelled = [], []
+
+    async def fetch_realtime_data(data_type, url, params=None):
+        name = url.split('//')[1].split('.')[0]
+        system.started.append(name)
+        delay = behaviour[name]
+        try:
+            await asyncio.sleep(abs(delay))
+        except asyncio.CancelledError:
+            system.cancelled.append(name)
+            raise
+        if delay < 0:
+            raise RuntimeError(f"{name} down")
+        return {'data': {'from': name}, 'metadata': {}}
+
+    system.fetch_realtime_data = fetch_realtime_data
+
+
+def refresh(system, mode):
+    async def run():
+        started = time.monotonic()
+        data = await system.get_or_refresh_data('crypto_prices', force_refresh=True, mode=mode)
+        return data, time.monotonic() - started
+
+    return asyncio.run(run())
+
+
+def test_hedged_request_starts_backup_when_primary_is_slow(system):
+    fake_sources(system, primary=1.0, backup=0.05)
+    data, elapsed = refresh(system, 'hedged')
+
+    assert data['metadata']['source_name'] == 'backup'
+    assert elapsed < 0.5
+    assert system.started == ['primary', 'backup']
+    assert system.cancelled == ['primary']
+
+
+def test_hedged_request_moves_on_immediately_when_primary_fails(system):
+    system.hedge_delay_default = 5
+    fake_sources(system, primary=-0.01, backup=0.01)
+    data, elapsed = refresh(system, 'hedged')
+
+    assert data['data'] == {'from': 'backup'}
+    assert elapsed < 0.5
+
+
+def test_fast_primary_never_starts_the_backup(system):
+    fake_sources(system, primary=0.01, backup=0.01)
+    data, _ = refresh(system, 'hedged')
+
+    assert data['metadata']['source_name'] == 'primary'
+    assert system.started == ['primary']
+
+
+def test_gather_keeps_successful_sources_in_priority_order(system):
+    fake_sources(system, primary=0.05, backup=0.01)
+    data, _ = refresh(system, 'gather')
+
+    assert data['metadata']['source_name'] == 'primary'
+    assert list(data['all_sources']) == ['primary', 'backup']
+
+    fake_sources(system, primary=-0.01, backup=0.01)
+    data, _ = refresh(system, 'gather')
+    assert list(data['all_sources']) == ['backup']
+
+
+def test_hedge_delay_follows_source_latency(system):
+    url = SOURCES['primary']['url']
+    assert system._hedge_delay(url) == 0.1  # 样本不足时使用默认值
+
+    system.source_latency[url] = deque([0.2] * 19 + [0.8])
+    assert system._hedge_delay(url) == 0.8
+    assert system.latency_percentile(url, 50) == 0.2
+
+    system.source_latency[url] = deque([0.001] * 10)
+    assert system._hedge_delay(url) == system.hedge_delay_bounds[0]
+    system.source_latency[url] = deque([60.0] * 10)
+    assert system._hedge_delay(url) == system.hedge_delay_bounds[1]
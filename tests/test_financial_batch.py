@@ -0,0 +1,118 @@
+import math
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from data_accuracy_framework import (BATCH_INCONSISTENT, BATCH_INSUFFICIENT_SOURCES, BATCH_NON_POSITIVE,
+                                     BATCH_STALE, BATCH_VOLATILE, DataAccuracyFramework, describe_batch_issues)
+
+NOW = 1_800_000_000.0
+NAN = float('nan')
+
+
+@pytest.fixture
+def framework():
+    return DataAccuracyFramework()
+
+
+def test_batch_flags_each_rule(framework):
+    prices = [
+        [100.0, 100.1],  # 通过
+        [100.0, NAN],  # 数据源不足
+        [100.0, 150.0],  # 一致性不足
+        [100.0, 200.0],  # 一致性不足且波动过大
+        [-1.0, -1.0],  # 非正数
+        [NAN, NAN],  # 没有报价
+        [100.0, 100.0],  # 一个数据源过时
+    ]
+    timestamps = np.full((7, 2), NOW - 10)
+    timestamps[6, 1] = NOW - 600
+
+    result = framework.validate_financial_batch(prices, timestamps, symbols=list("ABCDEFG"), now=NOW)
+
+    assert result['issue_flags'].tolist() == [
+        0, BATCH_INSUFFICIENT_SOURCES, BATCH_INCONSISTENT, BATCH_INCONSISTENT | BATCH_VOLATILE,
+        BATCH_NON_POSITIVE, BATCH_INSUFFICIENT_SOURCES, BATCH_STALE]
+    assert result['validation_passed'].tolist() == [True] + [False] * 6
+    assert result['sources_count'].tolist() == [2, 1, 2, 2, 2, 0, 2]
+    assert result['stale_sources'][6] == 1
+
+    assert result['value'][0] == pytest.approx(100.05)
+    assert result['confidence_score'][0] == pytest.approx(result['consistency_score'][0] * 100)
+    assert result['confidence_score'][1] == 0.0
+    assert math.isnan(result['consistency_score'][1]) and math.isnan(result['value'][5])
+    assert (result['min'][3], result['max'][3]) == (100.0, 200.0)
+
+    assert set(result['failed']) == set("BCDEFG")
+    assert result['failed']['D'] == ['数据一致性不足', '价格波动过大']
+
+
+PARITY_QUOTES = [
+    [100.0, 100.2, NAN, NAN],
+    [50.0, 80.0, NAN, NAN],
+    [100.0, 100.1, 100.05, 130.0],  # 离群报价被剔除后通过
+    [100.0, 100.1, 99.9, 100.05],
+    [1.1000, 1.1015, NAN, NAN],
+    [1.1000, 1.1001, 1.1002, NAN],
+    [100.0, NAN, NAN, NAN],
+    [-5.0, -5.0, NAN, NAN],
+    [100.0, 100.0, 100.0, NAN],  # 其中一个数据源过时
+]
+
+
+@pytest.mark.parametrize('data_type', ['financial', 'crypto', 'fx'])
+def test_batch_and_single_validation_agree(data_type):
+    framework = DataAccuracyFramework()
+    framework.validation_config['fx_data']['max_spread'] = 0.001
+    now = time.time()
+    timestamps = np.full((len(PARITY_QUOTES), 4), now - 5)
+    timestamps[-1, 2] = now - 7200
+
+    batch = framework.validate_financial_batch(PARITY_QUOTES, timestamps, now=now, data_type=data_type)
+
+    for row, (quotes, passed) in enumerate(zip(PARITY_QUOTES, batch['validation_passed'])):
+        points = [{'source': f"{data_type}-{row}-{column}", 'symbol': f"S{row}", 'price': price,
+                   'timestamp': datetime.fromtimestamp(timestamps[row, column], tz=timezone.utc).isoformat()}
+                  for column, price in enumerate(quotes) if not math.isnan(price)]
+        single = framework.validate(data_type, points)
+        assert single['validation_passed'] == bool(passed), (row, single['issues'], batch['failed'].get(row))
+        if passed:
+            assert single['validated_data']['value'] == pytest.approx(batch['value'][row])
+            assert single['consistency_score'] == pytest.approx(batch['consistency_score'][row])
+
+
+def test_batch_uses_consensus_and_per_type_spread(framework):
+    result = framework.validate_financial_batch([[100.0, 100.1, 100.05, 130.0]])
+    assert result['validation_passed'][0] and result['outliers'][0] == 1
+    assert result['value'][0] == pytest.approx(100.05) and result['max'][0] == 100.1
+
+    framework.validation_config['fx_data']['max_spread'] = 0.001
+    fx = framework.validate_financial_batch([[1.1000, 1.1015]], data_type='fx')
+    assert fx['issue_flags'][0] == BATCH_VOLATILE
+    assert fx['data_type'] == 'fx'
+
+
+def test_columns_pivot_long_format(framework):
+    result = framework.validate_financial_columns(
+        ['MSFT', 'AAPL', 'MSFT', 'AAPL', 'TSLA'],
+        [400.0, 200.0, 400.4, 200.2, 250.0],
+        timestamps=[NOW] * 5, now=NOW)
+
+    assert result['symbols'] == ['AAPL', 'MSFT', 'TSLA']
+    assert result['sources_count'].tolist() == [2, 2, 1]
+    assert result['validation_passed'].tolist() == [True, True, False]
+    assert result['value'][1] == pytest.approx(400.2)
+
+
+def test_shape_mismatches_and_issue_names(framework):
+    with pytest.raises(ValueError):
+        framework.validate_financial_batch([[1.0, 2.0]], symbols=['A', 'B'])
+    with pytest.raises(ValueError):
+        framework.validate_financial_batch([[1.0, 2.0]], timestamps=[[NOW]])
+    with pytest.raises(ValueError):
+        framework.validate_financial_columns(['A'], [1.0, 2.0])
+
+    assert describe_batch_issues(0) == []
+    assert describe_batch_issues(BATCH_STALE | BATCH_INSUFFICIENT_SOURCES) == ['数据源不足', '数据过时']
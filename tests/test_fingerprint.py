@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime
+from enum import Enum
+
+import numpy as np
+import pytest
+
+from src.utils import fingerprint as fingerprint_module
+from src.utils.fingerprint import STABLE_ALGORITHM, Fingerprinter, canonical_bytes, fingerprint, hash64
+
+SAMPLE = {"source": "yahoo", "price": 27450.25, "tags": ["hsi", "指数"], "nested": {"b": 2, "a": 1}}
+
+
+class Side(Enum):
+    BUY = "buy"
+
+
+def test_independent_of_key_order():
+    reordered = {"nested": {"a": 1, "b": 2}, "tags": ["hsi", "指数"], "price": 27450.25, "source": "yahoo"}
+    assert canonical_bytes(reordered) == canonical_bytes(SAMPLE)
+    assert fingerprint(reordered) == fingerprint(SAMPLE)
+    assert fingerprint(SAMPLE) != fingerprint({**SAMPLE, "price": 27450.26})
+    assert len(fingerprint(SAMPLE, 12)) == 12
+
+
+def test_canonical_bytes_is_compact_sorted_json():
+    assert canonical_bytes(SAMPLE) == (
+        '{"nested":{"a":1,"b":2},"price":27450.25,"source":"yahoo","tags":["hsi","指数"]}'.encode("utf-8"))
+
+
+def test_stdlib_fallback_produces_the_same_bytes(monkeypatch):
+    value = {**SAMPLE, "when": datetime(2026, 1, 2, 3, 4, 5), "side": Side.BUY, "ids": {3, 1, 2},
+             "raw": b"\x01\xff", "array": np.array([1.5, 2.5])}
+    fast = canonical_bytes(value)
+    monkeypatch.setattr(fingerprint_module, "orjson", None)
+    assert canonical_bytes(value) == fast
+
+
+def test_incremental_fingerprinter_is_deterministic():
+    records = [{"i": i, "price": 100 + i} for i in range(5)]
+
+    first, second = Fingerprinter("blake2b"), Fingerprinter("blake2b")
+    for record in records:
+        first.update(record)
+        second.update(dict(reversed(list(record.items()))))
+
+    assert first.hexdigest() == second.hexdigest()
+    assert first.intdigest() == int.from_bytes(bytes.fromhex(first.hexdigest()), "little")
+    assert first.hexdigest() != Fingerprinter("blake2b").update(records).hexdigest()
+
+
+def test_explicit_blake2b_matches_hashlib():
+    expected = hashlib.blake2b(b"payload", digest_size=8).digest()
+    assert hash64(b"payload", "blake2b") == int.from_bytes(expected, "little")
+    assert fingerprint(SAMPLE, algorithm="blake2b") == hashlib.blake2b(
+        canonical_bytes(SAMPLE), digest_size=8).hexdigest()
+
+    with pytest.raises(ValueError):
+        hash64(b"payload", "md5")
+    if not fingerprint_module.HAS_XXHASH:
+        with pytest.raises(ValueError):
+            Fingerprinter("xxh3_64")
+
+
+@pytest.mark.parametrize("algorithm", ["blake2b", "xxh3_64"])
+def test_intdigest_and_hash64_agree(algorithm):
+    if algorithm == "xxh3_64" and not fingerprint_module.HAS_XXHASH:
+        pytest.skip("xxhash not installed")
+    assert Fingerprinter(algorithm).update(SAMPLE).intdigest() == hash64(canonical_bytes(SAMPLE), algorithm)
+
+
+def test_logged_ids_do_not_depend_on_installed_hash_library(monkeypatch):
+    from data_accuracy_framework import DataAccuracyFramework
+
+    points = [{"source": "yahoo", "price": 100.0}, {"source": "investing", "price": 100.1}]
+    assert STABLE_ALGORITHM == "blake2b"
+    expected = fingerprint(points, 8, "blake2b")
+
+    monkeypatch.setattr(fingerprint_module, "DEFAULT_ALGORITHM", "xxh3_64")
+    report = DataAccuracyFramework().get_data_with_validation("financial", points)
+    assert report["data_hash"] == expected
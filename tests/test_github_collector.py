@@ -0,0 +1,32 @@
+import asyncio
+
+from src.collectors.github_collector import GitHubCollector
+
+
+def repo(name, stars, updated_at):
+    return {"name": name, "full_name": f"owner/{name}", "html_url": f"https://github.com/owner/{name}",
+            "description": name, "stargazers_count": stars, "updated_at": updated_at, "owner": {"login": "owner"}}
+
+
+def test_incremental_runs_keep_the_ranking_query(tmp_path):
+    repos = [repo("big", 9000, "2026-01-01T00:00:00Z"), repo("small", 10, "2026-03-01T00:00:00Z")]
+    queries = []
+
+    async def search(query, sort="stars", order="desc", per_page=30):
+        queries.append((query, sort, order))
+        return repos
+
+    def run():
+        collector = GitHubCollector("github", {"languages": ["python"], "checkpoint_dir": str(tmp_path)})
+        collector._search_repositories = search
+        items = asyncio.run(collector.run())
+        return [item.title for item in items if item.source_type == "github_language"]
+
+    assert run() == ["big", "small"]
+    assert run() == []  # 没有变化的仓库不再产出
+
+    repos[0] = repo("big", 9100, "2026-04-01T00:00:00Z")
+    assert run() == ["big"]
+
+    # 每次都是同一个按星数排序的查询，没有 pushed: 之类的时间条件
+    assert queries == [("language:python", "stars", "desc")] * 3
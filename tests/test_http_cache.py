@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from src.utils import http_cache
+from src.utils.http_cache import ValidatorCache, configure_validator_cache
+from src.utils.http_client import HttpResponse
+
+
+def response(headers, body=b"{}"):
+    return HttpResponse(url="http://example.com/a", status=200, headers=headers, body=body, elapsed=0.1)
+
+
+def test_store_and_get_round_trip(tmp_path):
+    cache = ValidatorCache(str(tmp_path / "cache.db"))
+    key = ValidatorCache.make_key("http://example.com/a", {"b": 2, "a": 1})
+    assert key == "http://example.com/a?a=1&b=2"
+
+    assert not cache.store(key, response({"Content-Type": "application/json"}))
+    assert cache.get(key) is None
+
+    assert cache.store(key, response({"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+                                      "Set-Cookie": "x=1"}, b'{"a":1}'))
+    cache.close()
+
+    cached = ValidatorCache(str(tmp_path / "cache.db")).get(key)
+    assert cached.body == b'{"a":1}'
+    assert "Set-Cookie" not in cached.headers
+    assert cached.conditional_headers() == {"If-None-Match": '"v1"',
+                                            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cached.to_response().not_modified
+
+
+def test_async_access_runs_off_the_event_loop(tmp_path):
+    cache = ValidatorCache(str(tmp_path / "cache.db"))
+    threads = []
+    original_get = cache.get
+
+    def get(key):
+        threads.append(threading.current_thread())
+        return original_get(key)
+
+    cache.get = get
+
+    async def run():
+        await asyncio.gather(*(cache.store_async(f"k{i}", response({"ETag": f'"{i}"'})) for i in range(20)))
+        return await cache.get_async("k7")
+
+    cached = asyncio.run(run())
+    assert cached.etag == '"7"'
+    assert threads and threads[0] is not threading.main_thread()
+    cache.close()
+
+
+def test_collector_reuses_cached_body_on_304(tmp_path, monkeypatch):
+    from aiohttp import web
+
+    from src.collectors.base_collector import ExampleCollector
+    from src.utils.http_client import close_http_client
+    from src.utils.rate_limiter import configure_rate_limiter
+    from tests.local_server import LocalServer
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(http_cache, "_default_cache", None)
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response({"value": 1}, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/data", handler)
+
+    async def run():
+        configure_rate_limiter()
+        configure_validator_cache(str(tmp_path / "cache.db"))
+        collector = ExampleCollector("example", {"conditional_requests": True, "incremental": False})
+        async with LocalServer(app) as server:
+            try:
+                first = await collector._make_request(f"{server.url}/data", source="local")
+                second = await collector._make_request(f"{server.url}/data", source="local")
+            finally:
+                await close_http_client()
+        return first, second, collector
+
+    first, second, collector = asyncio.run(run())
+    http_cache.get_validator_cache().close()
+
+    assert seen == [None, '"v1"']
+    assert not first.not_modified
+    assert second.not_modified and second.json() == {"value": 1}
+    assert collector.cache_stats["local"] == {"requests": 2, "not_modified": 1}
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from src.utils.http_client import HttpClient
+from tests.local_server import LocalServer
+
+
+def _app():
+    async def fast(request):
+        return web.json_response({"ok": True})
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    app = web.Application()
+    app.router.add_get("/fast", fast)
+    app.router.add_get("/slow", slow)
+    return app
+
+
+def test_get_reads_body_and_reuses_connections():
+    async def run():
+        client = HttpClient(timeout=5.0)
+        async with LocalServer(_app()) as server:
+            try:
+                for _ in range(3):
+                    response = await client.get(f"{server.url}/fast")
+                    assert response.status == 200
+                    assert response.json() == {"ok": True}
+                metrics = client.get_metrics()
+            finally:
+                await client.close()
+        assert metrics["requests"] == 3
+
+    asyncio.run(run())
+
+
+def test_client_default_timeout_applies_without_per_call_timeout():
+    async def run():
+        client = HttpClient(timeout=0.3)
+        async with LocalServer(_app()) as server:
+            try:
+                started = time.monotonic()
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.get(f"{server.url}/slow")
+                assert time.monotonic() - started < 0.9
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+
+
+def test_per_call_timeout_overrides_default():
+    async def run():
+        client = HttpClient(timeout=10.0)
+        async with LocalServer(_app()) as server:
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.get(f"{server.url}/slow", timeout=0.3)
+            finally:
+                await client.close()
+
+    asyncio.run(run())
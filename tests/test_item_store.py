@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from src.collectors.base_collector import CollectedItem
+from src.database.item_store import ItemStore
+
+
+def make_item(url, title="Rust web framework released", source_type="github", hours_ago=1.0, metadata=None):
+    return CollectedItem(source="s", source_type=source_type, title=title, content=f"{title} body", url=url,
+                         published_at=datetime.now() - timedelta(hours=hours_ago), metadata=metadata)
+
+
+def test_upsert_deduplicates_by_canonical_url(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    assert store.upsert_many([make_item("https://www.example.com/a/?utm_source=x"),
+                              make_item("https://example.com/b"),
+                              make_item("")]) == 2
+    store.upsert_many([make_item("http://example.com/a", title="Rust web framework 1.0 released",
+                                 metadata={"stars": 10})])
+
+    assert store.count() == 2
+    items = {item.title: item for item in store.recent_by_source("github")}
+    assert set(items) == {"Rust web framework released", "Rust web framework 1.0 released"}
+    assert items["Rust web framework 1.0 released"].metadata == {"stars": 10}
+
+
+def test_recent_by_source_and_search(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    store.upsert_many([
+        make_item("https://example.com/1", "Python packaging news", "news", hours_ago=2),
+        make_item("https://example.com/2", "Go generics tutorial", "news", hours_ago=1),
+        make_item("https://example.com/3", "Old python story", "news", hours_ago=48),
+        make_item("https://example.com/4", "Python trending repo", "github"),
+    ])
+
+    assert [item.title for item in store.recent_by_source("news")] == ["Go generics tutorial", "Python packaging news"]
+    assert store.count("news") == 3
+    assert {item.url for item in store.search("python")} == {
+        "https://example.com/1", "https://example.com/3", "https://example.com/4"}
+
+    # 更新标题后全文索引同步更新
+    store.upsert_many([make_item("https://example.com/2", "Go iterators tutorial", "news")])
+    assert store.search("generics") == []
+    assert [item.url for item in store.search("iterators")] == ["https://example.com/2"]
+
+
+def test_stage_buffers_until_batch_size_and_writes_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "items.db")
+    store = ItemStore(path, batch_size=3)
+    writer_threads = []
+    upsert_many = store.upsert_many
+
+    def recording_upsert(items):
+        writer_threads.append(threading.current_thread().name)
+        return upsert_many(items)
+
+    store.upsert_many = recording_upsert
+
+    async def run():
+        for i in range(4):
+            assert await store(make_item(f"https://example.com/{i}")) is not None
+        assert store.items_written == 3 and store.get_stats()["buffered"] == 1
+        await store.flush()
+
+    asyncio.run(run())
+    store.close()
+
+    assert store.items_written == 4
+    assert len(writer_threads) == 2 and all(name.startswith("item-store") for name in writer_threads)
+    assert ItemStore(path).count() == 4
+
+
+def test_close_writes_remaining_buffer(tmp_path):
+    path = str(tmp_path / "items.db")
+    store = ItemStore(path, batch_size=10)
+    asyncio.run(store(make_item("https://example.com/1")))
+    store.close()
+
+    assert ItemStore(path).count() == 1
+
+
+def test_published_at_round_trips_with_its_timezone(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    aware = make_item("https://example.com/utc")
+    aware.published_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    naive = make_item("https://example.com/local")
+    store.upsert_many([aware, naive])
+
+    items = {item.url: item for item in store.recent_by_source("github")}
+    assert items["https://example.com/utc"].published_at == aware.published_at
+    assert items["https://example.com/utc"].published_at.tzinfo is timezone.utc
+    assert items["https://example.com/local"].published_at == naive.published_at
+    assert items["https://example.com/local"].published_at.tzinfo is None
+
+
+def test_adds_offset_column_to_existing_database(tmp_path):
+    path = str(tmp_path / "items.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, canonical_url TEXT NOT NULL UNIQUE, url TEXT NOT NULL, "
+                 "source TEXT NOT NULL, source_type TEXT NOT NULL, title TEXT NOT NULL, content TEXT, author TEXT, "
+                 "published_at REAL, collected_at REAL NOT NULL, metadata TEXT)")
+    conn.commit()
+    conn.close()
+
+    store = ItemStore(path)
+    store.upsert_many([make_item("https://example.com/1")])
+    assert store.recent_by_source("github")[0].published_at.tzinfo is None
@@ -0,0 +1,51 @@
+import asyncio
+
+from src.collectors.base_collector import ExampleCollector
+from src.collectors.orchestrator import CollectionOrchestrator
+
+
+class RecordingStage:
+    def __init__(self):
+        self.items = []
+        self.flushes = 0
+
+    def __call__(self, item):
+        self.items.append(item)
+        return item if item.metadata["index"] != 1 else None
+
+    async def flush(self):
+        self.flushes += 1
+
+
+def make_orchestrator(stage, count=2):
+    collectors = [ExampleCollector(f"example{i}", {"api_url": "http://example.com", "incremental": False})
+                  for i in range(count)]
+    return CollectionOrchestrator(collectors, stages=[stage], stream_buffer=1)
+
+
+def test_run_once_applies_stages_and_flushes_once():
+    stage = RecordingStage()
+    orchestrator = make_orchestrator(stage)
+
+    results = asyncio.run(orchestrator.run_once())
+
+    assert {name: len(items) for name, items in results.items()} == {"example0": 2, "example1": 2}
+    assert len(stage.items) == 6
+    assert stage.flushes == 1
+    assert orchestrator.cycles_completed == 1
+
+
+def test_stages_are_flushed_when_consumer_stops_early():
+    stage = RecordingStage()
+    orchestrator = make_orchestrator(stage)
+
+    async def run():
+        stream = orchestrator.stream()
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+    asyncio.run(run())
+
+    assert stage.flushes == 1
+    assert orchestrator.cycles_completed == 0
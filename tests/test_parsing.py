@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import os
+
+from src.collectors.parsing import PayloadParser, parse_html_payload, parse_rss_payload
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>t</title>
+<item><title>First</title><link>https://example.com/1</link><guid>g1</guid>
+<pubDate>Fri, 02 Jan 2026 03:04:05 GMT</pubDate><description>Summary one</description></item>
+<item><title>Second</title><link>https://example.com/2</link></item>
+</channel></rss>"""
+
+HTML = b"""<html><body>
+<article><h2><a href="/a">Article A</a></h2><p>Intro A</p><span class="author">Ann</span>
+<time datetime="2026-01-02">Jan 2</time></article>
+<article><h2><a href="/a">Duplicate A</a></h2></article>
+<article><h3><a href="https://other.com/b">Article B</a></h3></article>
+</body></html>"""
+
+
+def test_parse_rss_payload():
+    records = parse_rss_payload(RSS)
+    assert [record["title"] for record in records] == ["First", "Second"]
+    assert records[0]["guid"] == "g1"
+    assert records[0]["summary"] == "Summary one"
+    assert records[0]["published_ts"] == 1767323045
+    assert records[1]["guid"] == "https://example.com/2" and records[1]["published_ts"] is None
+    assert len(parse_rss_payload(RSS, max_items=1)) == 1
+
+
+def test_parse_html_payload_articles_and_fallback():
+    records = parse_html_payload(HTML, "https://example.com/news/")
+    assert [(record["title"], record["link"]) for record in records] == [
+        ("Article A", "https://example.com/a"), ("Article B", "https://other.com/b")]
+    assert records[0]["author"] == "Ann" and records[0]["published"] == "2026-01-02"
+    assert records[0]["summary"] == "Intro A" and records[1]["summary"] == "Article B"
+
+    # 没有 <article> 时退化为 h2/h3 标题链接
+    fallback = parse_html_payload(b'<h2><a href="x">X</a></h2><h3><a href="y">Y</a></h3>', "https://e.com/", 1)
+    assert [record["link"] for record in fallback] == ["https://e.com/x"]
+
+
+def test_small_bodies_and_zero_workers_parse_inline():
+    parser = PayloadParser(workers=0, inline_threshold=0)
+    records = asyncio.run(parser.parse_rss(RSS))
+    assert len(records) == 2
+    assert parser.get_stats()["inline"] == 1 and parser._executor is None
+
+    parser = PayloadParser(workers=1)
+    asyncio.run(parser.parse_html(HTML, "https://example.com/"))
+    assert parser.stats["inline"] == 1 and parser._executor is None
+
+
+def test_large_bodies_go_through_the_process_pool():
+    parser = PayloadParser(workers=1, inline_threshold=16)
+    try:
+        records = asyncio.run(parser.parse_html(HTML, "https://example.com/"))
+    finally:
+        parser.close()
+
+    assert [record["title"] for record in records] == ["Article A", "Article B"]
+    assert parser.stats["pooled"] == 1 and parser.stats["inline"] == 0
+    assert parser._executor is None
+
+
+
+def crash_in_worker(body, *args):
+    """在工作进程中直接退出（模拟进程池损坏），在当前进程中正常返回"""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return [{"title": "inline"}]
+
+
+def test_broken_pool_is_shut_down_and_parsed_inline():
+    parser = PayloadParser(workers=1, inline_threshold=0)
+
+    shutdowns = []
+
+    async def run():
+        broken = parser._get_executor()
+        shutdown = broken.shutdown
+        broken.shutdown = lambda *args, **kwargs: (shutdowns.append(kwargs), shutdown(*args, **kwargs))
+        return await parser._run(crash_in_worker, RSS)
+
+    try:
+        records = asyncio.run(run())
+    finally:
+        parser.close()
+
+    assert records == [{"title": "inline"}]
+    assert parser.stats["failures"] == 1 and parser.stats["inline"] == 1
+    assert parser._executor is None
+    assert shutdowns == [{"wait": False, "cancel_futures": True}]  # 损坏的进程池已关闭
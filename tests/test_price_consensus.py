@@ -0,0 +1,70 @@
+import pytest
+
+from data_accuracy_framework import DataAccuracyFramework
+from src.utils.price_consensus import PriceConsensus, weighted_median
+
+
+def test_weighted_median_equal_weights_matches_median():
+    assert weighted_median([1, 2], [1, 1]) == 1.5
+    assert weighted_median([3, 1, 2], [1, 1, 1]) == 2
+    assert weighted_median([1, 2, 3], [0.1, 0.1, 5]) == 3
+
+
+def test_outlier_is_rejected_and_loses_reliability():
+    consensus = PriceConsensus()
+    result = consensus.update_many({"a": 100.0, "b": 100.1, "c": 100.05, "d": 150.0}, "X")
+
+    assert result.outliers == ["d"]
+    assert result.value == 100.05
+    assert consensus.reliability["d"] < consensus.reliability["a"]
+    assert consensus.consensus("X") is result
+
+
+def test_evaluate_ignores_sources_from_earlier_calls():
+    consensus = PriceConsensus()
+    consensus.evaluate({"yahoo": 100.0, "investing": 100.1}, "X")
+    result = consensus.evaluate({"yahoo": 27000.0, "bloomberg": 27001.0}, "X")
+
+    assert sorted(result.sources) == ["bloomberg", "yahoo"]
+    assert result.outliers == []
+    assert result.value == 27000.5
+
+
+def test_financial_validation_with_disjoint_sources():
+    framework = DataAccuracyFramework()
+    framework.validate_financial_data([{"source": "yahoo", "price": 100.0}, {"source": "investing", "price": 100.1}])
+    result = framework.validate_financial_data([{"source": "bloomberg", "price": 100.2},
+                                                {"source": "reuters", "price": 100.3}])
+
+    assert result["validation_passed"]
+    assert result["validated_data"]["value"] == pytest.approx(100.25)
+    assert "outliers" not in result
+
+
+def test_financial_validation_does_not_flag_absent_sources():
+    framework = DataAccuracyFramework()
+    framework.validate_financial_data([{"source": "yahoo", "price": 100.0, "symbol": "^HSI"},
+                                       {"source": "investing", "price": 100.1, "symbol": "^HSI"}])
+    result = framework.validate_financial_data([{"source": "yahoo", "price": 27000.0, "symbol": "^HSI"},
+                                                {"source": "bloomberg", "price": 27001.0, "symbol": "^HSI"}])
+
+    assert result["validation_passed"]
+    assert "outliers" not in result
+
+
+def test_hsi_monitor_uses_only_this_cycles_sources():
+    pytest.importorskip("requests")
+    from datetime import datetime
+    from accurate_hsi_monitor import AccurateHSIMonitor
+
+    def quote(source, price):
+        return {"status": "success", "source": source, "price": price, "change": 0, "change_percent": 0,
+                "time": datetime.now()}
+
+    monitor = AccurateHSIMonitor()
+    monitor.validate_and_average([quote("yahoo", 27000.0), quote("investing", 27002.0), quote("bloomberg", 27001.0)])
+    result = monitor.validate_and_average([quote("yahoo", 28000.0), quote("investing", 28002.0)])
+
+    assert result["consensus_price"] == result["average_price"] == 28001.0
+    assert result["consistency"] == pytest.approx(1 - 1 / 28001.0, abs=1e-4)
+    assert result["sources"] == ["yahoo", "investing"]
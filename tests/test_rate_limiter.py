@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from src.utils.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.05 < bucket.reserve() <= 0.1
+
+
+def test_429_returns_retry_after_and_halves_concurrency():
+    limiter = RateLimiter(default={"concurrency": 4})
+    delay = limiter.feedback("example.com", 429, {"Retry-After": "3"})
+
+    status = limiter.get_status()["example.com"]
+    assert delay == 3.0
+    assert status["concurrency"] == 2
+    assert status["throttled"] == 1
+    assert status["blocked_for"] > 2.5
+
+
+def test_503_without_retry_after_backs_off_exponentially():
+    limiter = RateLimiter(base_backoff=1.0)
+    assert limiter.feedback("example.com", 503, {}) == 1.0
+    assert limiter.feedback("example.com", 503, {}) == 2.0
+
+
+def test_success_with_exhausted_quota_is_not_retried_but_blocks_host():
+    limiter = RateLimiter()
+    reset = str(int(time.time()) + 30)
+    delay = limiter.feedback("api.github.com", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+
+    status = limiter.get_status()["api.github.com"]
+    assert delay is None
+    assert status["blocked_for"] > 25
+    assert status["throttled"] == 0
+
+
+def test_success_with_exhausted_quota_and_past_reset_is_not_retried():
+    limiter = RateLimiter()
+    reset = str(int(time.time()) - 5)
+    assert limiter.feedback("api.github.com", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}) is None
+
+
+def test_403_with_exhausted_quota_is_throttled():
+    limiter = RateLimiter()
+    reset = str(int(time.time()) + 10)
+    delay = limiter.feedback("api.github.com", 403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+    assert 8 < delay <= 10
+
+
+def test_successes_grow_concurrency_additively():
+    limiter = RateLimiter(default={"concurrency": 2, "max_concurrency": 3})
+    for _ in range(2):
+        limiter.feedback("example.com", 200, {})
+    assert limiter.get_status()["example.com"]["concurrency"] == 3
+
+
+def test_limit_caps_concurrent_requests():
+    limiter = RateLimiter(default={"rate": 1000, "burst": 1000, "concurrency": 2, "max_concurrency": 2})
+    active = peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with limiter.limit("example.com"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_collector_keeps_good_response_when_quota_is_exhausted(tmp_path, monkeypatch):
+    from aiohttp import web
+
+    from src.collectors.base_collector import ExampleCollector
+    from src.utils.http_client import close_http_client
+    from src.utils.rate_limiter import configure_rate_limiter
+    from tests.local_server import LocalServer
+
+    monkeypatch.chdir(tmp_path)
+    hits = {"quota": 0, "throttle": 0}
+
+    async def quota(request):
+        hits["quota"] += 1
+        return web.json_response({"ok": True}, headers={"X-RateLimit-Remaining": "0",
+                                                        "X-RateLimit-Reset": str(int(time.time()) - 1)})
+
+    async def throttle(request):
+        hits["throttle"] += 1
+        if hits["throttle"] == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/quota", quota)
+    app.router.add_get("/throttle", throttle)
+
+    async def run():
+        configure_rate_limiter()
+        collector = ExampleCollector("example", {"conditional_requests": False, "incremental": False})
+        async with LocalServer(app) as server:
+            try:
+                first = await collector._make_request(f"{server.url}/quota")
+                second = await collector._make_request(f"{server.url}/throttle")
+            finally:
+                await close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.status == 200 and hits["quota"] == 1
+    assert second.status == 200 and hits["throttle"] == 2
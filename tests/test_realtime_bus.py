@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+
+from src.utils.realtime_bus import BLOCK, COALESCE, DROP_OLDEST, RealtimeBus, Subscription
+
+
+def test_slow_subscriber_does_not_delay_publisher_or_others():
+    bus = RealtimeBus()
+    fast, slow = [], []
+
+    async def slow_callback(topic, data):
+        await asyncio.sleep(0.05)
+        slow.append(data)
+
+    async def run():
+        bus.subscribe("quotes", lambda topic, data: fast.append(data), name="fast")
+        bus.subscribe("quotes", slow_callback, maxsize=3, policy=DROP_OLDEST, name="slow")
+        bus.subscribe("news", lambda topic, data: pytest.fail("wrong topic"))
+
+        started = time.monotonic()
+        for i in range(10):
+            await bus.publish("quotes", i)
+            await asyncio.sleep(0)
+        elapsed = time.monotonic() - started
+
+        await asyncio.sleep(0.3)
+        bus.close()
+        return elapsed
+
+    assert asyncio.run(run()) < 0.05
+    assert fast == list(range(10))
+    assert slow[-3:] == [7, 8, 9] and len(slow) < 10
+
+    stats = {entry["name"]: entry for entry in bus.get_stats()}
+    assert stats["slow"]["dropped"] == 10 - len(slow)
+    assert stats["slow"]["delivered"] == len(slow)
+    assert stats["fast"]["dropped"] == 0 and stats["fast"]["delivered"] == 10
+
+
+def test_coalesce_keeps_latest_value():
+    received = []
+
+    async def run():
+        subscription = Subscription("quotes", lambda topic, data: received.append(data), maxsize=1, policy=COALESCE)
+        for i in range(5):
+            await subscription.put(i)
+        await asyncio.sleep(0.01)
+        subscription.stop()
+        return subscription
+
+    subscription = asyncio.run(run())
+    assert received == [4]
+    assert subscription.stats["coalesced"] == 4
+
+
+def test_block_policy_applies_backpressure():
+    received = []
+
+    async def callback(topic, data):
+        await asyncio.sleep(0.02)
+        received.append(data)
+
+    async def run():
+        bus = RealtimeBus()
+        bus.subscribe("quotes", callback, maxsize=1, policy=BLOCK)
+        started = time.monotonic()
+        for i in range(5):
+            await bus.publish("quotes", i)
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(0.1)
+        bus.close()
+        return elapsed
+
+    assert asyncio.run(run()) >= 0.05
+    assert received == [0, 1, 2, 3, 4]
+
+
+def test_callback_errors_are_counted_and_unsubscribe_stops_delivery():
+    received = []
+
+    def callback(topic, data):
+        if data == "bad":
+            raise RuntimeError("boom")
+        received.append(data)
+
+    async def run():
+        bus = RealtimeBus()
+        subscription = bus.subscribe("quotes", callback)
+        await bus.publish("quotes", "bad")
+        await bus.publish("quotes", "good")
+        await asyncio.sleep(0.01)
+        bus.unsubscribe(subscription)
+        await bus.publish("quotes", "late")
+        await asyncio.sleep(0.01)
+        return bus, subscription
+
+    bus, subscription = asyncio.run(run())
+    assert received == ["good"]
+    assert subscription.stats["errors"] == 1
+    assert bus.subscriber_count() == 0
+    with pytest.raises(ValueError):
+        Subscription("quotes", callback, policy="unknown")
@@ -0,0 +1,81 @@
+from src.utils.realtime_cache import RealTimeCache
+
+
+def test_keys_ignore_parameter_order():
+    assert RealTimeCache.make_key("q", "src", {"a": 1, "b": [1, 2]}) == RealTimeCache.make_key("q", "src", {"b": [1, 2], "a": 1})
+    assert RealTimeCache.make_key("q") == ("q", "", ())
+
+
+def test_ttl_expiry_and_allow_expired():
+    cache = RealTimeCache()
+    key = cache.make_key("quotes", "yahoo")
+    cache.set(key, {"price": 1}, ttl=60, age=61)
+
+    assert cache.get(key) is None
+    assert cache.get_entry(key, allow_expired=True).value == {"price": 1}
+    assert cache.latest_entry("quotes") is None
+    assert cache.latest_entry("quotes", allow_expired=True).expired
+    assert cache.stats["stale_hits"] == 2
+
+
+def test_latest_entry_tracks_most_recent_source():
+    cache = RealTimeCache()
+    cache.set(cache.make_key("quotes", "yahoo"), "a", ttl=60)
+    cache.set(cache.make_key("quotes", "investing"), "b", ttl=60)
+
+    assert cache.latest_entry("quotes").value == "b"
+    cache.delete(cache.make_key("quotes", "investing"))
+    assert cache.latest_entry("quotes").value == "a"  # 回退到同类型中前一个写入的键
+    cache.delete(cache.make_key("quotes", "yahoo"))
+    assert cache.latest_entry("quotes") is None
+    assert cache.data_types() == []
+
+
+def test_evicting_latest_key_falls_back_to_sibling():
+    cache = RealTimeCache(max_entries=2)
+    cache.set(cache.make_key("quotes", "yahoo"), "old", ttl=60)
+    cache.set(cache.make_key("quotes", "investing"), "new", ttl=60)
+    cache.get(cache.make_key("quotes", "yahoo"))  # investing 成为最久未使用的条目
+    cache.set(cache.make_key("news", "rss"), "n", ttl=60)
+
+    assert cache.make_key("quotes", "investing") not in cache
+    assert cache.latest_entry("quotes").value == "old"
+    assert sorted(cache.data_types()) == ["news", "quotes"]
+
+    # 重新写入的键成为最近写入的键
+    cache.set(cache.make_key("quotes", "yahoo"), "fresh", ttl=60)
+    cache.set(cache.make_key("quotes", "bloomberg"), "b", ttl=60)
+    cache.set(cache.make_key("quotes", "yahoo"), "fresher", ttl=60)
+    assert cache.latest_entry("quotes").value == "fresher"
+
+
+def test_lru_eviction_by_entry_count():
+    cache = RealTimeCache(max_entries=2)
+    for name in "abc":
+        cache.set(cache.make_key(name), name, ttl=60)
+        if name == "b":
+            cache.get(cache.make_key("a"))  # a 最近使用，b 成为最旧的条目
+
+    assert cache.make_key("b") not in cache
+    assert len(cache) == 2 and cache.stats["evictions"] == 1
+
+
+def test_eviction_by_estimated_bytes():
+    cache = RealTimeCache(max_bytes=20000)
+    for i in range(10):
+        cache.set(cache.make_key("blob", str(i)), "x" * 5000, ttl=60)
+
+    assert cache.total_bytes <= 20000
+    assert len(cache) < 10
+    assert cache.make_key("blob", "9") in cache
+    assert cache.total_bytes == sum(entry.size for entry in cache.entries())
+
+
+def test_expired_entries_are_evicted_before_live_ones():
+    cache = RealTimeCache(max_entries=2)
+    cache.set(cache.make_key("live"), 1, ttl=60)
+    cache.set(cache.make_key("dead"), 2, ttl=1, age=5)
+    cache.set(cache.make_key("new"), 3, ttl=60)
+
+    assert cache.make_key("live") in cache and cache.make_key("dead") not in cache
+    assert cache.stats["expirations"] == 1 and cache.stats["evictions"] == 0
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from realtime_data_system import NS_PER_SECOND, RealTimeDataSystem, stamp_fetch_times
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return RealTimeDataSystem()
+
+
+def stamped(config, age_seconds):
+    metadata = {}
+    stamp_fetch_times(metadata, config, time.monotonic_ns() - int(age_seconds * NS_PER_SECOND))
+    return {'data': {}, 'metadata': metadata}
+
+
+def test_stamp_fetch_times_precomputes_deadlines(system):
+    config = system.data_configs['financial_market']  # NEAR_REALTIME（300秒），宽限60秒
+    data = stamped(config, 0)
+    metadata = data['metadata']
+
+    assert set(metadata) == {'fetch_monotonic_ns', 'fresh_until_ns', 'grace_until_ns'}
+    assert metadata['fresh_until_ns'] - metadata['fetch_monotonic_ns'] == 300 * NS_PER_SECOND
+    assert metadata['grace_until_ns'] - metadata['fresh_until_ns'] == 60 * NS_PER_SECOND
+
+
+def test_freshness_and_grace_window(system):
+    config = system.data_configs['financial_market']
+
+    fresh = stamped(config, 10)
+    assert system.is_data_fresh(fresh, config)
+    assert system.data_age_seconds(fresh) == pytest.approx(10, abs=1)
+
+    stale = stamped(config, 330)
+    assert not system.is_data_fresh(stale, config)
+    assert system.is_within_grace(stale, config)
+
+    expired = stamped(config, 400)
+    assert not system.is_within_grace(expired, config)
+
+    no_grace = system.data_configs['stock_prices']
+    no_grace.stale_grace_seconds = 0
+    assert not system.is_within_grace(stamped(no_grace, 0), no_grace)
+    assert not system.is_data_fresh({'data': {}}, config)
+
+
+def test_snapshot_restamps_with_original_age(system, tmp_path):
+    config = system.data_configs['financial_market']
+    system.snapshot_path = str(tmp_path / "cache.snapshot")
+    system.data_cache.set(('financial_market', 'yahoo', ''), stamped(config, 0), ttl=config.max_age_seconds)
+    system.save_snapshot()
+
+    restored = RealTimeDataSystem()
+    restored.snapshot_path = system.snapshot_path
+    restored.load_snapshot()
+
+    data = restored._get_cached('financial_market')
+    assert data is not None
+    assert restored.is_data_fresh(data, config)
+    assert restored.data_age_seconds(data) < 5
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from realtime_data_system import (NS_PER_SECOND, DataFreshness, RealTimeDataConfig, RealTimeDataSystem,
+                                  stamp_fetch_times)
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system = RealTimeDataSystem()
+    system.enable_streaming = False
+    system.schedule_jitter = 0
+    system.calls = []
+    return system
+
+
+def configure(system, **intervals):
+    system.data_configs = {
+        data_type: RealTimeDataConfig(data_type, interval, 60, DataFreshness.REALTIME)
+        for data_type, interval in intervals.items()
+    }
+
+
+def fake_refresh(system, duration=0.0):
+    async def get_or_refresh_data(data_type, force_refresh=False, mode=None):
+        system.calls.append(data_type)
+        await asyncio.sleep(duration)
+        return {'data': {}, 'metadata': {}}
+
+    system.get_or_refresh_data = get_or_refresh_data
+
+
+def run_for(system, seconds):
+    async def run():
+        task = asyncio.create_task(system.start_monitoring())
+        await asyncio.sleep(seconds)
+        system.is_running = False
+        await task
+
+    asyncio.run(run())
+
+
+def test_each_data_type_fires_at_its_own_interval(system):
+    configure(system, fast=0.1, slow=0.4)
+    fake_refresh(system)
+    run_for(system, 1.0)
+
+    stats = system.get_schedule_status()
+    assert 8 <= stats['fast']['fires'] <= 11
+    assert 2 <= stats['slow']['fires'] <= 3
+    assert system.calls.count('fast') == stats['fast']['fires']
+    assert stats['fast']['max_lag_ms'] < 100
+
+
+def test_slow_refresh_is_not_started_twice(system):
+    configure(system, busy=0.1)
+    fake_refresh(system, duration=0.35)
+    run_for(system, 1.0)
+
+    stats = system.schedule_stats['busy']
+    assert stats['skipped_running'] >= 4
+    assert len(system.calls) == stats['fires'] - stats['skipped_running'] <= 3
+
+
+def test_recent_on_demand_data_postpones_the_scheduled_refresh(system):
+    configure(system, quotes=10)
+    fake_refresh(system)
+    config = system.data_configs['quotes']
+    metadata = {}
+    stamp_fetch_times(metadata, config, time.monotonic_ns() - 2 * NS_PER_SECOND)
+    system.data_cache.set(('quotes', 'src', ''), {'data': {}, 'metadata': metadata}, ttl=60)
+
+    run_for(system, 0.3)
+
+    stats = system.get_schedule_status()['quotes']
+    assert stats['fires'] == 1 and stats['skipped_fresh'] == 1
+    assert system.calls == []
+    # 顺延到按需数据到期（间隔10秒 - 年龄2秒）
+    assert 6.5 < system._next_due['quotes'] - time.monotonic() < 8
+
+
+def test_jitter_stays_within_the_configured_ratio(system):
+    system.schedule_jitter = 0.1
+    samples = [system._jittered(10) for _ in range(200)]
+    assert all(9 <= sample <= 11 for sample in samples)
+    assert len(set(samples)) > 1
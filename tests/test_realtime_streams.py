@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from src.utils import realtime_streams
+from src.utils.http_client import close_http_client
+from src.utils.realtime_streams import BinanceTickerStream, CoinbaseTickerStream
+from tests.local_server import LocalServer
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        await asyncio.sleep(0.01)
+
+
+def test_parse_messages_match_rest_format():
+    stream = CoinbaseTickerStream("crypto", ["BTC-USD"], None)
+    assert stream.parse_message({"type": "subscriptions"}) is None
+    assert stream.parse_message({"type": "ticker", "product_id": "BTC-USD", "price": "1.5"}) == {
+        "data": {"base": "BTC", "currency": "USD", "amount": "1.5"}}
+
+    stream = BinanceTickerStream("crypto", ["BTCUSDT"], None)
+    assert stream.subscribe_messages()[0]["params"] == ["btcusdt@ticker"]
+    assert stream.parse_message({"e": "24hrTicker", "s": "BTCUSDT", "c": "2.5"}) == {
+        "symbol": "BTCUSDT", "price": "2.5"}
+
+
+def test_delivers_updates_and_resubscribes_after_reconnect():
+    subscriptions = []
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscriptions.append(json.loads((await ws.receive()).data))
+        await ws.send_str(json.dumps({"result": None, "id": 1}))
+        await ws.send_str("not json")
+        for price in ("1.0", "2.0"):
+            await ws.send_str(json.dumps({"e": "24hrTicker", "s": "BTCUSDT", "c": price}))
+        await ws.close()  # 服务端主动断开，客户端应重连并重新订阅
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/ws", handler)
+    updates = []
+
+    async def on_update(data_type, source, payload):
+        updates.append((data_type, source, payload["price"]))
+
+    async def run():
+        async with LocalServer(app) as server:
+            stream = BinanceTickerStream("crypto", ["BTCUSDT"], on_update, url=f"{server.url}/ws",
+                                         reconnect_delay=0.05, heartbeat=None)
+            stream.start()
+            try:
+                await wait_for(lambda: len(updates) >= 4)
+            finally:
+                await stream.stop()
+                await close_http_client()
+        return stream
+
+    stream = asyncio.run(run())
+
+    assert updates[:4] == [("crypto", "binance", "1.0"), ("crypto", "binance", "2.0")] * 2
+    assert len(subscriptions) >= 2
+    assert all(message["params"] == ["btcusdt@ticker"] for message in subscriptions)
+    assert stream.stats["connects"] >= 2
+    assert stream.stats["disconnects"] == stream.stats["connects"]
+    assert stream.stats["errors"] >= 2  # 每次连接中无法解析的消息
+    assert not stream.connected
+
+
+def test_failed_connects_back_off_and_are_not_disconnects(monkeypatch):
+    attempts = []
+
+    async def handler(request):
+        attempts.append(time.monotonic())
+        return web.Response(status=503)  # 拒绝WebSocket握手
+
+    app = web.Application()
+    app.router.add_get("/ws", handler)
+    monkeypatch.setattr(realtime_streams.random, "uniform", lambda low, high: 1.0)
+
+    async def on_update(data_type, source, payload):
+        pass
+
+    async def run():
+        async with LocalServer(app) as server:
+            stream = CoinbaseTickerStream("crypto", ["BTC-USD"], on_update, url=f"{server.url}/ws",
+                                          reconnect_delay=0.05, max_reconnect_delay=0.4, heartbeat=None)
+            stream.start()
+            try:
+                await wait_for(lambda: len(attempts) >= 5)
+            finally:
+                await stream.stop()
+                await close_http_client()
+        return stream
+
+    stream = asyncio.run(run())
+
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[0] >= 0.05
+    assert gaps[2] > gaps[0] * 2  # 0.05 -> 0.1 -> 0.2 -> 0.4
+    assert gaps[3] < 0.4 * 1.5  # 不超过上限
+    assert stream.stats["connects"] == 0
+    assert stream.stats["disconnects"] == 0
+    assert stream.stats["errors"] >= 5
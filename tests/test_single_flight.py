@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from realtime_data_system import NS_PER_SECOND, RealTimeDataSystem
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    system = RealTimeDataSystem()
+    system.fetch_mode = 'sequential'
+    system.get_data_sources = lambda data_type: {'only': {'url': 'https://only.example/quote'}}
+    system.fetch_count = 0
+
+    async def fetch_realtime_data(data_type, url, params=None):
+        system.fetch_count += 1
+        await asyncio.sleep(0.1)
+        return {'data': {'n': system.fetch_count}, 'metadata': {}}
+
+    system.fetch_realtime_data = fetch_realtime_data
+    return system
+
+
+def cache_stale(system, in_grace=True):
+    now = time.monotonic_ns()
+    metadata = {'fetch_monotonic_ns': now - 70 * NS_PER_SECOND, 'fresh_until_ns': now - NS_PER_SECOND,
+                'grace_until_ns': now + (NS_PER_SECOND if in_grace else -1), 'source_name': 'only'}
+    stale = {'data': {'n': 0}, 'metadata': metadata}
+    system.data_cache.set(system.data_cache.make_key('crypto_prices', 'only', None), stale, ttl=60)
+    return stale
+
+
+def test_concurrent_callers_share_one_refresh(system):
+    async def run():
+        return await asyncio.gather(*(system.get_or_refresh_data('crypto_prices', force_refresh=True)
+                                      for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert system.fetch_count == 1
+    assert all(result is results[0] for result in results)
+    assert system.single_flight_stats == {'fetches': 1, 'coalesced': 9, 'stale_served': 0}
+    assert system._inflight == {}
+
+
+def test_stale_data_in_grace_window_is_served_while_refreshing(system):
+    stale = cache_stale(system)
+
+    async def run():
+        first = await system.get_or_refresh_data('crypto_prices')
+        second = await system.get_or_refresh_data('crypto_prices')
+        await system._inflight['crypto_prices']
+        return first, second, system._get_cached('crypto_prices')
+
+    first, second, refreshed = asyncio.run(run())
+
+    assert first is stale and second is stale
+    assert refreshed['data'] == {'n': 1}
+    assert system.single_flight_stats == {'fetches': 1, 'coalesced': 1, 'stale_served': 2}
+
+
+def test_data_past_grace_window_waits_for_refresh(system):
+    cache_stale(system, in_grace=False)
+    data = asyncio.run(system.get_or_refresh_data('crypto_prices'))
+
+    assert data['data'] == {'n': 1}
+    assert system.single_flight_stats['stale_served'] == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_refresh(system):
+    async def run():
+        impatient = asyncio.create_task(system.get_or_refresh_data('crypto_prices', force_refresh=True))
+        patient = asyncio.create_task(system.get_or_refresh_data('crypto_prices', force_refresh=True))
+        await asyncio.sleep(0.02)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(run())['data'] == {'n': 1}
+    assert system.fetch_count == 1
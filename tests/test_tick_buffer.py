@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.utils.tick_buffer import TickBuffer
+
+
+def test_append_wraps_around_and_keeps_time_order():
+    buffer = TickBuffer(capacity=4)
+    assert buffer.last_value is None and buffer.stats() == {"count": 0}
+
+    for i in range(7):
+        buffer.append(float(i), 100.0 + i)
+
+    timestamps, values = buffer.view()
+    assert len(buffer) == 4
+    assert timestamps.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert values.tolist() == [103.0, 104.0, 105.0, 106.0]
+    assert buffer.last_timestamp == 6.0 and buffer.last_value == 106.0
+    assert buffer.view(2)[1].tolist() == [105.0, 106.0]
+
+    with pytest.raises(ValueError):
+        values[0] = 0.0  # 视图只读
+
+
+def test_extend_matches_repeated_append():
+    appended, extended = TickBuffer(capacity=5), TickBuffer(capacity=5)
+    appended.append(0.0, 1.0)
+    extended.append(0.0, 1.0)
+
+    timestamps, values = np.arange(1, 9, dtype=float), np.arange(2, 10, dtype=float)
+    for timestamp, value in zip(timestamps, values):
+        appended.append(timestamp, value)
+    extended.extend(timestamps[:3], values[:3])
+    extended.extend(timestamps[3:], values[3:])
+
+    assert [column.tolist() for column in extended.view()] == [column.tolist() for column in appended.view()]
+
+    with pytest.raises(ValueError):
+        extended.extend([1.0, 2.0], [1.0])
+
+
+def test_stats_over_time_window():
+    buffer = TickBuffer(capacity=100)
+    buffer.extend(np.arange(10, dtype=float), [100, 101, 102, 103, 104, 105, 106, 107, 108, 110])
+
+    stats = buffer.stats(seconds=3)
+    assert stats["count"] == 4 and stats["start_time"] == 6.0
+    assert stats["first"] == 106 and stats["last"] == 110
+    assert stats["change"] == 4 and stats["change_percent"] == pytest.approx(4 / 106 * 100)
+    assert stats["min"] == 106 and stats["max"] == 110 and stats["mean"] == pytest.approx(107.75)
+    assert stats["volatility"] > 0
+
+    assert buffer.stats(count=2)["count"] == 2
+    assert len(buffer.window(seconds=1, now=100.0)[0]) == 0
+
+
+def test_rolling_mean():
+    buffer = TickBuffer(capacity=3)
+    buffer.extend([0, 1, 2, 3], [1, 2, 3, 4])
+
+    assert buffer.rolling_mean(2).tolist() == [2.5, 3.5]
+    assert buffer.rolling_mean(5).size == 0
+    with pytest.raises(ValueError):
+        TickBuffer(capacity=0)
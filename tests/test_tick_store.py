@@ -0,0 +1,83 @@
+import json
+import os
+
+from src.database.tick_store import TickStore, TS_SUFFIX, VALUE_SUFFIX
+
+DAY = 1_760_000_000  # 2025-10-09 08:53:20 UTC
+
+
+def make_store(tmp_path, **kwargs):
+    return TickStore(root=str(tmp_path / "ticks"), flush_size=1000, flush_interval=3600, **kwargs)
+
+
+def test_query_across_days_and_latest(tmp_path):
+    store = make_store(tmp_path)
+    for i in range(10):
+        store.append("^HSI", DAY + i * 21600, 100.0 + i)  # 每6小时一个点，跨3天
+    store.append("^HSI", DAY, 999.0)  # 不晚于最新时间戳的点被忽略
+    store.flush()
+
+    assert len(store.days("^HSI")) == 3
+    timestamps, prices = store.query("^HSI")
+    assert list(prices) == [100.0 + i for i in range(10)]
+    assert list(timestamps) == [(DAY + i * 21600) * 1000 for i in range(10)]
+
+    timestamps, prices = store.query("^HSI", DAY + 21600, DAY + 4 * 21600)
+    assert list(prices) == [101.0, 102.0, 103.0, 104.0]
+
+    _, prices = store.latest("^HSI", 4)
+    assert list(prices) == [106.0, 107.0, 108.0, 109.0]
+
+
+def test_data_survives_restart(tmp_path):
+    store = make_store(tmp_path)
+    store.append_many("BTCUSDT", [DAY, DAY + 1], [1.0, 2.0])
+    store.close()
+
+    reopened = make_store(tmp_path)
+    assert reopened.symbols() == ["BTCUSDT"]
+    reopened.append("BTCUSDT", DAY + 1, 5.0)  # 重启后仍按磁盘上的最新时间戳去重
+    reopened.append("BTCUSDT", DAY + 2, 3.0)
+    assert list(reopened.query("BTCUSDT")[1]) == [1.0, 2.0, 3.0]
+
+
+def test_series_are_kept_apart(tmp_path):
+    raw, validated = make_store(tmp_path), make_store(tmp_path)
+    raw.append("^HSI", DAY + 10, 1.0)
+    validated.append("^HSI:validated", DAY, 2.0)
+    raw.close()
+    validated.close()
+
+    store = make_store(tmp_path)
+    assert sorted(store.symbols()) == ["^HSI", "^HSI:validated"]
+    assert list(store.query("^HSI")[1]) == [1.0]
+    assert list(store.query("^HSI:validated")[1]) == [2.0]
+
+
+def test_index_is_reconciled_with_data_files(tmp_path):
+    store = make_store(tmp_path)
+    store.append_many("X", [DAY, DAY + 1, DAY + 2], [1.0, 2.0, 3.0])
+    store.close()
+
+    directory = tmp_path / "ticks" / "X"
+    day = store.days("X")[0]
+    # 模拟写入中途退出：价格列少写了一条，时间戳列多出半条，索引停留在旧状态
+    with open(directory / f"{day}{TS_SUFFIX}", "ab") as f:
+        f.write(b"\x00" * 4)
+    os.truncate(directory / f"{day}{VALUE_SUFFIX}", 16)
+    (directory / "index.json").write_text(json.dumps({"symbol": "X", "days": {}}))
+
+    store = make_store(tmp_path)
+    assert store.days("X") == [day]
+    timestamps, prices = store.query("X")
+    assert list(prices) == [1.0, 2.0]
+    assert os.path.getsize(directory / f"{day}{TS_SUFFIX}") == 16
+
+    index = json.loads((directory / "index.json").read_text())["days"]
+    assert index[day] == {"count": 2, "first": DAY * 1000, "last": (DAY + 1) * 1000}
+
+    # 修正后继续追加，两列保持对齐
+    store.append("X", DAY + 1, 9.0)
+    store.append("X", DAY + 3, 4.0)
+    assert list(store.query("X")[1]) == [1.0, 2.0, 4.0]
+
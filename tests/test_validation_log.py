@@ -0,0 +1,44 @@
+from data_accuracy_framework import DataAccuracyFramework, ValidationLog, entry_passed
+
+
+def test_entry_passed_handles_both_entry_shapes():
+    assert entry_passed({'validation_passed': True})
+    assert entry_passed({'result': {'validation_passed': True}})
+    assert entry_passed({'result': {'validation_result': True, 'status': 'VALIDATED'}})
+    assert not entry_passed({'result': {'validation_result': False}})
+    assert not entry_passed({'result': 'garbage'})
+
+
+def test_counters_survive_eviction_and_rolling_rate_uses_window():
+    log = ValidationLog(capacity=3, window=4)
+    outcomes = [True, False, True, True, False, False]
+    for i, passed in enumerate(outcomes):
+        log.append({'data_type': 'financial' if i % 2 else 'general', 'validation_passed': passed, 'i': i})
+
+    assert len(log) == 3 and [entry['i'] for entry in log] == [3, 4, 5]
+    assert log[0]['i'] == 3 and log.latest()['i'] == 5
+    assert log.total == 6 and log.passed == 3
+    assert log.by_type == {'financial': 3, 'general': 3}
+    assert log.failures_by_type == {'financial': 2, 'general': 1}
+    assert log.rolling_failure_rate == 50.0  # 最近4次：通过、通过、失败、失败
+
+    log.clear()
+    assert log.total == 0 and log.latest() is None and log.rolling_failure_rate == 0.0
+
+
+def test_summary_reads_counters():
+    framework = DataAccuracyFramework()
+    assert framework.get_validation_summary() == {'total_validations': 0}
+
+    framework.log_validation('financial', {'validation_passed': True})
+    framework.log_validation('crypto', framework.get_data_with_validation('unknown', []))
+
+    summary = framework.get_validation_summary()
+    assert summary['total_validations'] == 2 and summary['passed_validations'] == 1
+    assert summary['failure_rate'] == 50.0
+    assert summary['by_type'] == {'financial': 1, 'general': 0, 'crypto': 1}
+    assert summary['failures_by_type'] == {'crypto': 1}
+    assert summary['latest_validation']['data_type'] == 'crypto'
+
+    framework.clear_validation_logs()
+    assert framework.get_validation_summary() == {'total_validations': 0}
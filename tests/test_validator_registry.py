@@ -0,0 +1,122 @@
+import pytest
+
+from data_accuracy_framework import DataAccuracyFramework
+from src.utils.validator_registry import CheckSpec, ValidatorRegistry, order_checks
+
+
+def check(name, calls, issue=None):
+    def func(context):
+        calls.append(name)
+        return issue
+    return func
+
+
+def test_order_checks_puts_cheap_selective_checks_first_and_respects_requires():
+    specs = [
+        CheckSpec("slow", None, cost=10.0, selectivity=0.1),
+        CheckSpec("cheap", None, cost=0.1, selectivity=0.1),
+        CheckSpec("uses_extract", None, cost=0.2, selectivity=0.05, requires=("extract",)),
+        CheckSpec("extract", None, cost=5.0, selectivity=0.01),
+    ]
+    assert [spec.name for spec in order_checks(specs)] == ["cheap", "extract", "uses_extract", "slow"]
+
+    # 有足够样本时按实测成本和失败率排序
+    stats = {"slow": {"calls": 100, "failures": 100, "total_ms": 1.0}}
+    assert [spec.name for spec in order_checks(specs, stats)][0] == "slow"
+
+
+def test_order_checks_rejects_cycles():
+    specs = [CheckSpec("a", None, requires=("b",)), CheckSpec("b", None, requires=("a",))]
+    with pytest.raises(ValueError):
+        order_checks(specs)
+
+
+def test_compile_adds_dependencies_and_rejects_unknown_checks():
+    registry, calls = ValidatorRegistry(), []
+    registry.register("t", "extract", check("extract", calls), cost=5.0)
+    registry.register("t", "logic", check("logic", calls), requires=("extract",))
+    registry.register("t", "time", check("time", calls))
+
+    pipeline = registry.compile("t", ["logic"])
+    assert pipeline.order == ["extract", "logic"]
+    assert pipeline.run({}) == []
+    assert calls == ["extract", "logic"]
+    assert registry.pipeline("t") is pipeline
+
+    with pytest.raises(KeyError):
+        registry.compile("t", ["missing"])
+    with pytest.raises(KeyError):
+        registry.compile("unknown")
+
+
+def test_fatal_and_short_circuit_stop_the_pipeline():
+    registry, calls = ValidatorRegistry(), []
+    registry.register("t", "a", check("a", calls, "a失败"), cost=0.1)
+    registry.register("t", "b", check("b", calls, ["b1", "b2"]), cost=1.0)
+    registry.register("t", "c", check("c", calls), cost=2.0)
+
+    assert registry.compile("t").run({}) == ["a失败", "b1", "b2"]
+    assert calls == ["a", "b", "c"]
+
+    calls.clear()
+    assert registry.compile("t", short_circuit=True).run({}) == ["a失败"]
+    assert calls == ["a"]
+
+    calls.clear()
+    registry.register("t", "a", check("a", calls, "a失败"), cost=0.1, fatal=True)
+    assert registry.compile("t").run({}) == ["a失败"]
+
+    stats = registry.get_stats()["t"]
+    assert stats["runs"] == 1
+    assert stats["checks"]["a"]["failure_rate"] == 1.0
+    assert stats["checks"]["b"]["calls"] == 0
+
+
+def test_consecutive_validations_with_disjoint_sources():
+    framework = DataAccuracyFramework()
+    first = framework.validate("crypto", [{"source": "coinbase", "symbol": "BTC", "price": 60000.0},
+                                          {"source": "binance", "symbol": "BTC", "price": 60010.0}])
+    second = framework.validate("crypto", [{"source": "kraken", "symbol": "BTC", "price": 60020.0},
+                                           {"source": "bitstamp", "symbol": "BTC", "price": 60030.0}])
+
+    assert first["validation_passed"] and second["validation_passed"]
+    assert second["validated_data"]["value"] == pytest.approx(60025.0)
+    assert second["validated_data"]["outliers"] == []
+    assert sorted(framework.price_consensus.consensus("BTC").sources) == ["bitstamp", "kraken"]
+
+
+def test_validation_without_symbols_does_not_share_quotes():
+    framework = DataAccuracyFramework()
+    framework.validate("financial", [{"source": "a", "price": 100.0}, {"source": "b", "price": 100.0}])
+    result = framework.validate("financial", [{"source": "c", "price": 5.0}, {"source": "d", "price": 5.0},
+                                              {"source": "e", "price": 5.0}])
+
+    assert result["validation_passed"]
+    assert result["validated_data"]["value"] == 5.0
+
+
+def test_mixed_symbols_are_rejected():
+    framework = DataAccuracyFramework()
+    result = framework.validate("financial", [{"source": "a", "symbol": "X", "price": 1.0},
+                                              {"source": "b", "symbol": "Y", "price": 1.0}])
+    assert not result["validation_passed"]
+    assert "品种不一致" in result["issues"][0]
+
+
+def test_short_circuit_config_reports_first_issue_only():
+    framework = DataAccuracyFramework()
+    points = [{"source": "a", "price": 100.0, "timestamp": "2000-01-01T00:00:00Z"},
+              {"source": "b", "price": 200.0, "timestamp": "2000-01-01T00:00:00Z"}]
+
+    assert len(framework.validate("crypto", points)["issues"]) == 1
+    assert len(framework.validate("financial", points)["issues"]) > 1
+
+
+def test_text_validation_uses_majority_value():
+    framework = DataAccuracyFramework()
+    result = framework.validate("technical", [{"source": "docs", "value": "Python 3.12"}])
+    assert result["validation_passed"]
+    assert result["validated_data"]["value"] == "python 3.12"
+
+    result = framework.validate("technical", [{"source": "docs", "value": "x"}, {"source": "blog", "text": " "}])
+    assert result["issues"] == ["数据源2内容为空"]